@@ -0,0 +1,51 @@
+# bench_startup
+# Benchmark of the program's startup: cumulative import time of main.py (python -X importtime), best of several
+# runs so a busy machine doesn't skew it. Not part of the pytest suite (a wall-clock budget fails on loaded or
+# parallel test runs; tests/test_startup.py checks which modules are imported instead). Run it by hand:
+#
+#   python benchmarks/bench_startup.py --runs 5 --budget-ms 100
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_tasks import run_metadata  # noqa: E402
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Importing main.py used to take ~190 ms, most of it mysql.connector; without the driver and .env it takes ~30 ms
+DEFAULT_BUDGET_MS = 100.0
+DEFAULT_RUNS = 5
+
+
+# Function returning the cumulative import time of main.py in milliseconds, measured in a fresh interpreter
+def import_time_ms():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=SRC, capture_output=True, text=True,
+        timeout=60, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}, check=True
+    )
+    line = next(line for line in result.stderr.splitlines() if line.rstrip().endswith("| main"))
+    return int(line.split("|")[1]) / 1000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how long importing main.py takes.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="fresh interpreters to measure, the best one counts")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="exit with code 1 above this import time")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    timings = [round(import_time_ms(), 2) for _ in range(args.runs)]
+
+    document = {"meta": run_metadata(None, args.runs), "import_main_ms": timings, "best_ms": min(timings), "budget_ms": args.budget_ms}
+    print(json.dumps(document, indent=2))
+    return 0 if min(timings) < args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# bench_statements
+# Benchmark of the MySQL statement cache: per-operation latency of the hot single-task queries run as
+# cached prepared statements (binary protocol) against plain statements sent as text, under sustained load.
+# Every mode gets a freshly seeded database, then several threads run a mix of operations through a
+# shared pool until the duration is over. Not part of the pytest suite: run it by hand (needs a MySQL server).
+#
+#   python benchmarks/bench_statements.py --threads 8 --duration 30 --output statements.json
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bench_tasks import BENCH_DB_NAME, SEED, generate_tasks, percentile, run_metadata  # noqa: E402
+from statement_cache import DEFAULT_STATEMENT_CACHE_SIZE  # noqa: E402
+
+# Statement cache size per mode: "text" turns the cache off
+MODES = {"text": 0, "prepared": DEFAULT_STATEMENT_CACHE_SIZE}
+
+# Share of each operation in the load (read-heavy, like the API load test)
+OPERATION_MIX = (
+    ("fetch_task_db", 0.50), ("fetch_task_page_db", 0.15), ("add_task_db", 0.15),
+    ("update_task_db", 0.15), ("delete_task_db", 0.05),
+)
+
+DEFAULT_SEED_TASKS = 10_000
+DEFAULT_THREADS = 4
+DEFAULT_DURATION = 20.0
+# Seconds of load before measuring: fills the statement cache and the buffer pool
+DEFAULT_WARMUP = 3.0
+
+
+# Function to create the benchmark database with seed_tasks tasks, returns (storage, cleanup function)
+def open_mode_storage(statement_cache_size, threads, seed_tasks, rng):
+    from db_config import connect_to_mysql, ConnectionPool
+    from task_database import TaskDatabase
+
+    with connect_to_mysql() as connection, connection.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_DB_NAME}")
+        cursor.execute(f"CREATE DATABASE {BENCH_DB_NAME}")
+
+    pool = ConnectionPool(database=BENCH_DB_NAME, size=threads, reset_session=not statement_cache_size)
+    storage = TaskDatabase(pool=pool, statement_cache_size=statement_cache_size)
+    storage.create_table_db()
+    storage.add_tasks_bulk(generate_tasks(seed_tasks, rng))
+
+    def cleanup():
+        storage.close()
+        with connect_to_mysql() as connection, connection.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_DB_NAME}")
+    return storage, cleanup
+
+
+# Worker thread: runs operations from the mix until the deadline, recording latencies after measure_from
+def worker(storage, seed_tasks, measure_from, deadline, seed, latencies):
+    rng = random.Random(seed)
+    names = [name for name, _ in OPERATION_MIX]
+    weights = [weight for _, weight in OPERATION_MIX]
+    own_ids = []   # deletes only remove tasks this thread added, so they never miss
+
+    while True:
+        name = rng.choices(names, weights)[0]
+        task_id = rng.randint(1, seed_tasks)
+
+        start = time.perf_counter()
+        if name == "fetch_task_db":
+            storage.fetch_task_db(task_id)
+        elif name == "fetch_task_page_db":
+            storage.fetch_task_page_db(task_id, 20)
+        elif name == "add_task_db":
+            own_ids.append(storage.add_task_db("Benchmark task", "Added under load"))
+        elif name == "update_task_db":
+            storage.update_task_db(task_id, rng.choice(("not started", "in progress", "done")))
+        elif own_ids:
+            storage.delete_task_db(own_ids.pop())
+        else:
+            continue
+        end = time.perf_counter()
+
+        if end >= deadline:
+            return
+        if end >= measure_from:
+            latencies.setdefault(name, []).append(end - start)
+
+
+# Function to run the load on one mode and return its per-operation statistics
+def bench_mode(mode, threads, duration, warmup, seed_tasks):
+    storage, cleanup = open_mode_storage(MODES[mode], threads, seed_tasks, random.Random(SEED))
+    try:
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+        per_thread = [{} for _ in range(threads)]
+        workers = [
+            threading.Thread(target=worker, args=(storage, seed_tasks, measure_from, deadline, SEED + index, per_thread[index]))
+            for index in range(threads)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        operations = {}
+        for name, _ in OPERATION_MIX:
+            timings = sorted(latency for latencies in per_thread for latency in latencies.get(name, ()))
+            if timings:
+                operations[name] = {
+                    "count": len(timings),
+                    "p50_ms": round(percentile(timings, 50) * 1000, 4),
+                    "p95_ms": round(percentile(timings, 95) * 1000, 4),
+                    "p99_ms": round(percentile(timings, 99) * 1000, 4),
+                    "mean_ms": round(sum(timings) / len(timings) * 1000, 4),
+                }
+
+        total = sum(stats["count"] for stats in operations.values())
+        result = {"operations_per_second": round(total / duration, 1), "operations": operations}
+        if storage.statements is not None:
+            result["statement_cache"] = {"prepares": storage.statements.prepares, "hits": storage.statements.hits}
+        return result
+    finally:
+        cleanup()
+
+
+# Function returning the p50/p95 change of every operation from the text to the prepared mode
+# (-0.25 => prepared is 25 % faster)
+def compare_modes(modes):
+    if not {"text", "prepared"} <= modes.keys():
+        return {}
+
+    changes = {}
+    for name, text in modes["text"]["operations"].items():
+        prepared = modes["prepared"]["operations"].get(name)
+        if prepared:
+            changes[name] = {key: round(prepared[key] / text[key] - 1, 3) for key in ("p50_ms", "p95_ms") if text[key]}
+    return changes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare prepared and text-protocol statements on MySQL under sustained load.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="modes to run")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threads (and pooled connections) running operations")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="measured seconds of load per mode")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP, help="seconds of load before measuring")
+    parser.add_argument("--seed-tasks", type=int, default=DEFAULT_SEED_TASKS, help="tasks in the table before the load starts")
+    parser.add_argument("--output", help="write the results as JSON to this file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    document = {"meta": run_metadata("mysql", None), "modes": {}}
+    document["meta"].update(threads=args.threads, duration=args.duration, seed_tasks=args.seed_tasks)
+
+    # The storage prints a message for every add => progress goes to stderr, storage messages nowhere
+    for mode in args.modes:
+        print(f"Running {mode} statements for {args.warmup + args.duration:.0f}s...", file=sys.stderr)
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            document["modes"][mode] = bench_mode(mode, args.threads, args.duration, args.warmup, args.seed_tasks)
+    document["prepared_vs_text"] = compare_modes(document["modes"])
+
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        print(f"Results written to {args.output}.", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
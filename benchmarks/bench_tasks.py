@@ -0,0 +1,280 @@
+# bench_tasks
+# Benchmark of the storage operations as the tasks table grows.
+# Not part of the pytest suite: run it by hand, save the JSON, compare two runs.
+#
+#   python benchmarks/bench_tasks.py --backend sqlite --sizes 10000 1000000 --output before.json
+#   python benchmarks/bench_tasks.py --compare before.json after.json
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from task_storage import BACKENDS  # noqa: E402
+
+# Table sizes seeded by default
+DEFAULT_SIZES = (10_000, 1_000_000, 10_000_000)
+
+# Status mix of the seeded tasks: most tasks of a long-lived list are finished
+STATUS_MIX = (("done", 0.70), ("not started", 0.20), ("in progress", 0.10))
+
+# Database used for MySQL runs, created and dropped by the benchmark
+BENCH_DB_NAME = "bench_task_manager"
+
+# Timed calls per operation; operations that read the whole table run fewer times
+DEFAULT_ITERATIONS = 200
+FULL_SCAN_ITERATIONS = 5
+
+# A run is flagged as a regression when p50 or p95 got slower by more than this fraction
+DEFAULT_THRESHOLD = 0.20
+
+# Fixed seed => the same data and the same sequence of operations on every run
+SEED = 20240531
+
+WORDS = (
+    "invoice report meeting budget review deploy server client backup release "
+    "design customer payment contract update email draft schedule plan audit"
+).split()
+
+
+# Generator yielding size realistic (title, description, status, created_at) tasks
+def generate_tasks(size, rng):
+    statuses = [status for status, _ in STATUS_MIX]
+    weights = [weight for _, weight in STATUS_MIX]
+    start = datetime.now().replace(microsecond=0) - timedelta(days=365)
+
+    for index in range(size):
+        title = " ".join(rng.choices(WORDS, k=3)).capitalize()
+        description = " ".join(rng.choices(WORDS, k=rng.randint(5, 20))) + f" #{index}"
+        created_at = start + timedelta(seconds=index * 365 * 24 * 3600 // max(size, 1))
+        yield (title, description, rng.choices(statuses, weights)[0], created_at)
+
+
+# Function to open an empty storage of the given backend, returns (storage, cleanup function)
+def open_bench_storage(backend):
+    if backend == "memory":
+        from memory_database import MemoryTaskDatabase
+        return MemoryTaskDatabase(), lambda: None
+
+    if backend == "sqlite":
+        from sqlite_database import SQLiteTaskDatabase
+        directory = tempfile.TemporaryDirectory()
+        storage = SQLiteTaskDatabase(os.path.join(directory.name, "bench.db"))
+        storage.create_table_db()
+
+        def cleanup():
+            storage.close()
+            directory.cleanup()
+        return storage, cleanup
+
+    from db_config import connect_to_mysql, ConnectionPool
+    from task_database import TaskDatabase
+
+    with connect_to_mysql() as connection, connection.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_DB_NAME}")
+        cursor.execute(f"CREATE DATABASE {BENCH_DB_NAME}")
+
+    storage = TaskDatabase(pool=ConnectionPool(database=BENCH_DB_NAME, size=2))
+    storage.create_table_db()
+
+    def cleanup():
+        storage.close()
+        with connect_to_mysql() as connection, connection.cursor() as cursor:
+            cursor.execute(f"DROP DATABASE IF EXISTS {BENCH_DB_NAME}")
+    return storage, cleanup
+
+
+# Helper function returning the p-th percentile (0-100) of sorted values, nearest-rank method
+def percentile(values, p):
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+# Function to call operation(i) for i in range(iterations) and return its latency statistics in milliseconds
+def measure(operation, iterations):
+    timings = []
+    for index in range(iterations):
+        start = time.perf_counter()
+        operation(index)
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced on one extra call only, tracing would slow down the timed calls
+    tracemalloc.start()
+    operation(iterations)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "count": iterations,
+        "p50_ms": round(percentile(timings, 50) * 1000, 4),
+        "p95_ms": round(percentile(timings, 95) * 1000, 4),
+        "p99_ms": round(percentile(timings, 99) * 1000, 4),
+        "mean_ms": round(total / iterations * 1000, 4),
+        "ops_per_second": round(iterations / total, 1) if total else None,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# Function to seed one table size and time every operation on it
+def bench_size(backend, size, iterations, rng):
+    storage, cleanup = open_bench_storage(backend)
+    try:
+        start = time.perf_counter()
+        result = storage.add_tasks_bulk(generate_tasks(size, rng))
+        seed_seconds = time.perf_counter() - start
+        ranges = result["inserted"]
+        total = sum(last - first + 1 for first, last in ranges)
+
+        # Random existing IDs, drawn up front so drawing them isn't timed; deletes use their own IDs.
+        # Positions are drawn from a range object, so millions of IDs are never held in a list.
+        lookups = [_id_at(ranges, position) for position in rng.choices(range(total), k=iterations + 1)]
+        deletes = [_id_at(ranges, position) for position in rng.sample(range(total), iterations + 1)]
+        scans = min(iterations, FULL_SCAN_ITERATIONS)
+
+        operations = [
+            ("add_task_db", lambda i: storage.add_task_db(f"Benchmark task {i}", "Added while benchmarking"), iterations),
+            ("fetch_task_db", lambda i: storage.fetch_task_db(lookups[i]), iterations),
+            ("fetch_task_page_db", lambda i: storage.fetch_task_page_db(lookups[i]), iterations),
+            ("search_tasks_db", lambda i: storage.search_tasks_db(f"{rng.choice(WORDS)} #{lookups[i]}"), iterations),
+            ("update_task_db", lambda i: storage.update_task_db(lookups[i], "in progress" if i % 2 else "done"), iterations),
+            ("delete_task_db", lambda i: storage.delete_task_db(deletes[i]), iterations),
+            ("fetch_tasks_db", lambda i: storage.fetch_tasks_db(), scans),
+            ("fetch_task_ids_db", lambda i: storage.fetch_task_ids_db(), scans),
+        ]
+
+        results = {"seed_seconds": round(seed_seconds, 2), "operations": {}}
+        for name, operation, count in operations:
+            print(f"  {name} x{count}")
+            # The storage prints a message for every add => keep the console quiet while timing
+            with redirect_stdout(io.StringIO()):
+                results["operations"][name] = measure(operation, count)
+        return results
+    finally:
+        cleanup()
+
+
+# Helper function returning the ID at a position of the inserted (first_id, last_id) ranges
+def _id_at(ranges, position):
+    for first, last in ranges:
+        if position <= last - first:
+            return first + position
+        position -= last - first + 1
+    raise IndexError(position)
+
+
+# Function to run the whole benchmark and return the results document
+def run(backend, sizes, iterations):
+    document = {"meta": run_metadata(backend, iterations), "sizes": {}}
+
+    # Storage messages (schema upgrades) must not end up in the JSON printed to stdout
+    with redirect_stdout(sys.stderr):
+        for size in sizes:
+            print(f"Seeding {size} tasks ({backend})...")
+            # Own generator per size => a size gets the same data whatever other sizes are run with it
+            document["sizes"][str(size)] = bench_size(backend, size, iterations, random.Random(SEED + size))
+
+    # Peak resident memory of the whole run (kilobytes on Linux)
+    document["meta"]["max_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return document
+
+
+# Helper function describing where and on which revision the benchmark ran
+def run_metadata(backend, iterations):
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = None
+
+    return {
+        "backend": backend,
+        "revision": revision or None,
+        "iterations": iterations,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+# Function to compare two result documents, returns the list of regressions (and prints a table)
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    regressions = []
+    print(f"{'size':>10} {'operation':<20} {'p50 old':>10} {'p50 new':>10} {'p95 old':>10} {'p95 new':>10}  change")
+
+    for size, measured in current["sizes"].items():
+        before = baseline["sizes"].get(size)
+        if before is None:
+            continue
+
+        for name, stats in measured["operations"].items():
+            old = before["operations"].get(name)
+            if old is None:
+                continue
+
+            change = max(_slowdown(old[key], stats[key]) for key in ("p50_ms", "p95_ms"))
+            flag = "  REGRESSION" if change > threshold else ""
+            print(
+                f"{size:>10} {name:<20} {old['p50_ms']:>10.3f} {stats['p50_ms']:>10.3f} "
+                f"{old['p95_ms']:>10.3f} {stats['p95_ms']:>10.3f}  {change:+.0%}{flag}"
+            )
+            if flag:
+                regressions.append((size, name, change))
+
+    return regressions
+
+
+# Helper function returning how much slower new is than old (0.25 => 25 % slower, negative => faster)
+def _slowdown(old, new):
+    return new / old - 1 if old else 0.0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark task storage operations at different table sizes.")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite", help="storage to benchmark (mysql needs a local server)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="table sizes to seed")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="timed calls per operation")
+    parser.add_argument("--output", help="write the results as JSON to this file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="slowdown flagged as regression (0.2 = 20 %%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.compare:
+        documents = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as file:
+                documents.append(json.load(file))
+
+        regressions = compare(*documents, threshold=args.threshold)
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}.")
+        return 1 if regressions else 0
+
+    document = run(args.backend, args.sizes, args.iterations)
+    text = json.dumps(document, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        print(f"Results written to {args.output}.", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
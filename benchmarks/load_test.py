@@ -0,0 +1,206 @@
+# load_test
+# Local load test of the HTTP/JSON task API (src/api_server.py).
+# Starts `main.py --serve` on a free port (or uses --url), seeds tasks and drives it from several client
+# processes, each with many keep-alive connections, then prints throughput and latency percentiles as JSON.
+# Not part of the pytest suite: run it by hand.
+#
+#   python benchmarks/load_test.py --backend memory --clients 64 --duration 10
+#   python benchmarks/load_test.py --url http://127.0.0.1:8000 --min-rps 2000
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from bench_tasks import percentile
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py")
+
+# Share of each request kind in the generated load (read-heavy, like several services polling the store)
+REQUEST_MIX = (("get", 0.60), ("list", 0.20), ("create", 0.10), ("update", 0.10))
+
+# Tasks created before the measurement starts, so reads hit existing rows
+DEFAULT_SEED_TASKS = 1000
+
+STATUSES = ("not started", "in progress", "done")
+
+SEED = 20240531
+
+
+# Function to start the API server on a free local port, returns (process, base URL, cleanup function)
+def start_server(backend, workers):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    directory = tempfile.TemporaryDirectory()
+    env = dict(os.environ, TASK_STORAGE=backend, SQLITE_PATH=os.path.join(directory.name, "load.db"))
+    process = subprocess.Popen(
+        [sys.executable, MAIN, "--serve", f"127.0.0.1:{port}", "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise SystemExit(f"API server did not start: {process.stderr.read().decode()}")
+            time.sleep(0.05)
+
+    def cleanup():
+        process.terminate()
+        process.wait()
+        directory.cleanup()
+    return f"http://127.0.0.1:{port}", cleanup
+
+
+# Helper function sending one request on a keep-alive connection and returning (status, decoded body)
+def request(connection, method, path, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    headers = {"Content-Type": "application/json"} if data else {}
+    connection.request(method, path, data, headers)
+    response = connection.getresponse()
+    payload = response.read()
+    return response.status, json.loads(payload) if payload else None
+
+
+# Function to create count tasks through the bulk endpoint, returns the created IDs
+def seed_tasks(url, count):
+    address = urlsplit(url)
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+    ids = []
+    for start in range(0, count, 500):
+        tasks = [{"title": f"Load task {index}", "description": "Seeded by the load test"} for index in range(start, min(start + 500, count))]
+        status, result = request(connection, "POST", "/tasks/bulk", {"tasks": tasks})
+        if status != 200:
+            raise SystemExit(f"Seeding failed with HTTP {status}: {result}")
+        ids.extend(task_id for first, last in result["inserted"] for task_id in range(first, last + 1))
+    connection.close()
+    return ids
+
+
+# Client thread: sends requests from the mix on one keep-alive connection until the deadline
+def client_loop(url, ids, deadline, seed, latencies, statuses):
+    address = urlsplit(url)
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in REQUEST_MIX]
+    weights = [weight for _, weight in REQUEST_MIX]
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+
+    while time.monotonic() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "get":
+            call = ("GET", f"/tasks/{rng.choice(ids)}", None)
+        elif kind == "list":
+            call = ("GET", f"/tasks?after_id={rng.choice(ids)}&limit=20", None)
+        elif kind == "create":
+            call = ("POST", "/tasks", {"title": "Load test", "description": "Created under load"})
+        else:
+            call = ("PATCH", f"/tasks/{rng.choice(ids)}", {"status": rng.choice(STATUSES)})
+
+        start = time.perf_counter()
+        try:
+            status, _ = request(connection, *call)
+        except (OSError, http.client.HTTPException):
+            status = "error"
+            connection.close()
+            connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    connection.close()
+
+
+# Client process: runs clients threads and returns their latencies and status counts
+def client_process(url, ids, deadline, clients, seed):
+    latencies = []
+    statuses = {}
+    threads = [
+        threading.Thread(target=client_loop, args=(url, ids, deadline, seed * 1000 + index, latencies, statuses))
+        for index in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses
+
+
+# Function to run the load from processes client processes and return the summary
+def run_load(url, ids, clients, processes, duration):
+    processes = max(1, min(processes, clients))
+    per_process = [clients // processes + (index < clients % processes) for index in range(processes)]
+    deadline = time.monotonic() + duration
+
+    with multiprocessing.Pool(processes) as pool:
+        start = time.perf_counter()
+        results = pool.starmap(client_process, [(url, ids, deadline, count, SEED + index) for index, count in enumerate(per_process)])
+        seconds = time.perf_counter() - start
+
+    latencies = sorted(latency for process_latencies, _ in results for latency in process_latencies)
+    statuses = {}
+    for _, process_statuses in results:
+        for status, count in process_statuses.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "clients": clients,
+        "processes": processes,
+        "seconds": round(seconds, 2),
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / seconds, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        "statuses": statuses,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the HTTP/JSON task API.")
+    parser.add_argument("--url", help="API to test (default: start main.py --serve on a free local port)")
+    parser.add_argument("--backend", choices=("memory", "sqlite", "mysql"), default="memory", help="storage of the started server")
+    parser.add_argument("--workers", type=int, default=16, help="worker threads of the started server")
+    parser.add_argument("--clients", type=int, default=64, help="concurrent keep-alive connections")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="client processes sharing the connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--seed-tasks", type=int, default=DEFAULT_SEED_TASKS, help="tasks created before the load starts")
+    parser.add_argument("--min-rps", type=float, help="exit with code 1 when the throughput stays below this")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    url, cleanup = (args.url, lambda: None) if args.url else start_server(args.backend, args.workers)
+
+    try:
+        ids = seed_tasks(url, args.seed_tasks)
+        summary = run_load(url, ids, args.clients, args.processes, args.duration)
+    finally:
+        cleanup()
+
+    summary.update(url=url, backend=None if args.url else args.backend, workers=None if args.url else args.workers)
+    print(json.dumps(summary, indent=2))
+
+    if args.min_rps and summary["requests_per_second"] < args.min_rps:
+        print(f"\n❌ {summary['requests_per_second']} requests/s is below the required {args.min_rps}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
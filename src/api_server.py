@@ -0,0 +1,334 @@
+# api_server
+import json
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+from utils import STATUSES, MAX_TITLE_LENGTH, normalize_state, validate_task
+
+# Worker threads handling connections; each one borrows a pooled database connection per operation
+DEFAULT_WORKERS = 16
+
+# Accepted connections waiting for a free worker before new ones are refused with 503
+DEFAULT_MAX_PENDING = 256
+
+# Seconds a connection may take to send a request, and may stay idle between keep-alive requests
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# Tasks per page of GET /tasks: default and upper limit of ?limit=
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+# Largest accepted request body (bytes)
+MAX_BODY_SIZE = 1024 * 1024
+
+TASK_PATH = re.compile(r"/tasks/(\d+)")
+
+# Written straight to the socket when every worker is busy and the backlog is full
+SERVICE_UNAVAILABLE = (
+    b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\nContent-Length: 29\r\n"
+    b"Connection: close\r\nRetry-After: 1\r\n\r\n{\"error\": \"Server is busy.\"}\n"
+)
+
+
+class ApiError(Exception):
+    """Exception raised by a request handler to answer with an HTTP error status."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Function to turn a task record into its JSON object
+def task_json(task):
+    return {
+        "id": task.id, "title": task.title, "description": task.description, "status": task.status,
+        "created_at": task.created_at.isoformat(" ", "seconds") if task.created_at else None,
+    }
+
+
+# HTTP server with a fixed pool of worker threads instead of a thread per connection.
+# A worker serves one connection at a time, all its keep-alive requests included; connections beyond
+# the workers wait (up to max_pending), later ones get 503 at once, so load can't pile up without limit.
+class TaskHTTPServer(HTTPServer):
+    def __init__(self, address, storage, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT, access_log=False):
+        self.request_queue_size = max(workers + max_pending, 5)
+        super().__init__(address, TaskRequestHandler)
+        self.storage = storage
+        # The messages meant for the menu ("✅ Task was added...") would cost a terminal write per request;
+        # clients get every result and error in the responses
+        storage.set_quiet()
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.access_log = access_log
+
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="task-api")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            try:
+                request.sendall(SERVICE_UNAVAILABLE)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+
+        self._executor.submit(self._process, request, client_address)
+
+    # Worker: serves the connection until the client closes it or it times out
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    # Function to stop accepting connections and wait for the workers to finish
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+# Handler of one connection: JSON in, JSON out, HTTP/1.1 keep-alive
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "TaskManager"
+    # Headers and body are separate writes; with Nagle on, a keep-alive client waits ~40 ms (delayed ACK) for the body
+    disable_nagle_algorithm = True
+    # Errors answered by http.server itself (unsupported method, malformed request line) are JSON too
+    error_content_type = "application/json"
+    error_message_format = '{"error": "%(message)s"}\n'
+
+    def setup(self):
+        # Applies to reading every request of the connection, and to waiting for the next one
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+    # Helper function routing the request and writing the response (or the error) as JSON
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        storage = self.server.storage
+        try:
+            body = self._read_body()
+            match = TASK_PATH.fullmatch(url.path)
+
+            if url.path == "/tasks":
+                route = {"GET": self._list, "POST": self._create}.get(method)
+                args = (parse_qs(url.query),) if method == "GET" else (body,)
+            elif url.path == "/tasks/bulk":
+                route = {"POST": self._create_bulk, "PATCH": self._update_bulk, "DELETE": self._delete_bulk}.get(method)
+                args = (body,)
+            elif match:
+                route = {"GET": self._get, "PATCH": self._update, "DELETE": self._delete}.get(method)
+                args = (int(match.group(1)), body)
+            else:
+                raise ApiError(404, "Not found.")
+
+            if route is None:
+                raise ApiError(405, f"Method {method} is not allowed on {url.path}.")
+            status, payload = route(*args)
+
+        except ApiError as error:
+            status, payload = error.status, {"error": str(error)}
+        except storage.Error as error:
+            status, payload = 500, {"error": f"Database error: {error}"}
+        except Exception as error:
+            # A bug or an unexpected failure => still an answer for the client, and the traceback for the operator
+            traceback.print_exc()
+            status, payload = 500, {"error": f"Internal server error ({type(error).__name__})."}
+
+        self._send(status, payload)
+
+    # Helper function reading the JSON body (None when there is none)
+    def _read_body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.close_connection = True
+            raise ApiError(400, "Content-Length must be an integer.")
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            raise ApiError(413, f"Request body is larger than {MAX_BODY_SIZE} bytes.")
+        if not length:
+            return None
+
+        try:
+            return json.loads(self.rfile.read(length))
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise ApiError(400, f"Invalid JSON: {error}")
+
+    def _send(self, status, payload):
+        data = b"" if payload is None else json.dumps(payload).encode() + b"\n"
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # GET /tasks?after_id=0&limit=100: one page of unfinished tasks in ID order (keyset pagination);
+    # next_after_id is the after_id of the next page, null on the last one
+    def _list(self, query):
+        after_id = _int_param(query, "after_id", 0)
+        limit = min(_int_param(query, "limit", DEFAULT_PAGE_LIMIT), MAX_PAGE_LIMIT)
+        if limit < 1:
+            raise ApiError(400, "limit must be at least 1.")
+
+        page = self.server.storage.fetch_task_page_db(after_id, limit)
+        next_after_id = page[-1].id if len(page) == limit else None
+        return 200, {"tasks": [task_json(task) for task in page], "next_after_id": next_after_id}
+
+    # GET /tasks/<id>
+    def _get(self, task_id, body):
+        task = self.server.storage.fetch_task_db(task_id)
+        if task is None:
+            raise ApiError(404, f"There is no task with ID {task_id}.")
+        return 200, task_json(task)
+
+    # POST /tasks {"title": ..., "description": ...}
+    def _create(self, body):
+        title, description = _fields(body, "title", "description")
+        title = title.strip() if isinstance(title, str) else title
+        description = description.strip() if isinstance(description, str) else description
+
+        error = validate_task(title, description)
+        if error:
+            raise ApiError(400, error)
+        if len(title) > MAX_TITLE_LENGTH:
+            raise ApiError(400, f"Task title must be at most {MAX_TITLE_LENGTH} characters long.")
+        return 201, {"id": self.server.storage.add_task_db(title, description)}
+
+    # PATCH /tasks/<id> {"status": ...}: answers with the changed task
+    def _update(self, task_id, body):
+        status = _status(*_fields(body, "status"))
+        if not self.server.storage.update_task_db(task_id, status):
+            raise ApiError(500, "The task could not be updated.")
+        return self._get(task_id, None)
+
+    # DELETE /tasks/<id>
+    def _delete(self, task_id, body):
+        if not self.server.storage.delete_task_db(task_id):
+            raise ApiError(404, f"There is no task with ID {task_id}.")
+        return 204, None
+
+    # POST /tasks/bulk {"tasks": [{"title": ..., "description": ...}, ...]}: inserted ID ranges and rejected indexes
+    def _create_bulk(self, body):
+        tasks, = _fields(body, "tasks")
+        if not isinstance(tasks, list):
+            raise ApiError(400, "tasks must be a list.")
+
+        result = self.server.storage.add_tasks_bulk([
+            (task.get("title"), task.get("description")) if isinstance(task, dict) else task for task in tasks
+        ])
+        return 200, {"inserted": result["inserted"], "rejected": result["rejected"]}
+
+    # PATCH /tasks/bulk {"set_status": ..., selection}: number of updated tasks
+    def _update_bulk(self, body):
+        new_status = _status(*_fields(body, "set_status"))
+        return 200, {"updated": self.server.storage.update_tasks_bulk_db(new_status, **_selection(body))}
+
+    # DELETE /tasks/bulk {selection}: number of deleted tasks
+    def _delete_bulk(self, body):
+        return 200, {"deleted": self.server.storage.delete_tasks_bulk_db(**_selection(body))}
+
+
+# Helper function reading an integer query parameter
+def _int_param(query, name, default):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[0])
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer.")
+
+
+# Helper function returning the required fields of a JSON object body
+def _fields(body, *names):
+    if not isinstance(body, dict):
+        raise ApiError(400, "Request body must be a JSON object.")
+    missing = [name for name in names if name not in body]
+    if missing:
+        raise ApiError(400, f"Missing field(s): {', '.join(missing)}.")
+    return [body[name] for name in names]
+
+
+# Helper function correcting a status (typos like in the menu) and refusing unknown ones
+def _status(value):
+    status = normalize_state(value) if isinstance(value, str) else value
+    if status not in STATUSES:
+        raise ApiError(400, f"Invalid status '{value}'. Use one of: {', '.join(STATUSES)}.")
+    return status
+
+
+# Helper function checking that a JSON value is an integer ID (JSON true/false are bools, not IDs)
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# Helper function turning the selection of a bulk body into update/delete_tasks_bulk_db arguments:
+# "ids": [1, 2], "id_range": [first, last], "status": ... and "created_before": "YYYY-MM-DD[ HH:MM:SS]"
+def _selection(body):
+    if not isinstance(body, dict):
+        raise ApiError(400, "Request body must be a JSON object.")
+
+    selection = {}
+    if "ids" in body:
+        if not isinstance(body["ids"], list) or not all(_is_id(task_id) for task_id in body["ids"]):
+            raise ApiError(400, "ids must be a list of integers.")
+        selection["ids"] = body["ids"]
+    if "id_range" in body:
+        id_range = body["id_range"]
+        if not isinstance(id_range, list) or len(id_range) != 2 or not all(_is_id(task_id) for task_id in id_range):
+            raise ApiError(400, "id_range must be [first_id, last_id] with integer IDs.")
+        if id_range[0] > id_range[1]:
+            raise ApiError(400, "id_range: the first ID must not be greater than the last.")
+        selection["id_range"] = id_range
+    if "status" in body:
+        selection["status"] = _status(body["status"])
+    if "created_before" in body:
+        try:
+            selection["created_before"] = datetime.fromisoformat(str(body["created_before"]))
+        except ValueError:
+            raise ApiError(400, "created_before must be a date, YYYY-MM-DD[ HH:MM:SS].")
+    if not selection:
+        # Never "every task" by omission (make_selection() refuses it too)
+        raise ApiError(400, "Select tasks by ids, id_range, status or created_before.")
+    return selection
+
+
+# Function to serve the task API on host:port until interrupted (Ctrl+C)
+def serve(storage, host="127.0.0.1", port=8000, workers=DEFAULT_WORKERS, request_timeout=DEFAULT_REQUEST_TIMEOUT, access_log=False):
+    server = TaskHTTPServer((host, port), storage, workers, request_timeout=request_timeout, access_log=access_log)
+    host, port = server.server_address[:2]
+    print(f"\n🌐 Task API listening on http://{host}:{port} ({workers} workers). Press Ctrl+C to stop.", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("\n👋  Task API stopped.")
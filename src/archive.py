@@ -0,0 +1,56 @@
+# archive
+import threading
+from datetime import datetime, timedelta
+
+# Done tasks created more than this many days ago are archived
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+
+# Seconds between two runs of a continuous archiver
+DEFAULT_ARCHIVE_INTERVAL = 3600.0
+
+
+# Function returning the creation date before which done tasks are archived
+def archive_cutoff(days, now=None):
+    return (now or datetime.now()).replace(microsecond=0) - timedelta(days=days)
+
+
+# Function to archive done tasks created more than days ago, returns the number of archived tasks
+def archive_done_tasks(storage, days=DEFAULT_ARCHIVE_AFTER_DAYS, chunk_size=None):
+    return storage.archive_tasks_db(archive_cutoff(days), chunk_size)
+
+
+# Archives old done tasks again and again, every interval seconds, until stop() is called.
+# run() works in the calling thread (e.g. a dedicated archiving process), start() in a background thread.
+# A failed run (e.g. lost connection) is reported and retried at the next interval.
+class Archiver:
+    def __init__(self, storage, days=DEFAULT_ARCHIVE_AFTER_DAYS, interval=DEFAULT_ARCHIVE_INTERVAL, chunk_size=None):
+        self.storage = storage
+        self.days = days
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.archived = 0   # tasks archived since the start
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                archived = archive_done_tasks(self.storage, self.days, self.chunk_size)
+                self.archived += archived
+                if archived:
+                    print(f"\n🗄️  Archived {archived} done task(s).")
+            except self.storage.Error as error:
+                print(f"\n⚠️  Archiving failed ({error}). Retrying in {self.interval:.0f}s...")
+
+            self._stopped.wait(self.interval)
+
+    # Function to run the archiver in a background thread
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="task-archiver", daemon=True)
+        self._thread.start()
+
+    # Function to stop the archiver; a chunk that is being moved is finished first
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
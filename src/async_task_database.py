@@ -0,0 +1,146 @@
+# async_task_database
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of storage operations running at the same time (and size of the MySQL pool behind them)
+DEFAULT_WORKERS = 8
+
+# Seconds an awaited operation may take before TimeoutError is raised
+DEFAULT_TIMEOUT = 30.0
+
+
+# Asyncio front end for any storage backend.
+# Blocking storage calls run on a bounded thread pool, so one slow query never stalls the event loop.
+# Callers beyond the worker limit wait on an asyncio semaphore (no thread each), where they can be
+# cancelled or time out. A call that already reached the database runs to completion and keeps its
+# worker slot until it finishes, so the limit always matches the real load on the database.
+class AsyncTaskDatabase:
+    def __init__(self, storage, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.storage = storage
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-db")
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Helper function running one blocking storage call on the worker pool.
+    # The timeout covers the wait for a worker slot as well as the call itself.
+    async def _run(self, function, *args, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(self._call(function, *args), timeout)
+
+    # Helper function waiting for a worker slot, then running the call on it
+    async def _call(self, function, *args):
+        await self._slots.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args))
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is given back when the call really finishes, not when the caller stops waiting
+        future.add_done_callback(self._release)
+
+        # shield() => a timeout or cancellation only stops the waiting, the worker thread finishes its call
+        return await asyncio.shield(future)
+
+    # Callback for a finished call: frees its slot and marks its error as seen,
+    # so a call nobody waits for anymore (timeout) doesn't log "exception was never retrieved"
+    def _release(self, future):
+        self._slots.release()
+        if not future.cancelled():
+            future.exception()
+
+    async def create_table_db(self):
+        return await self._run(self.storage.create_table_db)
+
+    async def add_task_db(self, title, description, timeout=None):
+        return await self._run(self.storage.add_task_db, title, description, timeout=timeout)
+
+    async def add_tasks_bulk(self, tasks, batch_size=None, timeout=None):
+        # Materialize lazy iterables here, a generator must not be consumed from a worker thread
+        return await self._run(self.storage.add_tasks_bulk, list(tasks), batch_size, timeout=timeout)
+
+    async def fetch_tasks_db(self, timeout=None):
+        return await self._run(self.storage.fetch_tasks_db, timeout=timeout)
+
+    async def fetch_task_page_db(self, after_id=0, limit=None, timeout=None):
+        return await self._run(self.storage.fetch_task_page_db, after_id, limit, timeout=timeout)
+
+    async def fetch_task_db(self, task_id, timeout=None):
+        return await self._run(self.storage.fetch_task_db, task_id, timeout=timeout)
+
+    async def fetch_task_ids_db(self, timeout=None):
+        return await self._run(self.storage.fetch_task_ids_db, timeout=timeout)
+
+    async def fetch_task_columns_db(self, chunk_size=None, timeout=None):
+        return await self._run(self.storage.fetch_task_columns_db, chunk_size, timeout=timeout)
+
+    async def has_tasks_db(self, timeout=None):
+        return await self._run(self.storage.has_tasks_db, timeout=timeout)
+
+    async def search_tasks_db(self, query, limit=None, offset=0, timeout=None):
+        return await self._run(self.storage.search_tasks_db, query, limit, offset, timeout=timeout)
+
+    async def update_task_db(self, task_id, new_status, timeout=None):
+        return await self._run(self.storage.update_task_db, task_id, new_status, timeout=timeout)
+
+    async def delete_task_db(self, task_id, timeout=None):
+        return await self._run(self.storage.delete_task_db, task_id, timeout=timeout)
+
+    async def update_tasks_bulk_db(self, new_status, timeout=None, **selection):
+        return await self._run(functools.partial(self.storage.update_tasks_bulk_db, new_status, **selection), timeout=timeout)
+
+    async def delete_tasks_bulk_db(self, timeout=None, **selection):
+        return await self._run(functools.partial(self.storage.delete_tasks_bulk_db, **selection), timeout=timeout)
+
+    async def archive_tasks_db(self, created_before, chunk_size=None, timeout=None):
+        return await self._run(self.storage.archive_tasks_db, created_before, chunk_size, timeout=timeout)
+
+    async def changes_since(self, cursor=0, limit=None, timeout=None):
+        return await self._run(self.storage.changes_since, cursor, limit, timeout=timeout)
+
+    async def fetch_archive_page_db(self, after_id=0, limit=None, timeout=None):
+        return await self._run(self.storage.fetch_archive_page_db, after_id, limit, timeout=timeout)
+
+    async def fetch_archived_task_db(self, task_id, timeout=None):
+        return await self._run(self.storage.fetch_archived_task_db, task_id, timeout=timeout)
+
+    async def fetch_stats_db(self, days=None, timeout=None):
+        return await self._run(self.storage.fetch_stats_db, *([] if days is None else [days]), timeout=timeout)
+
+    async def rebuild_stats_db(self, timeout=None):
+        return await self._run(self.storage.rebuild_stats_db, timeout=timeout)
+
+    # Async generator that yields unfinished tasks page by page (keyset pagination, see TaskStorage)
+    async def iter_task_pages_db(self, page_size=None):
+        page_size = page_size or self.storage.page_size
+        after_id = 0
+
+        while True:
+            page = await self.fetch_task_page_db(after_id, page_size)
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                return
+            after_id = page[-1][0]
+
+    # Function to wait for running calls, stop the worker threads and close the storage
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.storage.close()
+
+
+# Function to create an AsyncTaskDatabase on the backend selected in config.
+# For MySQL the connection pool gets one connection per worker, so workers never wait for each other.
+def open_async_storage(backend=None, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+    from task_storage import open_storage
+
+    return AsyncTaskDatabase(open_storage(backend, pool_size=max_workers), max_workers, timeout)
@@ -0,0 +1,264 @@
+# batch
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from archive import archive_done_tasks, DEFAULT_ARCHIVE_AFTER_DAYS
+from utils import normalize_state, validate_task, STATUSES
+
+# Maximum number of queued commands written together (one bulk statement / commit per group)
+BATCH_SIZE = 1000
+
+
+# Function to turn one input line into a command, or None for blank and comment lines.
+# Accepts JSON objects ({"op": "add", "title": ..., "description": ...}) or simple line syntax:
+#   add <title> | <description>
+#   update <id> <status>
+#   delete <id>
+#   list
+#   archive [<days>]
+#   stats
+# Raises ValueError with a message when the line is not a valid command.
+def parse_command(line):
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    if line.startswith("{"):
+        command = json.loads(line)
+    else:
+        op, _, rest = line.partition(" ")
+        command = {"op": op.lower()}
+
+        if command["op"] == "add":
+            title, separator, description = rest.partition("|")
+            if not separator:
+                raise ValueError("Use: add <title> | <description>")
+            command.update(title=title, description=description)
+        elif command["op"] == "update":
+            task_id, _, status = rest.strip().partition(" ")
+            command.update(id=task_id, status=status)
+        elif command["op"] == "delete":
+            command["id"] = rest.strip()
+        elif command["op"] == "archive" and rest.strip():
+            command["days"] = rest.strip()
+
+    return _check_command(command)
+
+
+# Helper function validating a parsed command and normalizing its values
+def _check_command(command):
+    op = command.get("op")
+
+    if op == "add":
+        title = str(command.get("title") or "").strip()
+        description = str(command.get("description") or "").strip()
+        error = validate_task(title, description)
+        if error:
+            raise ValueError(error)
+        return {"op": op, "title": title, "description": description}
+
+    if op in ("update", "delete"):
+        try:
+            task_id = int(command.get("id"))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid task ID '{command.get('id')}'.")
+
+        if op == "delete":
+            return {"op": op, "id": task_id}
+
+        status = normalize_state(str(command.get("status") or ""))
+        if status not in STATUSES:
+            raise ValueError(f"Invalid status '{command.get('status')}'.")
+        return {"op": op, "id": task_id, "status": status}
+
+    if op in ("list", "stats"):
+        return {"op": op}
+
+    if op == "archive":
+        if command.get("days") is None:
+            return {"op": op}
+        try:
+            days = int(command["days"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid number of days '{command['days']}'.")
+        if days < 0:
+            raise ValueError(f"Invalid number of days '{command['days']}'.")
+        return {"op": op, "days": days}
+
+    raise ValueError(f"Unknown operation '{op}'. Use add, update, delete, list, archive or stats.")
+
+
+# Runs a stream of commands against one storage without any prompts.
+# Consecutive commands of the same kind are queued and written together with the bulk APIs,
+# so thousands of operations cost a handful of statements and commits.
+# Every command gets one JSON result line on out; storage messages are sent to stderr.
+class BatchRunner:
+    def __init__(self, storage, out=None, batch_size=BATCH_SIZE, archive_days=DEFAULT_ARCHIVE_AFTER_DAYS):
+        self.storage = storage
+        self.out = out or sys.stdout
+        self.batch_size = batch_size
+        self.archive_days = archive_days
+        self.pending = []   # queued (line_number, command) of one group
+        self.succeeded = 0
+        self.failed = 0
+
+    # Function to run every command from lines and return the summary
+    def run(self, lines):
+        start = time.perf_counter()
+
+        with redirect_stdout(sys.stderr):
+            for line_number, line in enumerate(lines, 1):
+                try:
+                    command = parse_command(line)
+                except ValueError as error:
+                    self._report(line_number, None, False, error=str(error))
+                    continue
+
+                if command is None:
+                    continue
+
+                if self.pending and _group(self.pending[0][1]) != _group(command):
+                    self.flush()
+
+                if command["op"] == "list":
+                    self._list(line_number)
+                    continue
+
+                if command["op"] == "archive":
+                    self._archive(line_number, command.get("days", self.archive_days))
+                    continue
+
+                if command["op"] == "stats":
+                    self._stats(line_number)
+                    continue
+
+                self.pending.append((line_number, command))
+                if len(self.pending) >= self.batch_size:
+                    self.flush()
+
+            self.flush()
+
+        seconds = time.perf_counter() - start
+        commands = self.succeeded + self.failed
+        return {
+            "commands": commands,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "seconds": round(seconds, 3),
+            "ops_per_second": round(commands / seconds, 1) if seconds else 0.0,
+        }
+
+    # Function to write all queued commands with one bulk call
+    def flush(self):
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+
+        try:
+            op = pending[0][1]["op"]
+            if op == "add":
+                self._flush_adds(pending)
+            else:
+                self._flush_changes(pending)
+
+        except Exception as error:
+            # The whole group failed (e.g. lost connection) => report every command in it
+            for line_number, command in pending:
+                self._report(line_number, command["op"], False, error=str(error))
+
+    # Helper function inserting queued adds and matching the inserted IDs back to their lines
+    def _flush_adds(self, pending):
+        result = self.storage.add_tasks_bulk([(command["title"], command["description"]) for _, command in pending])
+
+        rejected = dict(result["rejected"])
+        inserted_ids = iter([task_id for first, last in result["inserted"] for task_id in range(first, last + 1)])
+
+        for index, (line_number, command) in enumerate(pending):
+            if index in rejected:
+                self._report(line_number, "add", False, error=rejected[index])
+            else:
+                self._report(line_number, "add", True, id=next(inserted_ids))
+
+    # Helper function applying queued updates (all with the same status) or deletes
+    def _flush_changes(self, pending):
+        op = pending[0][1]["op"]
+        existing = self.storage.fetch_existing_ids_db([command["id"] for _, command in pending])
+
+        if existing:
+            if op == "update":
+                self.storage.update_tasks_bulk_db(pending[0][1]["status"], ids=existing)
+            else:
+                self.storage.delete_tasks_bulk_db(ids=existing)
+
+        done = set()
+        for line_number, command in pending:
+            # The second delete of the same ID in one group finds nothing to delete
+            if command["id"] in existing and not (op == "delete" and command["id"] in done):
+                done.add(command["id"])
+                self._report(line_number, op, True, id=command["id"])
+            else:
+                self._report(line_number, op, False, id=command["id"], error="Task not found.")
+
+    # Helper function streaming unfinished tasks as JSON lines
+    def _list(self, line_number):
+        count = 0
+        try:
+            for page in self.storage.iter_task_pages_db():
+                for task in page:
+                    count += 1
+                    self._write({
+                        "line": line_number, "task": {
+                            "id": task.id, "title": task.title, "description": task.description,
+                            "status": task.status, "created_at": task.created_at.isoformat(),
+                        }
+                    })
+            self._report(line_number, "list", True, count=count)
+        except Exception as error:
+            self._report(line_number, "list", False, error=str(error))
+
+    # Helper function archiving old done tasks (chunked, see TaskStorage.archive_tasks_db)
+    def _archive(self, line_number, days):
+        try:
+            archived = archive_done_tasks(self.storage, days)
+            self._report(line_number, "archive", True, archived=archived)
+        except Exception as error:
+            self._report(line_number, "archive", False, error=str(error))
+
+    # Helper function reporting the maintained task statistics
+    def _stats(self, line_number):
+        try:
+            stats = self.storage.fetch_stats_db()
+            daily = [{"day": day.isoformat(), "created": created, "completed": completed} for day, created, completed in stats["daily"]]
+            self._report(line_number, "stats", True, statuses=stats["statuses"], total=stats["total"], daily=daily)
+        except Exception as error:
+            self._report(line_number, "stats", False, error=str(error))
+
+    # Helper function writing one command result and counting it
+    def _report(self, line_number, op, ok, **details):
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self._write({"line": line_number, "op": op, "ok": ok, **details})
+
+    def _write(self, record):
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+# Helper function returning the group key of a command: only commands with the same key are written together
+def _group(command):
+    if command["op"] == "update":
+        return ("update", command["status"])
+    return (command["op"],)
+
+
+# Function to run batch commands from a file path ("-" means stdin) and return the summary
+def run_batch(storage, path="-", out=None, batch_size=BATCH_SIZE, archive_days=DEFAULT_ARCHIVE_AFTER_DAYS):
+    runner = BatchRunner(storage, out, batch_size, archive_days)
+
+    if path == "-":
+        return runner.run(sys.stdin)
+
+    with open(path, encoding="utf-8") as lines:
+        return runner.run(lines)
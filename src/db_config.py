@@ -1,8 +1,10 @@
 # db_config
+# mysql.connector takes longer to import than the rest of the program together, so it is only imported
+# by the functions that connect (this module itself is only imported once a storage backend is opened)
 import os
-import mysql.connector
-import sys
-from mysql.connector import Error
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,50 +13,180 @@ load_dotenv()
 DB_CONFIG = {
     "host": "localhost",
     "user": "root",
-    "password": os.getenv("DB_PASSWORD") 
+    "password": os.getenv("DB_PASSWORD")
 }
 
+# Storage backend: "mysql" (default), "sqlite" (file or ":memory:") or "memory" (not persisted)
+STORAGE_BACKEND = os.getenv("TASK_STORAGE", "mysql")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "task_manager.db")
+
+# Optional read-through cache in front of the storage backend (TASK_CACHE=1 turns it on)
+CACHE_ENABLED = os.getenv("TASK_CACHE", "0") == "1"
+CACHE_SIZE = int(os.getenv("TASK_CACHE_SIZE", 128))
+CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", 5))  # seconds, covers writes made by other clients
+
+# Query instrumentation (TASK_INSTRUMENT=1): latency histogram per statement, slow-query log on stderr
+# above TASK_SLOW_QUERY_MS and, with TASK_METRICS_PATH set, a Prometheus text file written on exit
+INSTRUMENTATION_ENABLED = os.getenv("TASK_INSTRUMENT", "0") == "1"
+SLOW_QUERY_MS = float(os.getenv("TASK_SLOW_QUERY_MS", 200))
+METRICS_PATH = os.getenv("TASK_METRICS_PATH")
+
+# Archiving: done tasks created more than TASK_ARCHIVE_AFTER_DAYS days ago are moved to the archive table,
+# on demand (menu, batch "archive", --archive) or continuously every TASK_ARCHIVE_INTERVAL seconds (--archive-every)
+ARCHIVE_AFTER_DAYS = int(os.getenv("TASK_ARCHIVE_AFTER_DAYS", 30))
+ARCHIVE_INTERVAL = float(os.getenv("TASK_ARCHIVE_INTERVAL", 3600))
+
+DB_NAME = "task_manager"  # renamed from spravce_ukolu to English equivalent
+TEST_DB_NAME = "test_task_manager"  # renamed from testovaci_spravce_ukolu to English equivalent
+
+# Connection pool settings (can be overridden in .env)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))  # seconds to wait for a free or working connection
+
+# Prepared statements cached per connection for the hot single-task queries (0 sends them as plain text)
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 16))
+
+# Reconnect settings: number of attempts and first delay in seconds (doubled after every failure)
+CONNECT_RETRIES = int(os.getenv("DB_CONNECT_RETRIES", 5))
+CONNECT_BACKOFF = float(os.getenv("DB_CONNECT_BACKOFF", 0.5))
+MAX_BACKOFF = 8.0
+
+
+# Helper function that calls connect() until it succeeds, waiting longer after every failure.
+# Raises the last error once all attempts are used up, so the caller decides what to do.
+# connect() is always called at least once, whatever retries is set to.
+def retry_with_backoff(connect, description, retries=None, backoff=None):
+    from mysql.connector import Error
+
+    retries = max(CONNECT_RETRIES if retries is None else retries, 1)
+    delay = CONNECT_BACKOFF if backoff is None else backoff
+
+    for attempt in range(1, retries + 1):
+        try:
+            return connect()
+
+        except Error as error:
+            if attempt >= retries:
+                print(f"\n❌ Error connecting to {description}: {error}")
+                raise
+
+            print(f"\n⚠️  Connecting to {description} failed ({error}). Retrying in {delay:.1f}s...")
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_BACKOFF)
+
+
+# Helper function returning keyword arguments for mysql.connector, optionally with a database selected
+def connection_args(database=None):
+    args = {
+        "host": DB_CONFIG["host"],
+        "user": DB_CONFIG["user"],
+        "password": DB_CONFIG["password"],
+    }
+    if database:
+        args["database"] = database
+    return args
+
+
+# Helper function opening one MySQL connection with retries
+def _connect(database, description):
+    import mysql.connector
+    return retry_with_backoff(lambda: mysql.connector.connect(**connection_args(database)), description)
+
+
 # Connect to MySQL server without specifying a database
 def connect_to_mysql():
-    try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG["host"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-        )
-        return connection
-    
-    except Error as error:
-        print(f"\n❌ Error connecting to MySQL server: {error}")
-        sys.exit(1)
+    return _connect(None, "MySQL server")
 
 # Connect to production database and return connection
 def connect_to_db():
-    try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG["host"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            database="task_manager"  # renamed from spravce_ukolu to English equivalent
-        )
-        return connection
-    
-    except Error as error:
-        print(f"\n❌ Error connecting to the database: {error}")
-        sys.exit(1)
+    return _connect(DB_NAME, "the database")
 
 # Connect to test database and return connection
 # When the test database is created in test_init.py, this config will be reused in test fixtures
-def connect_to_test_db():
-    try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG["host"],
-            user=DB_CONFIG["user"],
-            password=DB_CONFIG["password"],
-            database="test_task_manager"  # renamed from testovaci_spravce_ukolu to English equivalent
-        )
-        return connection
-    
-    except Error as error:
-        print(f"\n❌ Error connecting to the test database: {error}")
-        sys.exit(1)
+# (parallel test runs give every worker its own database, see tests/conftest.py)
+def connect_to_test_db(database=None):
+    return _connect(database or TEST_DB_NAME, "the test database")
+
+
+# Bounded pool of connections that several threads or workers can share.
+# Connections are borrowed per operation and returned with close() (or by leaving the connection() block).
+# The pool connects on the first borrow, not when it is created, so a program that never touches
+# the database (e.g. --help, or a menu that is left right away) never waits for the server.
+# reset_session=False keeps the session of a returned connection as it is; resetting it would also
+# drop the prepared statements cached for the connection (see statement_cache.py).
+class ConnectionPool:
+    def __init__(self, database=DB_NAME, size=None, name=None, timeout=None, retries=None, backoff=None, reset_session=True):
+        self.database = database
+        self.size = size or POOL_SIZE
+        self.name = name or f"{database}_pool"
+        self.timeout = POOL_TIMEOUT if timeout is None else timeout
+        self.retries = retries
+        self.backoff = CONNECT_BACKOFF if backoff is None else backoff
+        self.reset_session = reset_session
+
+        self._pool = None
+        self._open_lock = threading.Lock()
+
+    # Helper function creating the underlying pool (and its connections) once
+    def _open(self):
+        from mysql.connector.pooling import MySQLConnectionPool
+
+        with self._open_lock:
+            if self._pool is None:
+                self._pool = retry_with_backoff(
+                    lambda: MySQLConnectionPool(
+                        pool_name=self.name, pool_size=self.size, pool_reset_session=self.reset_session,
+                        **connection_args(self.database)
+                    ),
+                    f"the database '{self.database}'",
+                    self.retries,
+                    self.backoff
+                )
+        return self._pool
+
+    # Function to borrow a connection from the pool.
+    # Health check on checkout: the pool pings the connection and reconnects it if it went stale.
+    # If the pool is exhausted or the server is unreachable, it waits with backoff until timeout.
+    def get_connection(self):
+        from mysql.connector import Error
+        from mysql.connector.errors import PoolError
+
+        pool = self._pool or self._open()
+        deadline = time.monotonic() + self.timeout
+        wait = 0.01
+        backoff = self.backoff
+
+        while True:
+            try:
+                return pool.get_connection()
+
+            except PoolError:
+                # Every connection is in use => wait for one to be returned
+                if time.monotonic() + wait > deadline:
+                    print(f"\n❌ No free database connection after {self.timeout:.0f}s.")
+                    raise
+                time.sleep(wait)
+                wait = min(wait * 2, 0.5)
+
+            except Error as error:
+                # Reconnecting the stale connection failed => server is down or restarting
+                if time.monotonic() + backoff > deadline:
+                    print(f"\n❌ Error reconnecting to the database: {error}")
+                    raise
+                print(f"\n⚠️  Reconnecting to the database failed ({error}). Retrying in {backoff:.1f}s...")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+
+    # Context manager that borrows a connection and always gives it back to the pool
+    @contextmanager
+    def connection(self):
+        connection = self.get_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()  # returns the connection to the pool instead of closing it
+
+    # Function to close every idle connection held by the pool (call on shutdown)
+    def close(self):
+        if self._pool is not None:
+            self._pool._remove_connections()
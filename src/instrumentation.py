@@ -0,0 +1,265 @@
+# instrumentation
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+# One measured database call: kind is "execute" or "commit", rows is the number of rows
+# returned (SELECT) or affected (INSERT/UPDATE/DELETE), seconds includes fetching the rows
+QueryEvent = namedtuple("QueryEvent", "kind fingerprint statement seconds rows")
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Statements slower than this are written to the slow-query log
+DEFAULT_SLOW_QUERY_SECONDS = 0.2
+
+STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+# A parenthesized group (one nesting level) repeated with commas, e.g. the rows of a multi-row INSERT
+REPEATED_GROUP = re.compile(r"(\([^()]*(?:\([^()]*\)[^()]*)*\))(?:\s*,\s*\1)+")
+
+
+# Function to reduce a statement to its shape: literals and placeholders become ?, lists and repeated
+# rows collapse to "...", so "id IN (1, 2, 3)" and "id IN (%s, %s)" are counted as the same query
+@lru_cache(maxsize=1024)
+def fingerprint(statement):
+    text = " ".join(statement.split())
+    text = STRING_LITERAL.sub("?", text)
+    text = NUMBER_LITERAL.sub("?", text)
+    text = text.replace("%s", "?")
+    text = PLACEHOLDER_LIST.sub("?, ...", text)
+    return REPEATED_GROUP.sub(r"\1, ...", text)
+
+
+# Collects query events from a storage backend and hands each one to every sink.
+# A sink is any callable taking a QueryEvent; sinks with a close() method are closed with the instrumentation.
+class Instrumentation:
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    # Function to add another sink
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def emit(self, event):
+        for sink in self.sinks:
+            sink(event)
+
+    # Function to close every sink that needs it (e.g. to write a metrics file on exit)
+    def close(self):
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+
+# Connection wrapper handed out by a storage backend while instrumentation is on.
+# Times commits and wraps every cursor; everything else goes to the real connection.
+class InstrumentedConnection:
+    def __init__(self, connection, instrumentation):
+        self._connection = connection
+        self._instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._instrumentation)
+
+    # sqlite3 shortcuts that create a cursor and run one statement on it
+    def execute(self, statement, *args):
+        return self.cursor().execute(statement, *args)
+
+    def executemany(self, statement, *args):
+        return self.cursor().executemany(statement, *args)
+
+    def commit(self):
+        start = time.perf_counter()
+        self._connection.commit()
+        self._instrumentation.emit(QueryEvent("commit", "COMMIT", "COMMIT", time.perf_counter() - start, 0))
+
+
+# Cursor wrapper measuring each statement from execute() until its rows are read.
+# A SELECT is reported once its rows are fetched (or the cursor moves on), so streamed results
+# count with their full time and row count; other statements are reported right after execute().
+class InstrumentedCursor:
+    def __init__(self, cursor, instrumentation):
+        self._cursor = cursor
+        self._instrumentation = instrumentation
+        self._pending = None  # [statement, seconds, rows] of the SELECT being read
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._finish()
+        return self._cursor.__exit__(*exc_info)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def execute(self, statement, *args):
+        return self._run(self._cursor.execute, statement, args)
+
+    def executemany(self, statement, *args):
+        return self._run(self._cursor.executemany, statement, args)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if self._pending is not None:
+            self._pending[2] += row is not None
+        self._finish()
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(self._cursor.fetchmany, *([] if size is None else [size]))
+        if self._pending is not None:
+            self._pending[2] += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        if self._pending is not None:
+            self._pending[2] += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    # Helper function running execute/executemany and starting (or directly reporting) its event
+    def _run(self, execute, statement, args):
+        self._finish()
+        start = time.perf_counter()
+        execute(statement, *args)
+        seconds = time.perf_counter() - start
+
+        if self._cursor.description is None:
+            rows = self._cursor.rowcount
+            self._instrumentation.emit(QueryEvent("execute", fingerprint(statement), statement, seconds, max(rows, 0)))
+        else:
+            self._pending = [statement, seconds, 0]
+        return self
+
+    # Helper function calling a fetch method and adding its time to the pending SELECT
+    def _timed(self, fetch, *args):
+        start = time.perf_counter()
+        result = fetch(*args)
+        if self._pending is not None:
+            self._pending[1] += time.perf_counter() - start
+        return result
+
+    def _finish(self):
+        if self._pending is not None:
+            statement, seconds, rows = self._pending
+            self._pending = None
+            self._instrumentation.emit(QueryEvent("execute", fingerprint(statement), statement, seconds, rows))
+
+
+# Sink counting events per statement fingerprint in cumulative latency buckets, plus row totals
+class LatencyHistogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}   # (kind, fingerprint) -> {"buckets": [...], "count", "sum", "rows"}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.kind, event.fingerprint)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0, "rows": 0}
+
+            for index, bound in enumerate(self.buckets):
+                if event.seconds <= bound:
+                    series["buckets"][index] += 1
+            series["count"] += 1
+            series["sum"] += event.seconds
+            series["rows"] += event.rows
+
+    # Function returning a copy of the collected series
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(series, buckets=list(series["buckets"])) for key, series in self._series.items()}
+
+    # Function returning the histogram in the Prometheus text exposition format
+    def prometheus_text(self, prefix="task_db"):
+        lines = [
+            f"# HELP {prefix}_query_duration_seconds Time spent on database statements and commits.",
+            f"# TYPE {prefix}_query_duration_seconds histogram",
+        ]
+        rows = [
+            f"# HELP {prefix}_query_rows_total Rows returned or affected by database statements.",
+            f"# TYPE {prefix}_query_rows_total counter",
+        ]
+
+        for (kind, query), series in sorted(self.snapshot().items()):
+            labels = f'kind="{kind}",query="{_escape_label(query)}"'
+            for bound, count in zip(self.buckets, series["buckets"]):
+                lines.append(f'{prefix}_query_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{prefix}_query_duration_seconds_bucket{{{labels},le="+Inf"}} {series["count"]}')
+            lines.append(f"{prefix}_query_duration_seconds_sum{{{labels}}} {series['sum']:.6f}")
+            lines.append(f"{prefix}_query_duration_seconds_count{{{labels}}} {series['count']}")
+            rows.append(f"{prefix}_query_rows_total{{{labels}}} {series['rows']}")
+
+        return "\n".join(lines + rows) + "\n"
+
+
+# Sink writing every statement slower than the threshold as one line to a file (stderr by default)
+class SlowQueryLog:
+    def __init__(self, threshold=DEFAULT_SLOW_QUERY_SECONDS, file=None):
+        self.threshold = threshold
+        self.file = file
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if event.seconds < self.threshold:
+            return
+
+        line = (
+            f"{datetime.now().isoformat(' ', 'seconds')} slow {event.kind} "
+            f"{event.seconds * 1000:.1f} ms rows={event.rows}: {event.fingerprint}\n"
+        )
+        with self._lock:
+            (self.file or sys.stderr).write(line)
+
+
+# Sink writing the histogram to a Prometheus textfile when the instrumentation is closed
+class PrometheusFile:
+    def __init__(self, histogram, path):
+        self.histogram = histogram
+        self.path = path
+
+    def __call__(self, event):
+        pass
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(self.histogram.prometheus_text())
+
+
+# Helper function escaping a Prometheus label value
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Function building the instrumentation configured in .env: latency histogram, slow-query log
+# and, if a path is set, a Prometheus metrics file written on exit
+def default_instrumentation(slow_query_seconds=DEFAULT_SLOW_QUERY_SECONDS, metrics_path=None):
+    histogram = LatencyHistogram()
+    instrumentation = Instrumentation([histogram, SlowQueryLog(slow_query_seconds)])
+    if metrics_path:
+        instrumentation.add_sink(PrometheusFile(histogram, metrics_path))
+    return instrumentation
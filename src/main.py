@@ -1,7 +1,27 @@
 # main
-from db_config import connect_to_db
-from task_database import TaskDatabase
+import argparse
+import json
+import sys
+from contextlib import nullcontext, redirect_stdout
+from archive import Archiver, archive_done_tasks
+from batch import run_batch
+from rendering import TaskRenderer, MODES
 from task_manager import TaskManager
+from task_storage import open_storage, BACKENDS
+from transfer import export_tasks, import_tasks, FORMATS
+
+# Startup stays cheap: db_config (which loads .env) is only imported once a command opens the storage, and the
+# MySQL driver only when the first operation reaches the database, so --help and argument errors appear without
+# either, and the menu without waiting for the driver.
+
+# Value of --archive-every without a number: the interval configured in .env
+CONFIGURED_INTERVAL = "configured"
+
+# Address of --serve without a value
+DEFAULT_ADDRESS = "127.0.0.1:8000"
+
+# Largest --workers: each worker gets a pooled MySQL connection, and mysql.connector pools hold at most 32
+MAX_WORKERS = 32
 
 
 # Main menu of the application
@@ -13,11 +33,17 @@ def main_menu(manager):
             2. Show tasks
             3. Update task
             4. Delete task
-            5. Exit program
+            5. Bulk update tasks
+            6. Bulk delete tasks
+            7. Search tasks
+            8. Archive done tasks
+            9. Show archived tasks
+            10. Show statistics
+            11. Exit program
             =================================================================
           """)
     
-        choice = input("\nChoose an option (1-5): ")
+        choice = input("\nChoose an option (1-11): ")
         
         if choice == "1":
             manager.add_task()
@@ -28,20 +54,198 @@ def main_menu(manager):
         elif choice == "4":
             manager.delete_task()
         elif choice == "5":
+            manager.bulk_update_tasks()
+        elif choice == "6":
+            manager.bulk_delete_tasks()
+        elif choice == "7":
+            manager.search_tasks()
+        elif choice == "8":
+            manager.archive_tasks()
+        elif choice == "9":
+            manager.show_archived_tasks()
+        elif choice == "10":
+            manager.show_stats()
+        elif choice == "11":
             print("\n👋  Program terminated.")
             break 
         else:
             print("\n❗  Invalid choice. Please try again.")
 
 
-# Create the tasks table in DB and run the main menu
-if __name__ == "__main__":
-    connection = connect_to_db()
-    if connection:
+# Helper function (argparse type) checking the number of --workers
+def workers_count(value):
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of workers: '{value}'")
+    if not 1 <= workers <= MAX_WORKERS:
+        raise argparse.ArgumentTypeError(f"must be between 1 and {MAX_WORKERS}, got {workers}")
+    return workers
+
+
+# Command-line options: without any, the interactive menu starts
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Command-line task manager.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--batch", nargs="?", const="-", metavar="FILE",
+        help="run add/update/delete/list commands (JSON lines or line syntax) from FILE or stdin, without the menu"
+    )
+    mode.add_argument("--export", metavar="FILE", help="write all tasks to a CSV or JSONL file (- for stdout)")
+    mode.add_argument("--import", dest="import_file", metavar="FILE", help="add tasks from a CSV or JSONL file (- for stdin)")
+    mode.add_argument("--archive", action="store_true", help="move old done tasks to the archive table and exit")
+    mode.add_argument("--rebuild-stats", action="store_true", help="recompute the task statistics from scratch and exit")
+    mode.add_argument(
+        "--serve", nargs="?", const=DEFAULT_ADDRESS, metavar="[HOST:]PORT",
+        help=f"serve the HTTP/JSON task API (default: {DEFAULT_ADDRESS}) until Ctrl+C"
+    )
+    parser.add_argument(
+        "--archive-days", type=int, metavar="DAYS",
+        help="archive done tasks created more than DAYS days ago (default: TASK_ARCHIVE_AFTER_DAYS from .env, or 30)"
+    )
+    parser.add_argument(
+        "--archive-every", type=float, nargs="?", const=CONFIGURED_INTERVAL, metavar="SECONDS",
+        help="with --archive: keep running and archive every SECONDS (default: TASK_ARCHIVE_INTERVAL from .env, or 3600) until Ctrl+C"
+    )
+    parser.add_argument("--format", choices=FORMATS, help="file format for --export/--import (default: from the file extension)")
+    parser.add_argument("--resume-from", type=int, default=0, metavar="N", help="skip the first N records of --import (continue an interrupted import)")
+    parser.add_argument(
+        "--output", choices=("auto",) + MODES, default="auto",
+        help="task listing format: aligned table paged on a terminal, plain lines otherwise (auto), or tab-separated (tsv)"
+    )
+    parser.add_argument(
+        "--workers", type=workers_count, default=16, metavar="N",
+        help=f"with --serve: worker threads, and database connections in the pool (1-{MAX_WORKERS}, default: 16)"
+    )
+    parser.add_argument("--storage", choices=BACKENDS, help="storage backend (default: TASK_STORAGE from .env)")
+    return parser.parse_args(argv)
+
+
+# Helper function filling in the options whose defaults come from .env
+# (db_config is imported by open_storage right after anyway, for the backend settings)
+def apply_config_defaults(args):
+    from db_config import ARCHIVE_AFTER_DAYS, ARCHIVE_INTERVAL
+
+    if args.archive_days is None:
+        args.archive_days = ARCHIVE_AFTER_DAYS
+    if args.archive_every == CONFIGURED_INTERVAL:
+        args.archive_every = ARCHIVE_INTERVAL
+
+
+# Open the storage backend chosen in config and run the main menu (or batch mode).
+# The menu connects and checks the schema on its first operation; the other modes use the database
+# right away, so they check it first and stop with an error if it can't be reached.
+# Returns the process exit code.
+def main(argv=None):
+    args = parse_args(argv)
+    # In batch mode (or when exporting to stdout) stdout carries the data, so messages go to stderr
+    quiet = args.batch or args.export == "-"
+    interactive = not (args.batch or args.export or args.import_file or args.archive or args.rebuild_stats or args.serve)
+
+    with redirect_stdout(sys.stderr) if quiet else nullcontext():
         try:
-            db = TaskDatabase(connection)
-            db.create_table_db()
-            manager = TaskManager(db)
-            main_menu(manager)
-        finally:
-            connection.close()
\ No newline at end of file
+            apply_config_defaults(args)
+            # Batch mode runs everything on one connection, the API server one per worker
+            db = open_storage(args.storage, pool_size=1 if args.batch else args.workers if args.serve else None)
+            if not interactive:
+                db.create_table_db()
+        except Exception as error:
+            print(f"\n❌ Could not open task storage: {error}")
+            return 1
+
+    try:
+        if args.batch:
+            summary = run_batch(db, args.batch, archive_days=args.archive_days)
+            print(json.dumps({"summary": summary}), file=sys.stderr)
+            return 1 if summary["failed"] else 0
+
+        if args.export or args.import_file:
+            return run_transfer(db, args)
+
+        if args.archive:
+            return run_archive(db, args)
+
+        if args.rebuild_stats:
+            return run_rebuild_stats(db)
+
+        if args.serve:
+            return run_server(db, args)
+
+        manager = TaskManager(db, TaskRenderer(args.output), args.archive_days)
+        main_menu(manager)
+        return 0
+    finally:
+        if hasattr(db, "cache_stats"):
+            print(f"\nℹ️  Cache statistics: {db.cache_stats()}", file=sys.stderr if quiet else sys.stdout)
+        if db.instrumentation is not None:
+            db.instrumentation.close()
+        db.close()
+
+
+# Run an export or import and return the exit code (1 if it failed or rows were rejected)
+def run_transfer(db, args):
+    try:
+        if args.export:
+            export_tasks(db, args.export, args.format)
+            return 0
+
+        summary = import_tasks(db, args.import_file, args.format, resume_from=args.resume_from)
+        for offset, error in summary["rejected"]:
+            print(f"❗  Record {offset} rejected: {error}")
+        return 1 if summary["rejected"] else 0
+
+    except (OSError, ValueError) as error:
+        print(f"\n❌  {error}", file=sys.stderr)
+        return 1
+    except db.Error:
+        # The storage already printed the error (and the import where to resume)
+        return 1
+
+
+# Archive old done tasks once, or every --archive-every seconds until interrupted, and return the exit code
+def run_archive(db, args):
+    try:
+        if args.archive_every is None:
+            archived = archive_done_tasks(db, args.archive_days)
+            print(f"\n🗄️  {archived} task(s) archived.")
+            return 0
+
+        archiver = Archiver(db, args.archive_days, args.archive_every)
+        try:
+            archiver.run()
+        except KeyboardInterrupt:
+            print(f"\nℹ️  Archiving stopped, {archiver.archived} task(s) archived.")
+        return 0
+
+    except db.Error:
+        # The storage already printed the error
+        return 1
+
+
+# Serve the HTTP/JSON API (api_server.py) on --serve [HOST:]PORT until interrupted, and return the exit code
+def run_server(db, args):
+    from api_server import serve
+
+    host, _, port = args.serve.rpartition(":")
+    try:
+        serve(db, host or "127.0.0.1", int(port), args.workers)
+        return 0
+    except (OSError, ValueError) as error:
+        print(f"\n❌  Could not start the API server on {args.serve}: {error}", file=sys.stderr)
+        return 1
+
+
+# Recompute the statistics tables (fixes counts that drifted, e.g. after manual changes in the database)
+def run_rebuild_stats(db):
+    try:
+        db.rebuild_stats_db()
+    except db.Error:
+        return 1
+
+    stats = db.fetch_stats_db()
+    print(f"\n✅ Statistics rebuilt: {stats['total']} task(s), " + ", ".join(f"{count} {status}" for status, count in stats["statuses"].items()) + ".")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+# memory_database
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from datetime import datetime
+from task_records import Task, ArchivedTask, TaskTitle, TaskColumns, TaskChange
+from task_storage import TaskStorage, DEFAULT_PAGE_SIZE, DEFAULT_BATCH_SIZE, DEFAULT_SEARCH_LIMIT, append_id_range, search_terms
+from utils import STATUSES, MAX_TITLE_LENGTH
+
+OPEN_STATUSES = ("not started", "in progress")
+
+
+class MemoryStorageError(Exception):
+    """Exception raised when a task breaks a rule the SQL schema would enforce."""
+    pass
+
+
+# Pure in-memory storage backend (dict of tasks, nothing is persisted).
+# Useful for local experiments and tests; enforces the same rules as the SQL schema.
+class MemoryTaskDatabase(TaskStorage):
+    Error = MemoryStorageError
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(page_size, batch_size)
+        self._tasks = {}    # id -> Task
+        self._ids = []      # sorted IDs, used for keyset pagination
+        self._next_id = 1
+        self._words = {}    # inverted index for search: word -> {id: occurrences}
+        self._word_list = []    # sorted words of the index, prefix matches are a bisect range of it
+        self._archive = {}  # id -> ArchivedTask
+        self._archive_ids = []
+        # Statistics, updated by every write like the triggers of the SQL backends
+        self._completed_at = {}         # id -> when the task became done (archived tasks included)
+        self._status_counts = Counter()
+        self._daily_counts = {}         # day -> [created, completed]
+        # Change feed: (task_id, kind, changed_at) of every write, the seq of a change is its position + 1
+        self._changes = []
+        self._lock = threading.RLock()
+
+    # Nothing to create for the in-memory backend
+    def create_table_db(self):
+        pass
+
+    # Helper function enforcing NOT NULL, non-blank and length rules of the SQL schema
+    def _check_task(self, title, description):
+        if not isinstance(title, str) or not title.strip():
+            raise MemoryStorageError("Task title must not be empty.")
+        if len(title) > MAX_TITLE_LENGTH:
+            raise MemoryStorageError(f"Task title must be at most {MAX_TITLE_LENGTH} characters long.")
+        if not isinstance(description, str) or not description.strip():
+            raise MemoryStorageError("Task description must not be empty.")
+
+    # Helper function to store a new task and return its ID (caller holds the lock)
+    def _insert(self, title, description, status=None, created_at=None):
+        self._check_task(title, description)
+
+        task_id = self._next_id
+        self._next_id += 1
+        # Whole seconds, like the DATETIME column of the SQL backends
+        created_at = created_at or datetime.now().replace(microsecond=0)
+        status = status or "not started"
+        self._tasks[task_id] = Task(task_id, title, description, status, created_at)
+        self._ids.append(task_id)
+        self._index_words(self._tasks[task_id])
+
+        self._status_counts[status] += 1
+        self._day(created_at)[0] += 1
+        if status == "done":
+            self._completed_at[task_id] = created_at
+            self._day(created_at)[1] += 1
+        self._log_change(task_id, "insert")
+        return task_id
+
+    # Helper function removing a task and its search index entries (caller holds the lock), returns it or None.
+    # A deleted task drops out of the daily counts; an archived one (archive=True) stays in them.
+    def _remove(self, task_id, archive=False):
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            del self._ids[bisect_left(self._ids, task_id)]
+            self._index_words(task, remove=True)
+            self._status_counts[task.status] -= 1
+            if not archive:
+                self._day(task.created_at)[0] -= 1
+                completed_at = self._completed_at.pop(task_id, None)
+                if completed_at is not None:
+                    self._day(completed_at)[1] -= 1
+            self._log_change(task_id, "delete")
+        return task
+
+    # Helper function changing the status of a stored task and its statistics (caller holds the lock)
+    def _set_status(self, task, new_status):
+        self._tasks[task.id] = task._replace(status=new_status)
+        if new_status == task.status:
+            return
+
+        self._log_change(task.id, "update")
+        self._status_counts[task.status] -= 1
+        self._status_counts[new_status] += 1
+        if task.status == "done":
+            self._day(self._completed_at.pop(task.id))[1] -= 1
+        if new_status == "done":
+            completed_at = datetime.now().replace(microsecond=0)
+            self._completed_at[task.id] = completed_at
+            self._day(completed_at)[1] += 1
+
+    # Helper function appending a change to the change feed (caller holds the lock)
+    def _log_change(self, task_id, kind):
+        self._changes.append((task_id, kind, datetime.now().replace(microsecond=0)))
+
+    # Helper function returning the [created, completed] counters of the day of a datetime
+    def _day(self, moment):
+        return self._daily_counts.setdefault(moment.date(), [0, 0])
+
+    # Helper function adding (or removing) the words of a task to the inverted search index
+    def _index_words(self, task, remove=False):
+        for word, count in Counter(search_terms(f"{task.title} {task.description}")).items():
+            postings = self._words.get(word)
+            if not remove:
+                if postings is None:
+                    postings = self._words[word] = {}
+                    insort(self._word_list, word)
+                postings[task.id] = count
+                continue
+
+            if postings is None:
+                continue
+            postings.pop(task.id, None)
+            if not postings:
+                del self._words[word]
+                del self._word_list[bisect_left(self._word_list, word)]
+
+    # Function to insert a task
+    def add_task_db(self, title, description):
+        try:
+            with self._lock:
+                task_id = self._insert(title, description)
+
+            self._report(f"\n✅ Task was added with ID: {task_id}")
+            return task_id
+        except MemoryStorageError as error:
+            self._report(f"\n❌  Error while adding task: {error}")
+            raise
+
+    # Function to return all unfinished tasks
+    def fetch_tasks_db(self):
+        with self._lock:
+            return [task for task in self._tasks.values() if task.status in OPEN_STATUSES]
+
+    # Helper function to insert one batch; rows breaking the schema rules are rejected one by one
+    def _insert_batch(self, batch, result):
+        with self._lock:
+            for index, *values in batch:
+                try:
+                    task_id = self._insert(*values)
+                    append_id_range(result["inserted"], task_id, task_id)
+                except MemoryStorageError as error:
+                    result["rejected"].append((index, str(error)))
+
+    # Function to return one page of unfinished tasks with ID greater than after_id
+    def fetch_task_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        page = []
+
+        with self._lock:
+            for position in range(bisect_right(self._ids, after_id), len(self._ids)):
+                task = self._tasks[self._ids[position]]
+                if task.status in OPEN_STATUSES:
+                    page.append(task)
+                    if len(page) >= limit:
+                        break
+
+        return page
+
+    # Generator yielding every task in ID order, chunk_size tasks at a time (the lock is released between chunks)
+    def stream_tasks_db(self, chunk_size=None):
+        chunk_size = chunk_size or self.page_size
+        after_id = 0
+
+        while True:
+            with self._lock:
+                start = bisect_right(self._ids, after_id)
+                chunk = [self._tasks[task_id] for task_id in self._ids[start:start + chunk_size]]
+
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1].id
+
+    # Function to return one task by ID, or None if it does not exist
+    def fetch_task_db(self, task_id):
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    # Function to search title and description through the inverted index.
+    # Every word is required and also matches longer words starting with it; more occurrences rank higher.
+    def search_tasks_db(self, query, limit=None, offset=0):
+        limit = limit or DEFAULT_SEARCH_LIMIT
+        scores = None
+
+        with self._lock:
+            for term in search_terms(query):
+                matches = Counter()
+                # Words starting with term sort right after it => bisect to the first one, stop at the first that doesn't
+                for position in range(bisect_left(self._word_list, term), len(self._word_list)):
+                    word = self._word_list[position]
+                    if not word.startswith(term):
+                        break
+                    matches.update(self._words[word])
+
+                if scores is None:
+                    scores = matches
+                else:
+                    # Keep only the tasks that matched every earlier word too
+                    scores = Counter({task_id: scores[task_id] + count for task_id, count in matches.items() if task_id in scores})
+                if not scores:
+                    return []
+
+            if scores is None:
+                return []
+
+            ranked = sorted(scores, key=lambda task_id: (-scores[task_id], task_id))
+            return [self._tasks[task_id] for task_id in ranked[offset:offset + limit]]
+
+    # Function to check whether any task exists
+    def has_tasks_db(self):
+        with self._lock:
+            return bool(self._tasks)
+
+    # Helper function to return all task IDs and titles
+    def fetch_task_ids_db(self):
+        with self._lock:
+            return [TaskTitle(task.id, task.title) for task in self._tasks.values()]
+
+    # Function to return the ID and status of every task as parallel arrays
+    def fetch_task_columns_db(self, chunk_size=None):
+        columns = TaskColumns()
+        with self._lock:
+            for task_id in self._ids:
+                columns.append(task_id, self._tasks[task_id].status)
+        return columns
+
+    # Function to update the task status
+    def update_task_db(self, task_id, new_status):
+        if new_status not in STATUSES:
+            self._report(f"\n❌  Error updating task: invalid status '{new_status}'")
+            return False
+
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                self._set_status(task, new_status)
+        return True
+
+    # Function to delete a task by ID
+    def delete_task_db(self, task_id):
+        with self._lock:
+            if self._remove(task_id) is None:
+                # No task deleted => invalid id
+                return False
+        return True
+
+    # Function to return the changes after cursor (a seq), each with the current state of its task
+    def changes_since(self, cursor=0, limit=None):
+        limit = limit or self.page_size
+        start = max(cursor, 0)
+        with self._lock:
+            return [
+                TaskChange(seq, task_id, kind, changed_at, self._tasks.get(task_id))
+                for seq, (task_id, kind, changed_at) in enumerate(self._changes[start:start + limit], start + 1)
+            ]
+
+    # Function to return one page of archived tasks with ID greater than after_id
+    def fetch_archive_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        with self._lock:
+            start = bisect_right(self._archive_ids, after_id)
+            return [self._archive[task_id] for task_id in self._archive_ids[start:start + limit]]
+
+    # Function to return one archived task by ID, or None if it is not archived
+    def fetch_archived_task_db(self, task_id):
+        with self._lock:
+            return self._archive.get(task_id)
+
+    # Helper function moving a chunk of done tasks to the archive
+    def _archive_ids_db(self, task_ids):
+        archived_at = datetime.now().replace(microsecond=0)
+        archived = 0
+
+        with self._lock:
+            for task_id in task_ids:
+                task = self._tasks.get(task_id)
+                if task is None or task.status != "done":
+                    continue
+
+                self._remove(task_id, archive=True)
+                self._archive[task_id] = ArchivedTask(*task, archived_at)
+                insort(self._archive_ids, task_id)
+                archived += 1
+        return archived
+
+    # Helper function returning the counters kept by every write
+    def _fetch_counts_db(self, since):
+        with self._lock:
+            statuses = [(status, count) for status, count in self._status_counts.items() if count]
+            daily = sorted((day, *counts) for day, counts in self._daily_counts.items() if day >= since)
+        return statuses, daily
+
+    # Function to recompute the statistics from the stored and archived tasks
+    def rebuild_stats_db(self):
+        with self._lock:
+            self._status_counts = Counter(task.status for task in self._tasks.values())
+            self._daily_counts = {}
+            for task in [*self._tasks.values(), *self._archive.values()]:
+                self._day(task.created_at)[0] += 1
+            for completed_at in self._completed_at.values():
+                self._day(completed_at)[1] += 1
+
+    # Function to apply a group of queued writes (see write_queue.py) under one lock
+    def apply_writes_db(self, operations):
+        results = []
+        with self._lock:
+            for kind, *args in operations:
+                try:
+                    results.append(self._apply_write(kind, args))
+                except MemoryStorageError as error:
+                    results.append(error)
+        return results
+
+    # Helper function running one queued write and returning its result (caller holds the lock)
+    def _apply_write(self, kind, args):
+        if kind == "add":
+            return self._insert(*args)
+        if kind == "update":
+            task_id, new_status = args
+            if new_status not in STATUSES:
+                raise MemoryStorageError(f"Invalid status '{new_status}'.")
+            task = self._tasks.get(task_id)
+            if task is not None:
+                self._set_status(task, new_status)
+            return True
+        return self._remove(*args) is not None
+
+    # Helper function returning up to limit IDs of tasks matching a bulk selection.
+    # An ID list is looked up in the dict; otherwise the sorted IDs are scanned from after_id (or the range start).
+    def _select_ids_db(self, selection, after_id, limit):
+        matched = []
+
+        with self._lock:
+            if "ids" in selection:
+                filters = {key: value for key, value in selection.items() if key != "ids"}
+                candidates = sorted(task_id for task_id in set(selection["ids"]) if task_id > after_id and task_id in self._tasks)
+            else:
+                filters = selection
+                start = bisect_right(self._ids, after_id)
+                stop = len(self._ids)
+                if "id_range" in selection:
+                    first, last = selection["id_range"]
+                    start = max(start, bisect_left(self._ids, first))
+                    stop = bisect_right(self._ids, last)
+                candidates = (self._ids[position] for position in range(start, stop))
+
+            for task_id in candidates:
+                if _matches(self._tasks[task_id], filters):
+                    matched.append(task_id)
+                    if len(matched) >= limit:
+                        break
+
+        return matched
+
+    # Helper function updating a chunk of tasks, all or nothing like a transaction
+    def _update_ids_db(self, task_ids, new_status):
+        if new_status not in STATUSES:
+            self._report(f"\n❌  Error updating tasks: invalid status '{new_status}'")
+            raise MemoryStorageError(f"Invalid status '{new_status}'.")
+
+        affected = 0
+        with self._lock:
+            for task_id in task_ids:
+                task = self._tasks.get(task_id)
+                if task is not None:
+                    self._set_status(task, new_status)
+                    affected += 1
+        return affected
+
+    # Helper function deleting a chunk of tasks
+    def _delete_ids_db(self, task_ids):
+        deleted = 0
+        with self._lock:
+            for task_id in task_ids:
+                if self._remove(task_id) is not None:
+                    deleted += 1
+        return deleted
+
+
+# Helper function checking a task against a bulk selection (see task_storage.make_selection).
+# ID lists are not checked here: _select_ids_db looks them up directly.
+def _matches(task, selection):
+    if "id_range" in selection and not selection["id_range"][0] <= task.id <= selection["id_range"][1]:
+        return False
+    if "id_ranges" in selection and not any(first <= task.id <= last for first, last in selection["id_ranges"]):
+        return False
+    if "status" in selection and task.status != selection["status"]:
+        return False
+    if "created_before" in selection and not task.created_at < selection["created_before"]:
+        return False
+    return True
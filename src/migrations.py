@@ -0,0 +1,414 @@
+# migrations
+# mysql.connector is imported by the functions that talk to the server: importing this module (the MIGRATIONS list)
+# must not load the driver before the first database operation
+
+# Name of the MySQL advisory lock that keeps two processes from migrating at the same time
+MIGRATION_LOCK = "task_manager_migrations"
+
+# IDs of existing rows a backfill step changes per transaction
+BACKFILL_CHUNK_SIZE = 10000
+
+
+# Helper returning a migration step that runs a plain SQL statement (must be idempotent on its own)
+def sql(statement):
+    def step(cursor):
+        cursor.execute(statement)
+    return step
+
+
+# Helper returning a migration step that adds an index only if it does not exist yet.
+# The index is built in place (ALGORITHM=INPLACE, LOCK=NONE), so existing tables are not copied or locked.
+# Index kinds that can't be built with LOCK=NONE (FULLTEXT) pass the weakest lock they allow.
+# The first FULLTEXT index of an InnoDB table still rebuilds the table (it adds the hidden FTS_DOC_ID column).
+def add_index(table, name, columns, kind="INDEX", lock="NONE"):
+    def step(cursor):
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            (table, name)
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE {table} ADD {kind} {name} ({columns}), ALGORITHM=INPLACE, LOCK={lock}")
+    return step
+
+
+# Helper returning a migration step that adds a column only if it does not exist yet.
+# No ALGORITHM is forced, so MySQL 8 adds the column instantly instead of rebuilding the table.
+def add_column(table, name, definition):
+    def step(cursor):
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+            (table, name)
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    return step
+
+
+# Helper returning a migration step that runs statement over the existing rows of table in primary key ranges of
+# chunk_size IDs (its two parameters: the first and last ID of the range), committing after each range.
+# Like the archiver, no transaction outlives one range: a single UPDATE over millions of rows would hold
+# its row locks and undo log until the end. The statement must be idempotent, so an interrupted migration can run
+# the step again; resume_after is a query giving the last ID already done (or NULL), to continue from there.
+def backfill(table, statement, chunk_size=BACKFILL_CHUNK_SIZE, resume_after=None):
+    def step(cursor):
+        cursor.execute(f"SELECT MIN(id), MAX(id) FROM {table}")
+        first_id, last_id = cursor.fetchone()
+        if first_id is None:
+            return   # empty table
+
+        if resume_after is not None:
+            cursor.execute(resume_after)
+            done = cursor.fetchone()[0]
+            if done is not None:
+                first_id = max(first_id, done + 1)
+
+        for start in range(first_id, last_id + 1, chunk_size):
+            cursor.execute(statement, (start, min(start + chunk_size - 1, last_id)))
+            cursor.execute("COMMIT")
+    return step
+
+
+# Helper returning a migration step that (re)creates a trigger from its definition
+def trigger(name, definition):
+    def step(cursor):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {definition}")
+    return step
+
+
+# Statements recomputing the statistics tables from scratch: status counts of the tasks table,
+# created and completed counts per day of every task that still exists, archived ones included.
+# The triggers keep the same meaning: a delete takes the task out of the daily counts, archiving doesn't.
+REBUILD_STATS = [
+    "DELETE FROM task_status_counts",
+    "INSERT INTO task_status_counts (status, task_count) SELECT status, COUNT(*) FROM tasks GROUP BY status",
+    "DELETE FROM task_daily_counts",
+    """
+        INSERT INTO task_daily_counts (day, created, completed)
+        SELECT day, SUM(created), SUM(completed) FROM (
+            SELECT DATE(created_at) AS day, 1 AS created, 0 AS completed FROM tasks WHERE created_at IS NOT NULL
+            UNION ALL SELECT DATE(completed_at), 0, 1 FROM tasks WHERE completed_at IS NOT NULL
+            UNION ALL SELECT DATE(created_at), 1, 0 FROM tasks_archive WHERE created_at IS NOT NULL
+            UNION ALL SELECT DATE(completed_at), 0, 1 FROM tasks_archive WHERE completed_at IS NOT NULL
+        ) AS events
+        GROUP BY day
+    """,
+]
+
+
+# Statements run after REBUILD_STATS from version 9 on: the recomputed counts already include what the deltas added
+CLEAR_STATS_DELTAS = [
+    "DELETE FROM task_status_deltas",
+    "DELETE FROM task_daily_deltas",
+]
+
+
+# Ordered list of schema migrations: (version, description, steps).
+# Steps must be idempotent, so databases created before versioning existed can be upgraded in place.
+MIGRATIONS = [
+    (1, "create tasks table", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                title VARCHAR(50) NOT NULL,
+                description TEXT NOT NULL,
+                status ENUM('not started', 'done', 'in progress') NOT NULL DEFAULT 'not started',
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                CHECK (CHAR_LENGTH(TRIM(title)) > 0),
+                CHECK (CHAR_LENGTH(TRIM(description)) > 0)
+            );
+        """),
+    ]),
+    # Listing of unfinished tasks filters on status => avoid a full table scan over completed tasks
+    (2, "index tasks by status and creation date", [
+        add_index("tasks", "idx_tasks_status_created", "status, created_at, id"),
+    ]),
+    # Keyset pagination (status IN (...) AND id > ? ORDER BY id) reads index ranges per status
+    (3, "index tasks by status and id for paginated listing", [
+        add_index("tasks", "idx_tasks_status_id", "status, id"),
+    ]),
+    # Search looks up words in title and description => FULLTEXT index instead of LIKE '%...%' table scans.
+    # Writes wait while it is built (LOCK=SHARED), reads continue. Being the first FULLTEXT index on tasks,
+    # it rebuilds the table => takes as long as copying the table on large databases.
+    (4, "full-text index on task title and description", [
+        add_index("tasks", "ft_tasks_title_description", "title, description", kind="FULLTEXT INDEX", lock="SHARED"),
+    ]),
+    # Old done tasks are moved here (keeping their IDs), so tasks and its indexes only grow with open work
+    (5, "archive table for completed tasks", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS tasks_archive (
+                id INT PRIMARY KEY,
+                title VARCHAR(50) NOT NULL,
+                description TEXT NOT NULL,
+                status ENUM('not started', 'done', 'in progress') NOT NULL,
+                created_at DATETIME,
+                archived_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+        """),
+    ]),
+    # Summary tables kept up to date by triggers, so statistics are read from a few rows instead of
+    # counting the tasks. completed_at is set by the triggers when a task becomes done.
+    (6, "status and daily statistics", [
+        add_column("tasks", "completed_at", "DATETIME NULL"),
+        add_column("tasks_archive", "completed_at", "DATETIME NULL"),
+        # Completion time of tasks finished before this version is unknown => counted on their creation day
+        backfill("tasks", "UPDATE tasks SET completed_at = created_at WHERE id BETWEEN %s AND %s AND status = 'done' AND completed_at IS NULL"),
+        backfill("tasks_archive", "UPDATE tasks_archive SET completed_at = created_at WHERE id BETWEEN %s AND %s AND completed_at IS NULL"),
+        sql("""
+            CREATE TABLE IF NOT EXISTS task_status_counts (
+                status ENUM('not started', 'done', 'in progress') PRIMARY KEY,
+                task_count BIGINT NOT NULL DEFAULT 0
+            );
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS task_daily_counts (
+                day DATE PRIMARY KEY,
+                created INT NOT NULL DEFAULT 0,
+                completed INT NOT NULL DEFAULT 0
+            );
+        """),
+        trigger("tasks_completed_insert", """
+            BEFORE INSERT ON tasks FOR EACH ROW
+            SET NEW.completed_at = IF(NEW.status = 'done', COALESCE(NEW.completed_at, NEW.created_at, NOW()), NULL)
+        """),
+        trigger("tasks_completed_update", """
+            BEFORE UPDATE ON tasks FOR EACH ROW
+            SET NEW.completed_at = IF(NEW.status <> 'done', NULL, IF(OLD.status = 'done', OLD.completed_at, NOW()))
+        """),
+        trigger("tasks_stats_insert", """
+            AFTER INSERT ON tasks FOR EACH ROW BEGIN
+                INSERT INTO task_status_counts (status, task_count) VALUES (NEW.status, 1)
+                    ON DUPLICATE KEY UPDATE task_count = task_count + 1;
+                INSERT INTO task_daily_counts (day, created) VALUES (DATE(COALESCE(NEW.created_at, NOW())), 1)
+                    ON DUPLICATE KEY UPDATE created = created + 1;
+                IF NEW.status = 'done' THEN
+                    INSERT INTO task_daily_counts (day, completed) VALUES (DATE(NEW.completed_at), 1)
+                        ON DUPLICATE KEY UPDATE completed = completed + 1;
+                END IF;
+            END
+        """),
+        trigger("tasks_stats_update", """
+            AFTER UPDATE ON tasks FOR EACH ROW BEGIN
+                IF NEW.status <> OLD.status THEN
+                    UPDATE task_status_counts SET task_count = task_count - 1 WHERE status = OLD.status;
+                    INSERT INTO task_status_counts (status, task_count) VALUES (NEW.status, 1)
+                        ON DUPLICATE KEY UPDATE task_count = task_count + 1;
+                END IF;
+                IF OLD.status = 'done' AND NEW.status <> 'done' THEN
+                    UPDATE task_daily_counts SET completed = completed - 1 WHERE day = DATE(OLD.completed_at);
+                END IF;
+                IF NEW.status = 'done' AND OLD.status <> 'done' THEN
+                    INSERT INTO task_daily_counts (day, completed) VALUES (DATE(NEW.completed_at), 1)
+                        ON DUPLICATE KEY UPDATE completed = completed + 1;
+                END IF;
+            END
+        """),
+        trigger("tasks_stats_delete", """
+            AFTER DELETE ON tasks FOR EACH ROW
+            UPDATE task_status_counts SET task_count = task_count - 1 WHERE status = OLD.status
+        """),
+        # Counts of the tasks that existed before this version
+        *[sql(statement) for statement in REBUILD_STATS],
+    ]),
+    # Change feed for clients mirroring the tasks: every insert, update and delete (tombstone) gets the next
+    # seq of task_changes, so a client reads only the changes after the last seq it saw (changes_since)
+    (7, "task change feed", [
+        add_column("tasks", "updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+        # Last known change of the tasks that existed before this version
+        backfill("tasks", "UPDATE tasks SET updated_at = COALESCE(completed_at, created_at) WHERE id BETWEEN %s AND %s"),
+        sql("""
+            CREATE TABLE IF NOT EXISTS task_changes (
+                seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+                task_id INT NOT NULL,
+                kind ENUM('insert', 'update', 'delete') NOT NULL,
+                changed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """),
+        # The tasks that existed before this version start the feed, so a new client can begin at seq 0.
+        # The triggers don't exist yet, so the feed only holds these rows: an interrupted backfill continues after them.
+        backfill("tasks", """
+            INSERT INTO task_changes (task_id, kind, changed_at)
+            SELECT id, 'insert', created_at FROM tasks WHERE id BETWEEN %s AND %s ORDER BY id
+        """, resume_after="SELECT MAX(task_id) FROM task_changes"),
+        trigger("tasks_changes_insert", """
+            AFTER INSERT ON tasks FOR EACH ROW
+            INSERT INTO task_changes (task_id, kind) VALUES (NEW.id, 'insert')
+        """),
+        # An UPDATE that leaves the task as it was (same status again) is not a change
+        trigger("tasks_changes_update", """
+            AFTER UPDATE ON tasks FOR EACH ROW BEGIN
+                IF NOT (NEW.title <=> OLD.title AND NEW.description <=> OLD.description AND NEW.status <=> OLD.status) THEN
+                    INSERT INTO task_changes (task_id, kind) VALUES (NEW.id, 'update');
+                END IF;
+            END
+        """),
+        trigger("tasks_changes_delete", """
+            AFTER DELETE ON tasks FOR EACH ROW
+            INSERT INTO task_changes (task_id, kind) VALUES (OLD.id, 'delete')
+        """),
+    ]),
+    # The daily counts kept deleted tasks while REBUILD_STATS drops them => deletes now take a task out of the
+    # daily counts too. Archiving deletes from tasks as well, so its insert into tasks_archive adds the task back.
+    (8, "daily statistics without deleted tasks", [
+        trigger("tasks_stats_delete", """
+            AFTER DELETE ON tasks FOR EACH ROW BEGIN
+                UPDATE task_status_counts SET task_count = task_count - 1 WHERE status = OLD.status;
+                UPDATE task_daily_counts SET created = created - 1 WHERE day = DATE(OLD.created_at);
+                IF OLD.completed_at IS NOT NULL THEN
+                    UPDATE task_daily_counts SET completed = completed - 1 WHERE day = DATE(OLD.completed_at);
+                END IF;
+            END
+        """),
+        trigger("tasks_archive_stats_insert", """
+            AFTER INSERT ON tasks_archive FOR EACH ROW BEGIN
+                IF NEW.created_at IS NOT NULL THEN
+                    INSERT INTO task_daily_counts (day, created) VALUES (DATE(NEW.created_at), 1)
+                        ON DUPLICATE KEY UPDATE created = created + 1;
+                END IF;
+                IF NEW.completed_at IS NOT NULL THEN
+                    INSERT INTO task_daily_counts (day, completed) VALUES (DATE(NEW.completed_at), 1)
+                        ON DUPLICATE KEY UPDATE completed = completed + 1;
+                END IF;
+            END
+        """),
+        # Counts skewed by the deletes made before this version
+        *[sql(statement) for statement in REBUILD_STATS],
+    ]),
+    # The triggers used to update one shared row per status and today's row of the summary tables. Every write held
+    # their locks until its commit, so concurrent writes queued behind each other, and two transactions moving tasks
+    # in opposite directions (not started => done, done => not started) deadlocked on the same two rows.
+    # They now only insert delta rows (no shared row is locked); reads add them to the summary rows and fold them in.
+    (9, "insert-only statistics deltas", [
+        sql("""
+            CREATE TABLE IF NOT EXISTS task_status_deltas (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                status ENUM('not started', 'done', 'in progress') NOT NULL,
+                task_count INT NOT NULL
+            );
+        """),
+        sql("""
+            CREATE TABLE IF NOT EXISTS task_daily_deltas (
+                id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                day DATE NOT NULL,
+                created INT NOT NULL DEFAULT 0,
+                completed INT NOT NULL DEFAULT 0
+            );
+        """),
+        trigger("tasks_stats_insert", """
+            AFTER INSERT ON tasks FOR EACH ROW BEGIN
+                INSERT INTO task_status_deltas (status, task_count) VALUES (NEW.status, 1);
+                INSERT INTO task_daily_deltas (day, created) VALUES (DATE(COALESCE(NEW.created_at, NOW())), 1);
+                IF NEW.status = 'done' THEN
+                    INSERT INTO task_daily_deltas (day, completed) VALUES (DATE(NEW.completed_at), 1);
+                END IF;
+            END
+        """),
+        trigger("tasks_stats_update", """
+            AFTER UPDATE ON tasks FOR EACH ROW BEGIN
+                IF NEW.status <> OLD.status THEN
+                    INSERT INTO task_status_deltas (status, task_count) VALUES (OLD.status, -1), (NEW.status, 1);
+                END IF;
+                IF OLD.status = 'done' AND NEW.status <> 'done' THEN
+                    INSERT INTO task_daily_deltas (day, completed) VALUES (DATE(OLD.completed_at), -1);
+                END IF;
+                IF NEW.status = 'done' AND OLD.status <> 'done' THEN
+                    INSERT INTO task_daily_deltas (day, completed) VALUES (DATE(NEW.completed_at), 1);
+                END IF;
+            END
+        """),
+        trigger("tasks_stats_delete", """
+            AFTER DELETE ON tasks FOR EACH ROW BEGIN
+                INSERT INTO task_status_deltas (status, task_count) VALUES (OLD.status, -1);
+                IF OLD.created_at IS NOT NULL THEN
+                    INSERT INTO task_daily_deltas (day, created) VALUES (DATE(OLD.created_at), -1);
+                END IF;
+                IF OLD.completed_at IS NOT NULL THEN
+                    INSERT INTO task_daily_deltas (day, completed) VALUES (DATE(OLD.completed_at), -1);
+                END IF;
+            END
+        """),
+        trigger("tasks_archive_stats_insert", """
+            AFTER INSERT ON tasks_archive FOR EACH ROW BEGIN
+                IF NEW.created_at IS NOT NULL THEN
+                    INSERT INTO task_daily_deltas (day, created) VALUES (DATE(NEW.created_at), 1);
+                END IF;
+                IF NEW.completed_at IS NOT NULL THEN
+                    INSERT INTO task_daily_deltas (day, completed) VALUES (DATE(NEW.completed_at), 1);
+                END IF;
+            END
+        """),
+    ]),
+]
+
+# Latest schema version known to this code
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# Function to create the schema version table and return the currently applied version (0 for a fresh database)
+def current_version(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+# Function to check whether the schema already has the latest version with one plain SELECT:
+# no DDL and no migration lock, which is all an up-to-date database (every start but the first) needs
+def is_up_to_date(cursor, migrations=MIGRATIONS):
+    from mysql.connector import Error, errorcode
+
+    try:
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    except Error as error:
+        if error.errno == errorcode.ER_NO_SUCH_TABLE:
+            # Fresh database
+            return False
+        raise
+    return cursor.fetchone()[0] >= migrations[-1][0]
+
+
+# Function to apply every migration newer than the current schema version, in order.
+# Each applied version is recorded (and committed) right after its steps, so an interrupted
+# upgrade resumes where it stopped. Returns the list of versions that were applied.
+def migrate(connection, migrations=MIGRATIONS):
+    from mysql.connector import Error
+
+    applied = []
+
+    with connection.cursor() as cursor:
+        if is_up_to_date(cursor, migrations):
+            return applied
+
+        cursor.execute("SELECT GET_LOCK(%s, 30)", (MIGRATION_LOCK,))
+        if cursor.fetchone()[0] != 1:
+            raise Error(msg="Timed out waiting for another process to finish migrating the schema.")
+
+        try:
+            version = current_version(cursor)
+
+            for target, description, steps in migrations:
+                if target <= version:
+                    continue
+
+                for step in steps:
+                    step(cursor)
+
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (target, description)
+                )
+                connection.commit()
+                applied.append(target)
+
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchone()
+
+    return applied
@@ -0,0 +1,121 @@
+# rendering
+import shutil
+import sys
+from functools import lru_cache
+from utils import MAX_TITLE_LENGTH
+
+# Output modes: "plain" numbered lines, "table" aligned columns, "tsv" one tab-separated task per line for scripts
+MODES = ("plain", "table", "tsv")
+
+# Table column widths: fixed, so every page lines up with the first one (longer numbers just push the row)
+NUMBER_WIDTH = 6
+ID_WIDTH = 8
+TITLE_WIDTH = MAX_TITLE_LENGTH
+STATUS_WIDTH = len("not started")
+DATE_WIDTH = len("31.12.2024 23:59")
+
+# Characters escaped in TSV output, so every task stays on one line
+TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+# Helper function formatting the date part once per day instead of calling strftime for every row
+@lru_cache(maxsize=4096)
+def _day(date):
+    return date.strftime("%d.%m.%Y")
+
+
+# Function to format a created_at value like strftime('%d.%m.%Y %H:%M'), but cached per day
+def format_created(created_at):
+    if created_at is None:
+        return ""
+    return f"{_day(created_at.date())} {created_at.hour:02d}:{created_at.minute:02d}"
+
+
+# Renders task rows page by page: each page is formatted into one string and written with a single call,
+# so a long listing costs one write per page instead of one print() per row.
+# In "auto" mode a terminal gets an aligned table paged one screen at a time, a pipe or file gets plain lines.
+class TaskRenderer:
+    def __init__(self, mode="auto", out=None, prompt=None):
+        if mode != "auto" and mode not in MODES:
+            raise ValueError(f"Unknown output mode '{mode}'. Choose one of: auto, {', '.join(MODES)}.")
+        self.mode = mode
+        self.out = out
+        self.prompt = prompt
+
+    # Function to write every task of pages (iterable of row lists), numbered from start.
+    # Returns the number of written tasks; stops early when the user quits the pager.
+    def render(self, pages, start=1):
+        out = self.out or sys.stdout
+        interactive = out.isatty()
+        mode = ("table" if interactive else "plain") if self.mode == "auto" else self.mode
+
+        format_rows = getattr(self, f"_{mode}_rows")
+        terminal = shutil.get_terminal_size()
+        self._width = terminal.columns
+        # One screen per pager stop, minus the prompt line
+        screen = terminal.lines - 1 if interactive else None
+        written = 0
+        shown = 0
+
+        if mode == "table":
+            out.write(self._table_header() + "\n")
+            shown += 1
+
+        for page in pages:
+            lines = format_rows(page, start + written)
+            written += len(page)
+
+            while lines:
+                if screen is None:
+                    chunk, lines = lines, []
+                else:
+                    chunk, lines = lines[:screen - shown], lines[screen - shown:]
+
+                out.write("\n".join(chunk) + "\n")
+                shown += len(chunk)
+
+                if screen is not None and shown >= screen:
+                    out.flush()
+                    if (self.prompt or input)("-- more (Enter, or 'q' to stop) --").strip().lower() == "q":
+                        return written - len(lines)
+                    shown = 0
+
+        out.flush()
+        return written
+
+    def _plain_rows(self, rows, number):
+        return [
+            f"{index}. ID: {task.id} | Title: {task.title} | Description: {task.description} | Status: {task.status} | Created: {format_created(task.created_at)}"
+            for index, task in enumerate(rows, number)
+        ]
+
+    def _table_header(self):
+        return (
+            f"{'#':>{NUMBER_WIDTH + 1}} {'ID':>{ID_WIDTH}}  {'Title':<{TITLE_WIDTH}}  {'Status':<{STATUS_WIDTH}}  "
+            f"{'Created':<{DATE_WIDTH}}  Description"
+        )
+
+    def _table_rows(self, rows, number):
+        # What is left of the line goes to the description
+        description_width = max(self._width - NUMBER_WIDTH - ID_WIDTH - TITLE_WIDTH - STATUS_WIDTH - DATE_WIDTH - 10, 10)
+
+        return [
+            f"{index:>{NUMBER_WIDTH}}. {task.id:>{ID_WIDTH}}  {task.title:<{TITLE_WIDTH}}  {task.status:<{STATUS_WIDTH}}  "
+            f"{format_created(task.created_at):<{DATE_WIDTH}}  {_shorten(task.description, description_width)}"
+            for index, task in enumerate(rows, number)
+        ]
+
+    def _tsv_rows(self, rows, number):
+        return [
+            "\t".join((
+                str(task.id), task.title.translate(TSV_ESCAPES), task.description.translate(TSV_ESCAPES), task.status,
+                task.created_at.isoformat(" ", "seconds") if task.created_at else "",
+            ))
+            for task in rows
+        ]
+
+
+# Helper function cutting text to width characters on one line
+def _shorten(text, width):
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[:width - 1] + "…"
@@ -0,0 +1,581 @@
+# sqlite_database
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from task_storage import TaskStorage, DEFAULT_PAGE_SIZE, DEFAULT_BATCH_SIZE, DEFAULT_SEARCH_LIMIT
+from task_storage import append_id_range, selection_where, search_terms
+from task_records import Task, ArchivedTask, TaskTitle, TaskColumns, make_records, make_record, make_changes
+
+# created_at is stored as "YYYY-MM-DD HH:MM:SS" text and turned back into datetime when read,
+# datetime parameters are written in the same format so comparisons work on the text
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" ", "seconds"))
+
+# Insert used by bulk inserts; a missing status or creation date falls back to the column default
+INSERT_TASK = (
+    "INSERT INTO tasks (title, description, status, created_at) "
+    "VALUES (?, ?, COALESCE(?, 'not started'), COALESCE(?, datetime('now', 'localtime')))"
+)
+
+# Statements recomputing the statistics tables from scratch (same rules as REBUILD_STATS in migrations.py)
+REBUILD_STATS = [
+    "DELETE FROM task_status_counts",
+    "INSERT INTO task_status_counts (status, task_count) SELECT status, COUNT(*) FROM tasks GROUP BY status",
+    "DELETE FROM task_daily_counts",
+    """
+    INSERT INTO task_daily_counts (day, created, completed)
+    SELECT day, SUM(created), SUM(completed) FROM (
+        SELECT date(created_at) AS day, 1 AS created, 0 AS completed FROM tasks
+        UNION ALL SELECT date(completed_at), 0, 1 FROM tasks WHERE completed_at IS NOT NULL
+        UNION ALL SELECT date(created_at), 1, 0 FROM tasks_archive
+        UNION ALL SELECT date(completed_at), 0, 1 FROM tasks_archive WHERE completed_at IS NOT NULL
+    )
+    GROUP BY day
+    """,
+]
+
+# Ordered schema migrations for SQLite, using the same version numbers as migrations.py (MySQL).
+# The applied version is kept in PRAGMA user_version, so no extra version table is needed.
+SQLITE_MIGRATIONS = [
+    (1, "create tasks table", [
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title VARCHAR(50) NOT NULL CHECK (LENGTH(TRIM(title)) > 0 AND LENGTH(title) <= 50),
+            description TEXT NOT NULL CHECK (LENGTH(TRIM(description)) > 0),
+            status TEXT NOT NULL DEFAULT 'not started' CHECK (status IN ('not started', 'done', 'in progress')),
+            created_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+    ]),
+    (2, "index tasks by status and creation date", [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks (status, created_at, id)",
+    ]),
+    (3, "index tasks by status and id for paginated listing", [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_id ON tasks (status, id)",
+    ]),
+    # FTS5 index over title and description, kept in sync with tasks by triggers (external content table)
+    (4, "full-text index on task title and description", [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+        """,
+        # Index the tasks that existed before this version
+        "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+    ]),
+    (5, "archive table for completed tasks", [
+        """
+        CREATE TABLE IF NOT EXISTS tasks_archive (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at DATETIME NOT NULL,
+            archived_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+    ]),
+    # Summary tables kept up to date by triggers; completed_at is set when a task becomes done
+    (6, "status and daily statistics", [
+        "ALTER TABLE tasks ADD COLUMN completed_at DATETIME",
+        "ALTER TABLE tasks_archive ADD COLUMN completed_at DATETIME",
+        # Completion time of tasks finished before this version is unknown => counted on their creation day
+        "UPDATE tasks SET completed_at = created_at WHERE status = 'done' AND completed_at IS NULL",
+        "UPDATE tasks_archive SET completed_at = created_at WHERE completed_at IS NULL",
+        "CREATE TABLE IF NOT EXISTS task_status_counts (status TEXT PRIMARY KEY, task_count INTEGER NOT NULL DEFAULT 0)",
+        """
+        CREATE TABLE IF NOT EXISTS task_daily_counts (
+            day TEXT PRIMARY KEY,
+            created INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_insert AFTER INSERT ON tasks BEGIN
+            UPDATE tasks SET completed_at = new.created_at WHERE id = new.id AND new.status = 'done' AND new.completed_at IS NULL;
+            INSERT INTO task_status_counts (status, task_count) VALUES (new.status, 1)
+                ON CONFLICT (status) DO UPDATE SET task_count = task_count + 1;
+            INSERT INTO task_daily_counts (day, created) VALUES (date(new.created_at), 1)
+                ON CONFLICT (day) DO UPDATE SET created = created + 1;
+            INSERT INTO task_daily_counts (day, completed) SELECT date(COALESCE(new.completed_at, new.created_at)), 1 WHERE new.status = 'done'
+                ON CONFLICT (day) DO UPDATE SET completed = completed + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_update AFTER UPDATE OF status ON tasks WHEN new.status <> old.status BEGIN
+            UPDATE tasks SET completed_at = CASE WHEN new.status = 'done' THEN datetime('now', 'localtime') END WHERE id = new.id;
+            UPDATE task_status_counts SET task_count = task_count - 1 WHERE status = old.status;
+            INSERT INTO task_status_counts (status, task_count) VALUES (new.status, 1)
+                ON CONFLICT (status) DO UPDATE SET task_count = task_count + 1;
+            UPDATE task_daily_counts SET completed = completed - 1 WHERE old.status = 'done' AND day = date(old.completed_at);
+            INSERT INTO task_daily_counts (day, completed) SELECT date('now', 'localtime'), 1 WHERE new.status = 'done'
+                ON CONFLICT (day) DO UPDATE SET completed = completed + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_stats_delete AFTER DELETE ON tasks BEGIN
+            UPDATE task_status_counts SET task_count = task_count - 1 WHERE status = old.status;
+        END
+        """,
+        # Counts of the tasks that existed before this version
+        *REBUILD_STATS,
+    ]),
+    # Change feed (see migrations.py). SQLite can't add a column with a non-constant default, so updated_at
+    # is set by the triggers; their own UPDATE only sets updated_at, which fires none of the
+    # "UPDATE OF title, description, status" triggers again.
+    (7, "task change feed", [
+        "ALTER TABLE tasks ADD COLUMN updated_at DATETIME",
+        "UPDATE tasks SET updated_at = COALESCE(completed_at, created_at)",
+        """
+        CREATE TABLE IF NOT EXISTS task_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            kind TEXT NOT NULL CHECK (kind IN ('insert', 'update', 'delete')),
+            changed_at DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+        """
+        INSERT INTO task_changes (task_id, kind, changed_at)
+        SELECT id, 'insert', created_at FROM tasks WHERE NOT EXISTS (SELECT 1 FROM task_changes) ORDER BY id
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_changes_insert AFTER INSERT ON tasks BEGIN
+            UPDATE tasks SET updated_at = datetime('now', 'localtime') WHERE id = new.id;
+            INSERT INTO task_changes (task_id, kind) VALUES (new.id, 'insert');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_changes_update AFTER UPDATE OF title, description, status ON tasks
+        WHEN new.title IS NOT old.title OR new.description IS NOT old.description OR new.status IS NOT old.status BEGIN
+            UPDATE tasks SET updated_at = datetime('now', 'localtime') WHERE id = new.id;
+            INSERT INTO task_changes (task_id, kind) VALUES (new.id, 'update');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_changes_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO task_changes (task_id, kind) VALUES (old.id, 'delete');
+        END
+        """,
+    ]),
+    # Deletes take a task out of the daily counts like REBUILD_STATS does, archiving keeps it (see migrations.py)
+    (8, "daily statistics without deleted tasks", [
+        "DROP TRIGGER IF EXISTS tasks_stats_delete",
+        """
+        CREATE TRIGGER tasks_stats_delete AFTER DELETE ON tasks BEGIN
+            UPDATE task_status_counts SET task_count = task_count - 1 WHERE status = old.status;
+            UPDATE task_daily_counts SET created = created - 1 WHERE day = date(old.created_at);
+            UPDATE task_daily_counts SET completed = completed - 1 WHERE old.completed_at IS NOT NULL AND day = date(old.completed_at);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tasks_archive_stats_insert AFTER INSERT ON tasks_archive BEGIN
+            INSERT INTO task_daily_counts (day, created) VALUES (date(new.created_at), 1)
+                ON CONFLICT (day) DO UPDATE SET created = created + 1;
+            INSERT INTO task_daily_counts (day, completed) SELECT date(new.completed_at), 1 WHERE new.completed_at IS NOT NULL
+                ON CONFLICT (day) DO UPDATE SET completed = completed + 1;
+        END
+        """,
+        *REBUILD_STATS,
+    ]),
+]
+
+
+# Embedded SQLite storage backend, backed by a file or by ":memory:".
+# Starts in milliseconds and needs no server; one connection is shared by all threads behind a lock.
+class SQLiteTaskDatabase(TaskStorage):
+    Error = sqlite3.Error
+
+    def __init__(self, path=":memory:", page_size=DEFAULT_PAGE_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(page_size, batch_size)
+        self.path = path
+        self.connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self._lock = threading.RLock()
+
+        if path != ":memory:":
+            # Write-ahead log lets readers work while a write is in progress
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+
+    # Context manager giving exclusive use of the connection for one operation.
+    # A failed operation rolls back whatever it started (check_schema=False for the schema check itself).
+    @contextmanager
+    def _borrow(self, check_schema=True):
+        if check_schema:
+            self._check_schema()
+
+        with self._lock:
+            try:
+                yield self._instrumented(self.connection)
+            except BaseException:
+                self.connection.rollback()
+                raise
+
+    # Creates the tasks table and brings the schema up to date.
+    # An up-to-date schema costs a single PRAGMA read. Each migration runs in an explicit transaction:
+    # sqlite3 would run DDL such as ALTER TABLE in autocommit, and a migration failing after it couldn't be rerun.
+    def create_table_db(self):
+        applied = []
+        try:
+            with self._borrow(check_schema=False) as connection:
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+                for target, description, statements in SQLITE_MIGRATIONS:
+                    if target <= version:
+                        continue
+
+                    connection.execute("BEGIN")
+                    for statement in statements:
+                        connection.execute(statement)
+                    connection.execute(f"PRAGMA user_version = {target}")
+                    connection.commit()
+                    applied.append(target)
+
+            self._schema_pending = False
+            if applied:
+                self._report(f"\n✔️  Database schema upgraded to version {applied[-1]}.")
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error creating table: {error}")
+            raise
+
+    # Function to insert a task into the database
+    def add_task_db(self, title, description):
+        try:
+            with self._borrow() as connection:
+                cursor = connection.execute("INSERT INTO tasks (title, description) VALUES (?, ?)", (title, description))
+                connection.commit()
+
+            self._report(f"\n✅ Task was added with ID: {cursor.lastrowid}")
+            return cursor.lastrowid
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error while adding task: {error}")
+            raise
+
+    # Function to load and return all unfinished tasks
+    def fetch_tasks_db(self):
+        try:
+            with self._borrow() as connection:
+                return make_records(Task, connection.execute(
+                    "SELECT id, title, description, status, created_at FROM tasks "
+                    "WHERE status IN ('not started', 'in progress') ORDER BY id"
+                ).fetchall())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting tasks for display: {error}")
+            raise
+
+    # Helper function to insert one batch in a single transaction
+    def _insert_batch(self, batch, result):
+        rows = [row[1:] for row in batch]
+
+        with self._borrow() as connection:
+            try:
+                connection.executemany(INSERT_TASK, rows)
+                # The write lock is held for the whole transaction => the IDs are consecutive
+                last_id = connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+                connection.commit()
+                append_id_range(result["inserted"], last_id - len(rows) + 1, last_id)
+
+            except sqlite3.Error:
+                connection.rollback()
+                # Retry the batch row by row, so only the rows the database refuses are rejected
+                for index, *values in batch:
+                    try:
+                        cursor = connection.execute(INSERT_TASK, values)
+                        append_id_range(result["inserted"], cursor.lastrowid, cursor.lastrowid)
+                    except sqlite3.Error as error:
+                        result["rejected"].append((index, str(error)))
+                connection.commit()
+
+    # Function to load one page of unfinished tasks with ID greater than after_id (keyset pagination on id)
+    def fetch_task_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        try:
+            with self._borrow() as connection:
+                return make_records(Task, connection.execute(
+                    "SELECT id, title, description, status, created_at FROM tasks "
+                    "WHERE status IN ('not started', 'in progress') AND id > ? ORDER BY id LIMIT ?",
+                    (after_id, limit)
+                ).fetchall())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting tasks for display: {error}")
+            raise
+
+    # Generator yielding every task in ID order, chunk_size rows at a time.
+    # Each chunk is a separate keyset query, so the connection is free for other threads between chunks.
+    def stream_tasks_db(self, chunk_size=None):
+        chunk_size = chunk_size or self.page_size
+        after_id = 0
+
+        while True:
+            try:
+                with self._borrow() as connection:
+                    chunk = make_records(Task, connection.execute(
+                        "SELECT id, title, description, status, created_at FROM tasks WHERE id > ? ORDER BY id LIMIT ?",
+                        (after_id, chunk_size)
+                    ).fetchall())
+            except sqlite3.Error as error:
+                self._report(f"❌  Error exporting tasks: {error}")
+                raise
+
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1].id
+
+    # Function to load one task by ID, returns None if it does not exist
+    def fetch_task_db(self, task_id):
+        try:
+            with self._borrow() as connection:
+                return make_record(Task, connection.execute(
+                    "SELECT id, title, description, status, created_at FROM tasks WHERE id = ?", (task_id,)
+                ).fetchone())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting task: {error}")
+            raise
+
+    # Function to search title and description through the FTS5 index, best (bm25) match first.
+    # Every word is required and also matches longer words starting with it.
+    def search_tasks_db(self, query, limit=None, offset=0):
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        match = " ".join(f'"{term}"*' for term in terms)
+        try:
+            with self._borrow() as connection:
+                return make_records(Task, connection.execute(
+                    "SELECT tasks.id, tasks.title, tasks.description, tasks.status, tasks.created_at "
+                    "FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid "
+                    "WHERE tasks_fts MATCH ? ORDER BY tasks_fts.rank, tasks.id LIMIT ? OFFSET ?",
+                    (match, limit or DEFAULT_SEARCH_LIMIT, offset)
+                ).fetchall())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error searching tasks: {error}")
+            raise
+
+    # Function to check whether any task exists (stops at the first row)
+    def has_tasks_db(self):
+        try:
+            with self._borrow() as connection:
+                return bool(connection.execute("SELECT EXISTS (SELECT 1 FROM tasks)").fetchone()[0])
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting tasks: {error}")
+            raise
+
+    # Helper function to select and return all task IDs and titles
+    def fetch_task_ids_db(self):
+        try:
+            with self._borrow() as connection:
+                return make_records(TaskTitle, connection.execute("SELECT id, title FROM tasks ORDER BY id").fetchall())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting task IDs: {error}")
+            return []
+
+    # Function to load the ID and status of every task into parallel arrays, chunk_size rows at a time
+    def fetch_task_columns_db(self, chunk_size=None):
+        chunk_size = chunk_size or self.page_size
+        columns = TaskColumns()
+        try:
+            with self._borrow() as connection:
+                cursor = connection.execute("SELECT id, status FROM tasks ORDER BY id")
+                while True:
+                    chunk = cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        return columns
+                    columns.extend(chunk)
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting task IDs: {error}")
+            raise
+
+    # Function to update the task status
+    def update_task_db(self, task_id, new_status):
+        try:
+            with self._borrow() as connection:
+                connection.execute("UPDATE tasks SET status = ? WHERE id = ?", (new_status, task_id))
+                connection.commit()
+            return True
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error updating task: {error}")
+            return False
+
+    # Function to delete a task by ID
+    def delete_task_db(self, task_id):
+        try:
+            with self._borrow() as connection:
+                cursor = connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                connection.commit()
+
+            # No rows deleted => invalid id
+            return cursor.rowcount > 0
+        except sqlite3.Error as error:
+            self._report(f"❌  Error deleting task: {error}")
+            return False
+
+    # Function to load the changes after cursor (a seq) from the change feed kept by the triggers
+    # (a range of the task_changes primary key). Writes are serialized, so seqs become visible in order.
+    def changes_since(self, cursor=0, limit=None):
+        limit = limit or self.page_size
+        try:
+            with self._borrow() as connection:
+                return make_changes(connection.execute(
+                    "SELECT c.seq, c.task_id, c.kind, c.changed_at, t.id, t.title, t.description, t.status, t.created_at "
+                    "FROM task_changes c LEFT JOIN tasks t ON t.id = c.task_id WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+                    (cursor, limit)
+                ).fetchall())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting task changes: {error}")
+            raise
+
+    # Function to load one page of archived tasks with ID greater than after_id
+    def fetch_archive_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        try:
+            with self._borrow() as connection:
+                return make_records(ArchivedTask, connection.execute(
+                    "SELECT id, title, description, status, created_at, archived_at FROM tasks_archive "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, limit)
+                ).fetchall())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting archived tasks: {error}")
+            raise
+
+    # Function to load one archived task by ID, returns None if it is not archived
+    def fetch_archived_task_db(self, task_id):
+        try:
+            with self._borrow() as connection:
+                return make_record(ArchivedTask, connection.execute(
+                    "SELECT id, title, description, status, created_at, archived_at FROM tasks_archive WHERE id = ?",
+                    (task_id,)
+                ).fetchone())
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting archived task: {error}")
+            raise
+
+    # Helper function copying one chunk of done tasks to the archive and deleting them, in one transaction.
+    # Tasks whose status changed since they were selected stay where they are.
+    def _archive_ids_db(self, task_ids):
+        placeholders = ", ".join(["?"] * len(task_ids))
+        try:
+            with self._borrow() as connection:
+                connection.execute(
+                    "INSERT INTO tasks_archive (id, title, description, status, created_at, completed_at) "
+                    f"SELECT id, title, description, status, created_at, completed_at FROM tasks WHERE id IN ({placeholders}) AND status = 'done'",
+                    tuple(task_ids)
+                )
+                cursor = connection.execute(f"DELETE FROM tasks WHERE id IN ({placeholders}) AND status = 'done'", tuple(task_ids))
+                connection.commit()
+            return cursor.rowcount
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error archiving tasks: {error}")
+            raise
+
+    # Helper function reading the maintained counters (a few rows, whatever the number of tasks)
+    def _fetch_counts_db(self, since):
+        try:
+            with self._borrow() as connection:
+                statuses = connection.execute("SELECT status, task_count FROM task_status_counts").fetchall()
+                daily = connection.execute(
+                    "SELECT day, created, completed FROM task_daily_counts WHERE day >= ? ORDER BY day", (since.isoformat(),)
+                ).fetchall()
+            return statuses, [(date.fromisoformat(day), created, completed) for day, created, completed in daily]
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting statistics: {error}")
+            raise
+
+    # Function to recompute the statistics from the tasks in one transaction
+    def rebuild_stats_db(self):
+        try:
+            with self._borrow() as connection:
+                for statement in REBUILD_STATS:
+                    connection.execute(statement)
+                connection.commit()
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error rebuilding statistics: {error}")
+            raise
+
+    # Function to apply a group of queued writes (see write_queue.py) with a single commit.
+    # A failing statement only undoes itself, so the rest of the group is still committed.
+    def apply_writes_db(self, operations):
+        results = []
+        try:
+            with self._borrow() as connection:
+                for kind, *args in operations:
+                    try:
+                        results.append(_apply_write(connection, kind, args))
+                    except sqlite3.Error as error:
+                        results.append(error)
+                connection.commit()
+            return results
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error writing tasks: {error}")
+            raise
+
+    # Helper function selecting one chunk of IDs of tasks matching a bulk selection
+    def _select_ids_db(self, selection, after_id, limit):
+        where, params = selection_where(selection, "?")
+        try:
+            with self._borrow() as connection:
+                rows = connection.execute(
+                    f"SELECT id FROM tasks WHERE {where} AND id > ? ORDER BY id LIMIT ?", (*params, after_id, limit)
+                ).fetchall()
+            return [task_id for (task_id,) in rows]
+        except sqlite3.Error as error:
+            self._report(f"❌  Error selecting tasks: {error}")
+            raise
+
+    # Helper function updating one chunk of tasks in its own transaction
+    def _update_ids_db(self, task_ids, new_status):
+        placeholders = ", ".join(["?"] * len(task_ids))
+        try:
+            with self._borrow() as connection:
+                cursor = connection.execute(f"UPDATE tasks SET status = ? WHERE id IN ({placeholders})", (new_status, *task_ids))
+                connection.commit()
+            return cursor.rowcount
+        except sqlite3.Error as error:
+            self._report(f"\n❌  Error updating tasks: {error}")
+            raise
+
+    # Helper function deleting one chunk of tasks in its own transaction
+    def _delete_ids_db(self, task_ids):
+        placeholders = ", ".join(["?"] * len(task_ids))
+        try:
+            with self._borrow() as connection:
+                cursor = connection.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", tuple(task_ids))
+                connection.commit()
+            return cursor.rowcount
+        except sqlite3.Error as error:
+            self._report(f"❌  Error deleting tasks: {error}")
+            raise
+
+    # Function to close the database file
+    def close(self):
+        self.connection.close()
+
+
+# Helper function running one queued write on the connection and returning its result
+def _apply_write(connection, kind, args):
+    if kind == "add":
+        return connection.execute("INSERT INTO tasks (title, description) VALUES (?, ?)", tuple(args)).lastrowid
+    if kind == "update":
+        task_id, new_status = args
+        connection.execute("UPDATE tasks SET status = ? WHERE id = ?", (new_status, task_id))
+        return True
+    return connection.execute("DELETE FROM tasks WHERE id = ?", tuple(args)).rowcount > 0
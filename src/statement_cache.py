@@ -0,0 +1,116 @@
+# statement_cache
+import threading
+from collections import OrderedDict
+
+# Prepared statements kept per connection; beyond this the least recently used one is closed
+DEFAULT_STATEMENT_CACHE_SIZE = 16
+
+# Connections remembered at once. A reconnected connection gets a new ID, so the entries of the
+# sessions that are gone are forgotten once this many newer ones have been used.
+DEFAULT_MAX_SESSIONS = 64
+
+# MySQL error for a statement the server no longer knows, e.g. after the session was reset
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+
+# Per-connection LRU cache of prepared cursors (server-side prepared statements), keyed by the SQL text.
+# The server parses and plans a prepared statement once; afterwards only its parameters are sent
+# (binary protocol) instead of the whole statement text on every call.
+# Prepared statements live in the server session, so the cache is keyed by the connection ID the server
+# assigned: a reconnect gets a new ID, and its statements are prepared again on first use.
+# A connection is used by one thread at a time (it is borrowed from the pool), so only the session map is locked.
+class StatementCache:
+    def __init__(self, size=DEFAULT_STATEMENT_CACHE_SIZE, max_sessions=DEFAULT_MAX_SESSIONS):
+        self.size = size
+        self.max_sessions = max_sessions
+        self.hits = 0
+        self.prepares = 0
+
+        self._sessions = OrderedDict()  # connection ID -> OrderedDict(statement -> prepared cursor)
+        self._lock = threading.Lock()
+
+    # Function to run a statement on the connection's prepared cursor for it and return the cursor.
+    # Rows of a SELECT must be fetched before the connection runs anything else (the cursor is unbuffered).
+    def execute(self, connection, statement, params=()):
+        from mysql.connector import Error   # already loaded: there is a connection
+
+        cursor = self._cursor(connection, statement)
+        try:
+            cursor.execute(statement, params)
+            return cursor
+
+        except Error as error:
+            # The cursor may be left in any state => never reuse it
+            self._discard(connection, statement)
+            if error.errno != ER_UNKNOWN_STMT_HANDLER:
+                raise
+
+        # The server dropped the statement without a reconnect (session reset) => prepare it again, once
+        cursor = self._cursor(connection, statement)
+        cursor.execute(statement, params)
+        return cursor
+
+    # Function to close every cached statement, before the connections are closed (TaskDatabase.close()).
+    # Pooled connections stay open after a reset-free return, so their statements are only freed by closing them.
+    def clear(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for statements in sessions:
+            for cursor in statements.values():
+                _close(cursor)
+
+    # Function returning the number of statements currently cached over all connections
+    def __len__(self):
+        with self._lock:
+            return sum(len(statements) for statements in self._sessions.values())
+
+    # Helper function returning the cached prepared cursor of a statement, or a new one
+    def _cursor(self, connection, statement):
+        statements = self._statements(connection)
+        cursor = statements.get(statement)
+        if cursor is not None:
+            statements.move_to_end(statement)
+            self.hits += 1
+            return cursor
+
+        cursor = connection.cursor(prepared=True)
+        statements[statement] = cursor
+        self.prepares += 1
+        if len(statements) > self.size:
+            _, evicted = statements.popitem(last=False)
+            _close(evicted)
+        return cursor
+
+    # Helper function returning the statements of the connection's current session
+    def _statements(self, connection):
+        session = connection.connection_id
+        with self._lock:
+            statements = self._sessions.get(session)
+            if statements is None:
+                statements = self._sessions[session] = OrderedDict()
+                # Sessions evicted here are not closed: their connection may be in use by another thread
+                # (reconnected, with a new ID) and a closed session has freed its statements anyway
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session)
+            return statements
+
+    # Helper function removing a statement from the connection's cache and closing its cursor
+    def _discard(self, connection, statement):
+        cursor = self._statements(connection).pop(statement, None)
+        if cursor is not None:
+            _close(cursor)
+
+
+# Helper function closing a prepared cursor (deallocates the statement on the server).
+# The connection may already be broken, and then there is nothing left to free.
+def _close(cursor):
+    from mysql.connector import Error
+
+    try:
+        cursor.close()
+    except Error:
+        pass
@@ -0,0 +1,237 @@
+# task_cache
+import threading
+import time
+from collections import OrderedDict
+from task_storage import TaskStorage
+
+# Maximum number of cached results, the least recently used one is evicted first
+DEFAULT_CACHE_SIZE = 128
+
+# Seconds a cached result is trusted; covers writes made by other clients, which this cache cannot see
+DEFAULT_CACHE_TTL = 5.0
+
+# Which cached reads each kind of write makes stale ("task" entries are dropped per ID)
+INVALIDATES = {
+    "add": ("tasks", "page", "ids", "search", "any"),
+    "update": ("tasks", "page", "search"),      # status is not part of the ID/title listing
+    "delete": ("tasks", "page", "ids", "search", "any"),
+    "archive": ("tasks", "page", "ids", "search", "any"),
+}
+
+
+# Read-through cache around any storage backend.
+# Memoizes the listing and lookup reads, drops exactly the entries a write through this object
+# makes stale, and keeps hit/miss counters to show how much database load it saves.
+class CachedTaskStorage(TaskStorage):
+    def __init__(self, storage, max_size=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        super().__init__(storage.page_size, storage.batch_size)
+        self.storage = storage
+        self.Error = storage.Error
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._generation = 0           # bumped by every invalidation, see _cached()
+        self._lock = threading.Lock()
+
+    # Helper function returning the cached value for key, or loading it with load() on a miss
+    def _cached(self, key, load):
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[1])
+
+            self.misses += 1
+            generation = self._generation
+
+        value = load()
+
+        with self._lock:
+            # A write finished while loading => the loaded value may already be stale, don't keep it
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return _copy(value)
+
+    # Helper function dropping every entry of the given kinds, plus the entries of single task IDs
+    def _invalidate(self, kinds, task_ids=()):
+        with self._lock:
+            self._generation += 1
+            stale = [key for key in self._entries if key[0] in kinds]
+            stale.extend(("task", task_id) for task_id in task_ids)
+            for key in stale:
+                self._entries.pop(key, None)
+
+    # Function to drop everything that is cached
+    def clear_cache(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    # Function returning the hit/miss counters
+    def cache_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    # Statements are run by the wrapped storage, so that is where they are measured
+    def instrument(self, instrumentation):
+        self.instrumentation = instrumentation
+        self.storage.instrument(instrumentation)
+
+    def set_quiet(self, quiet=True):
+        self.quiet = quiet
+        self.storage.set_quiet(quiet)
+
+    def create_table_db(self):
+        self.storage.create_table_db()
+        self.clear_cache()
+
+    def fetch_tasks_db(self):
+        return self._cached(("tasks",), self.storage.fetch_tasks_db)
+
+    def fetch_task_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        return self._cached(("page", after_id, limit), lambda: self.storage.fetch_task_page_db(after_id, limit))
+
+    def fetch_task_db(self, task_id):
+        return self._cached(("task", task_id), lambda: self.storage.fetch_task_db(task_id))
+
+    def fetch_task_ids_db(self):
+        return self._cached(("ids",), self.storage.fetch_task_ids_db)
+
+    def has_tasks_db(self):
+        return self._cached(("any",), self.storage.has_tasks_db)
+
+    def search_tasks_db(self, query, limit=None, offset=0):
+        return self._cached(("search", query, limit, offset), lambda: self.storage.search_tasks_db(query, limit, offset))
+
+    # Exports read straight from the storage, they would only push everything else out of the cache
+    def stream_tasks_db(self, chunk_size=None):
+        return self.storage.stream_tasks_db(chunk_size)
+
+    # Bulk reads too
+    def fetch_task_columns_db(self, chunk_size=None):
+        return self.storage.fetch_task_columns_db(chunk_size)
+
+    def add_task_db(self, title, description):
+        task_id = self.storage.add_task_db(title, description)
+        # A lookup of this ID may have cached "no such task" before it existed
+        self._invalidate(INVALIDATES["add"], (task_id,))
+        return task_id
+
+    # Batches are committed one by one, so invalidate even when a later batch fails
+    def add_tasks_bulk(self, tasks, batch_size=None):
+        try:
+            return self.storage.add_tasks_bulk(tasks, batch_size)
+        finally:
+            self._invalidate(INVALIDATES["add"] + ("task",))
+
+    def _insert_batch(self, batch, result):
+        try:
+            self.storage._insert_batch(batch, result)
+        finally:
+            self._invalidate(INVALIDATES["add"] + ("task",))
+
+    def update_task_db(self, task_id, new_status):
+        updated = self.storage.update_task_db(task_id, new_status)
+        self._invalidate(INVALIDATES["update"], (task_id,))
+        return updated
+
+    def delete_task_db(self, task_id):
+        deleted = self.storage.delete_task_db(task_id)
+        self._invalidate(INVALIDATES["delete"], (task_id,))
+        return deleted
+
+    # Chunks are committed one by one, so invalidate even when a later chunk fails
+    def update_tasks_bulk_db(self, new_status, **selection):
+        try:
+            return self.storage.update_tasks_bulk_db(new_status, **selection)
+        finally:
+            self._invalidate(INVALIDATES["update"] + ("task",))
+
+    def delete_tasks_bulk_db(self, **selection):
+        try:
+            return self.storage.delete_tasks_bulk_db(**selection)
+        finally:
+            self._invalidate(INVALIDATES["delete"] + ("task",))
+
+    # The group is committed even when single operations fail, so always invalidate
+    def apply_writes_db(self, operations):
+        results = None
+        try:
+            results = self.storage.apply_writes_db(operations)
+            return results
+        finally:
+            kinds = {kind for operation in operations for kind in INVALIDATES[operation[0]]}
+            if results is None:
+                # Outcome unknown => any single task entry may be stale
+                self._invalidate(tuple(kinds | {"task"}))
+            else:
+                # Added tasks by their new ID, a lookup may have cached "no such task" before
+                task_ids = [
+                    result if operation[0] == "add" else operation[1]
+                    for operation, result in zip(operations, results) if not isinstance(result, Exception)
+                ]
+                self._invalidate(tuple(kinds), task_ids)
+
+    # The change feed is polled for what is new, a cached page would hide it
+    def changes_since(self, cursor=0, limit=None):
+        return self.storage.changes_since(cursor, limit)
+
+    # The archive is read rarely, straight from the storage
+    def fetch_archive_page_db(self, after_id=0, limit=None):
+        return self.storage.fetch_archive_page_db(after_id, limit)
+
+    def fetch_archived_task_db(self, task_id):
+        return self.storage.fetch_archived_task_db(task_id)
+
+    # Statistics are a few maintained rows already, nothing to gain from caching them
+    def _fetch_counts_db(self, since):
+        return self.storage._fetch_counts_db(since)
+
+    def rebuild_stats_db(self):
+        return self.storage.rebuild_stats_db()
+
+    def _archive_ids_db(self, task_ids):
+        try:
+            return self.storage._archive_ids_db(task_ids)
+        finally:
+            self._invalidate(INVALIDATES["archive"], task_ids)
+
+    def _select_ids_db(self, selection, after_id, limit):
+        return self.storage._select_ids_db(selection, after_id, limit)
+
+    def _update_ids_db(self, task_ids, new_status):
+        try:
+            return self.storage._update_ids_db(task_ids, new_status)
+        finally:
+            self._invalidate(INVALIDATES["update"] + ("task",))
+
+    def _delete_ids_db(self, task_ids):
+        try:
+            return self.storage._delete_ids_db(task_ids)
+        finally:
+            self._invalidate(INVALIDATES["delete"] + ("task",))
+
+    def close(self):
+        self.storage.close()
+
+
+# Helper function returning a copy of cached lists, so callers can't change what is cached
+def _copy(value):
+    return list(value) if isinstance(value, list) else value
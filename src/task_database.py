@@ -1,88 +1,543 @@
 # task_database
-import mysql.connector
-from mysql.connector import Error
+# mysql.connector takes longer to import than the rest of the program, so it is not imported with this module:
+# the pool (db_config) loads it when the first operation borrows a connection, and the storage's Error looks
+# it up when it is first needed
+from contextlib import contextmanager
+from migrations import migrate, REBUILD_STATS, CLEAR_STATS_DELTAS
+from task_storage import TaskStorage, DEFAULT_PAGE_SIZE, DEFAULT_BATCH_SIZE, DEFAULT_SEARCH_LIMIT
+from task_storage import append_id_range, selection_where, search_terms
+from task_records import Task, ArchivedTask, TaskTitle, TaskColumns, make_records, make_record, make_changes
+from statement_cache import StatementCache, DEFAULT_STATEMENT_CACHE_SIZE
 
+# Row of a bulk INSERT; a missing status or creation date falls back to the column default
+INSERT_ROW = "(%s, %s, COALESCE(%s, 'not started'), COALESCE(%s, CURRENT_TIMESTAMP))"
+INSERT_COLUMNS = "INSERT INTO tasks (title, description, status, created_at) VALUES"
 
-class TaskDatabase:
-    def __init__(self, connection):
+# Hot single-task statements, run as prepared statements when the statement cache is on (see statement_cache.py)
+INSERT_TASK = "INSERT INTO tasks (title, description) VALUES (%s, %s)"
+SELECT_TASK = "SELECT id, title, description, status, created_at FROM tasks WHERE id = %s"
+SELECT_TASK_PAGE = (
+    "SELECT id, title, description, status, created_at FROM tasks "
+    "WHERE status IN ('not started', 'in progress') AND id > %s ORDER BY id LIMIT %s"
+)
+UPDATE_STATUS = "UPDATE tasks SET status = %s WHERE id = %s"
+DELETE_TASK = "DELETE FROM tasks WHERE id = %s"
+# Change feed: a range of the task_changes primary key, with the current state of each task
+# Change feed page; the last column tells whether the change is older than the change feed delay
+SELECT_CHANGES = (
+    "SELECT c.seq, c.task_id, c.kind, c.changed_at, t.id, t.title, t.description, t.status, t.created_at, "
+    "c.changed_at <= NOW() - INTERVAL %s SECOND "
+    "FROM task_changes c LEFT JOIN tasks t ON t.id = c.task_id WHERE c.seq > %s ORDER BY c.seq LIMIT %s"
+)
+
+# Seconds a transaction writing tasks may take to commit after its change was written (above the default
+# innodb_lock_wait_timeout of 50 s). A missing seq followed by a change older than this is taken as rolled back.
+CHANGE_FEED_DELAY = 60
+
+# Errors after which InnoDB may have rolled back the whole transaction, not just the failing statement
+# (a lock wait timeout does so with innodb_rollback_on_timeout) => a queued write group is replayed from the start
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+TRANSACTION_ROLLBACK_ERRORS = (ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT)
+# Attempts of a write group failing with one of those errors before its error is raised
+WRITE_GROUP_ATTEMPTS = 3
+
+# Statistics: summary rows plus the deltas the triggers inserted since the last fold
+SELECT_STATUS_COUNTS = (
+    "SELECT status, SUM(task_count) FROM (SELECT status, task_count FROM task_status_counts "
+    "UNION ALL SELECT status, task_count FROM task_status_deltas) AS counts GROUP BY status"
+)
+SELECT_DAILY_COUNTS = (
+    "SELECT day, SUM(created), SUM(completed) FROM (SELECT day, created, completed FROM task_daily_counts WHERE day >= %s "
+    "UNION ALL SELECT day, created, completed FROM task_daily_deltas WHERE day >= %s) AS counts GROUP BY day ORDER BY day"
+)
+# Folding the deltas up to a given id into the summary rows. INSERT ... SELECT locks the delta rows it reads
+# (and waits for uncommitted ones), so the DELETE removes exactly the rows that were added.
+FOLD_STATUS_DELTAS = [
+    "INSERT INTO task_status_counts (status, task_count) "
+    "SELECT status, SUM(task_count) FROM task_status_deltas WHERE id <= %s GROUP BY status "
+    "ON DUPLICATE KEY UPDATE task_count = task_status_counts.task_count + VALUES(task_count)",
+    "DELETE FROM task_status_deltas WHERE id <= %s",
+]
+FOLD_DAILY_DELTAS = [
+    "INSERT INTO task_daily_counts (day, created, completed) "
+    "SELECT day, SUM(created), SUM(completed) FROM task_daily_deltas WHERE id <= %s GROUP BY day "
+    "ON DUPLICATE KEY UPDATE created = task_daily_counts.created + VALUES(created), "
+    "completed = task_daily_counts.completed + VALUES(completed)",
+    "DELETE FROM task_daily_deltas WHERE id <= %s",
+]
+# Advisory lock taken by the process folding the deltas; the others skip the fold and just read
+STATS_FOLD_LOCK = "task_manager_stats_fold"
+
+# InnoDB full-text search doesn't index words shorter than innodb_ft_min_token_size (3) or these stopwords,
+# and a required (+) word that isn't indexed would make every search come back empty
+FULLTEXT_MIN_LENGTH = 3
+FULLTEXT_STOPWORDS = {
+    "about", "are", "com", "for", "from", "how", "that", "the", "this", "was", "what",
+    "when", "where", "who", "will", "with", "und", "www",
+}
+
+
+# Descriptor giving mysql.connector.Error (TaskDatabase.Error), importing the driver the first time it is used.
+# except clauses only evaluate it when an exception is raised.
+class _DriverError:
+    def __get__(self, instance, owner):
+        from mysql.connector import Error
+        return Error
+
+
+# MySQL storage backend.
+# Works either on one dedicated connection or on a shared ConnectionPool (db_config),
+# in which case every operation borrows a connection and returns it when done.
+# The hot single-task statements run on prepared cursors cached per connection (statement_cache_size=0
+# sends them as plain text instead, like every other statement).
+class TaskDatabase(TaskStorage):
+    Error = _DriverError()
+
+    def __init__(self, connection=None, pool=None, page_size=DEFAULT_PAGE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE, change_feed_delay=CHANGE_FEED_DELAY):
+        if connection is None and pool is None:
+            raise ValueError("TaskDatabase needs a connection or a connection pool.")
+
+        super().__init__(page_size, batch_size)
         self.connection = connection
+        self.pool = pool
+        self.statements = StatementCache(statement_cache_size) if statement_cache_size else None
+        self.change_feed_delay = change_feed_delay
+
+    # Context manager giving the connection to use for one operation
+    # (check_schema=False for the schema check itself)
+    @contextmanager
+    def _borrow(self, check_schema=True):
+        if check_schema:
+            self._check_schema()
+
+        if self.pool is None:
+            yield self._instrumented(self.connection)
+        else:
+            with self.pool.connection() as connection:
+                yield self._instrumented(connection)
+
+    # Context manager running one of the hot statements and giving its cursor: the connection's cached
+    # prepared cursor, or a new plain cursor when the statement cache is off
+    @contextmanager
+    def _execute(self, connection, statement, params):
+        if self.statements is not None:
+            yield self.statements.execute(connection, statement, params)
+            return
 
-    # Creates table in the database "task_manager"
+        with connection.cursor() as cursor:
+            cursor.execute(statement, params)
+            yield cursor
+
+    # Creates table in the database "task_manager" and brings its schema up to date (see migrations.py).
+    # An up-to-date schema costs a single SELECT.
     def create_table_db(self):
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS tasks (
-                        id INT AUTO_INCREMENT PRIMARY KEY, 
-                        title VARCHAR(50) NOT NULL,
-                        description TEXT NOT NULL,
-                        status ENUM('not started', 'done', 'in progress') NOT NULL DEFAULT 'not started',
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        CHECK (CHAR_LENGTH(TRIM(title)) > 0),
-                        CHECK (CHAR_LENGTH(TRIM(description)) > 0)
-                    );
-                """)
-            self.connection.commit()
-        except Error as error:
-            print(f"\n❌  Error creating table: {error}")
+            with self._borrow(check_schema=False) as connection:
+                applied = migrate(connection)
+            self._schema_pending = False
+            if applied:
+                self._report(f"\n✔️  Database schema upgraded to version {applied[-1]}.")
+        except self.Error as error:
+            self._report(f"\n❌  Error creating table: {error}")
             raise
     
     # Function to insert a task into the database
     def add_task_db(self, title, description):
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("INSERT INTO tasks (title, description) VALUES (%s, %s)", (title, description))
-                self.connection.commit()
+            with self._borrow() as connection, self._execute(connection, INSERT_TASK, (title, description)) as cursor:
+                connection.commit()
                 
-                print(f"\n✅ Task was added with ID: {cursor.lastrowid}")
-        except mysql.connector.Error as error:
-            print(f"\n❌  Error while adding task: {error}")
+                self._report(f"\n✅ Task was added with ID: {cursor.lastrowid}")
+                return cursor.lastrowid
+        except self.Error as error:
+            self._report(f"\n❌  Error while adding task: {error}")
             raise
 
     # Function to load and return all tasks from the database complete
     def fetch_tasks_db(self):
         try: 
-            with self.connection.cursor() as cursor:
+            with self._borrow() as connection, connection.cursor() as cursor:
                 cursor.execute("SELECT id, title, description, status, created_at FROM tasks WHERE status IN ('not started', 'in progress')")
-                return cursor.fetchall()
-        except mysql.connector.Error as error:
-            print(f"❌  Error selecting tasks for display: {error}")
+                return make_records(Task, cursor.fetchall())
+        except self.Error as error:
+            self._report(f"❌  Error selecting tasks for display: {error}")
             raise
     
+    # Helper function to insert one batch as a single multi-row INSERT and commit it
+    def _insert_batch(self, batch, result):
+        placeholders = ", ".join([INSERT_ROW] * len(batch))
+        params = [value for row in batch for value in row[1:]]
+
+        with self._borrow() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{INSERT_COLUMNS} {placeholders}", params)
+                    # For a multi-row INSERT the server reports the ID of the first row, the rest follow consecutively
+                    first_id = cursor.lastrowid
+                connection.commit()
+                append_id_range(result["inserted"], first_id, first_id + len(batch) - 1)
+
+            except self.Error:
+                connection.rollback()
+                # Retry the batch row by row, so only the rows the database refuses are rejected
+                self._insert_rows(connection, batch, result)
+
+    # Helper function to insert rows one at a time inside a single transaction
+    def _insert_rows(self, connection, batch, result):
+        try:
+            with connection.cursor() as cursor:
+                for index, *values in batch:
+                    try:
+                        cursor.execute(f"{INSERT_COLUMNS} {INSERT_ROW}", values)
+                        append_id_range(result["inserted"], cursor.lastrowid, cursor.lastrowid)
+                    except self.Error as error:
+                        result["rejected"].append((index, str(error)))
+            connection.commit()
+        except self.Error:
+            connection.rollback()
+            raise
+
+    # Function to load one page of unfinished tasks with ID greater than after_id (keyset pagination on id)
+    def fetch_task_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        try:
+            # Cached prepared statement (see _execute): only after_id and limit are sent, the page is read whole
+            with self._borrow() as connection, self._execute(connection, SELECT_TASK_PAGE, (after_id, limit)) as cursor:
+                return make_records(Task, cursor.fetchall())
+        except self.Error as error:
+            self._report(f"❌  Error selecting tasks for display: {error}")
+            raise
+
+    # Generator streaming every task in ID order through one server-side (unbuffered) cursor.
+    # Rows are pulled from the server chunk_size at a time, so memory stays flat for any table size.
+    # The connection is busy until the generator is exhausted.
+    def stream_tasks_db(self, chunk_size=None):
+        chunk_size = chunk_size or self.page_size
+        try:
+            with self._borrow() as connection, connection.cursor(buffered=False) as cursor:
+                cursor.execute("SELECT id, title, description, status, created_at FROM tasks ORDER BY id")
+                while True:
+                    chunk = cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        return
+                    yield make_records(Task, chunk)
+        except self.Error as error:
+            self._report(f"❌  Error exporting tasks: {error}")
+            raise
+
+    # Function to load one task by ID (primary key lookup), returns None if it does not exist
+    def fetch_task_db(self, task_id):
+        try:
+            with self._borrow() as connection, self._execute(connection, SELECT_TASK, (task_id,)) as cursor:
+                # fetchall() also reads the end of the result, so the (unbuffered) cursor can be reused
+                rows = cursor.fetchall()
+                return make_record(Task, rows[0] if rows else None)
+        except self.Error as error:
+            self._report(f"❌  Error selecting task: {error}")
+            raise
+
+    # Function to search title and description through the FULLTEXT index, best match first.
+    # Boolean mode: every word is required (+) and also matches longer words starting with it (*).
+    def search_tasks_db(self, query, limit=None, offset=0):
+        terms = [term for term in search_terms(query) if len(term) >= FULLTEXT_MIN_LENGTH and term not in FULLTEXT_STOPWORDS]
+        if not terms:
+            return []
+
+        against = " ".join(f"+{term}*" for term in terms)
+        try:
+            with self._borrow() as connection, connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, title, description, status, created_at FROM tasks "
+                    "WHERE MATCH (title, description) AGAINST (%s IN BOOLEAN MODE) "
+                    "ORDER BY MATCH (title, description) AGAINST (%s IN BOOLEAN MODE) DESC, id LIMIT %s OFFSET %s",
+                    (against, against, limit or DEFAULT_SEARCH_LIMIT, offset)
+                )
+                return make_records(Task, cursor.fetchall())
+        except self.Error as error:
+            self._report(f"❌  Error searching tasks: {error}")
+            raise
+
+    # Function to check whether any task exists (stops at the first index entry)
+    def has_tasks_db(self):
+        try:
+            with self._borrow() as connection, connection.cursor() as cursor:
+                cursor.execute("SELECT EXISTS (SELECT 1 FROM tasks)")
+                return bool(cursor.fetchone()[0])
+        except self.Error as error:
+            self._report(f"❌  Error selecting tasks: {error}")
+            raise
+
     # Helper function to select and return all task IDs and titles from the database  
     def fetch_task_ids_db(self):
         try:
-            with self.connection.cursor() as cursor:
+            with self._borrow() as connection, connection.cursor() as cursor:
                 cursor.execute("SELECT id, title FROM tasks")
-                return cursor.fetchall()
-        except mysql.connector.Error as error:
-            print(f"❌  Error selecting task IDs: {error}")
+                return make_records(TaskTitle, cursor.fetchall())
+        except self.Error as error:
+            self._report(f"❌  Error selecting task IDs: {error}")
             return []
 
+    # Function to load the ID and status of every task into parallel arrays, streamed chunk_size rows at a time
+    def fetch_task_columns_db(self, chunk_size=None):
+        chunk_size = chunk_size or self.page_size
+        columns = TaskColumns()
+        try:
+            with self._borrow() as connection, connection.cursor(buffered=False) as cursor:
+                cursor.execute("SELECT id, status FROM tasks ORDER BY id")
+                while True:
+                    chunk = cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        return columns
+                    columns.extend(chunk)
+        except self.Error as error:
+            self._report(f"❌  Error selecting task IDs: {error}")
+            raise
+
     # Function to update the task status in the database
     def update_task_db(self, task_id, new_status):
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("UPDATE tasks SET status = %s WHERE id = %s", (new_status, task_id))
-                self.connection.commit()
+            with self._borrow() as connection:
+                try:
+                    with self._execute(connection, UPDATE_STATUS, (new_status, task_id)):
+                        connection.commit()
+                except self.Error:
+                    connection.rollback()  # rollback to clear failed transaction
+                    raise
             return True
-        except mysql.connector.Error as error:
-            print(f"\n❌  Error updating task: {error}")
-            self.connection.rollback()  # rollback to clear failed transaction
+        except self.Error as error:
+            # Failed statement, or no connection / schema at all => False, like the other single-task writes
+            self._report(f"\n❌  Error updating task: {error}")
             return False
 
     # Function to delete a task from the database by ID
     def delete_task_db(self, task_id):
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("DELETE FROM tasks WHERE id = %s", (task_id,))
-                self.connection.commit()
+            with self._borrow() as connection, self._execute(connection, DELETE_TASK, (task_id,)) as cursor:
+                connection.commit()
             
                 if cursor.rowcount == 0:
                     # No rows deleted => invalid id
                     return False
                 
             return True
-        except mysql.connector.Error as error:
-            print(f"❌  Error deleting task: {error}")
+        except self.Error as error:
+            self._report(f"❌  Error deleting task: {error}")
             return False
+
+    # Function to load the changes after cursor (a seq) from the change feed kept by the triggers.
+    # Reads a range of the task_changes primary key, so a sync costs as much as the changes since the last one.
+    # A seq is taken when the change is written but seen by readers when its transaction commits, so a lower seq
+    # can still appear after a higher one was read. The page therefore stops before the first missing seq, unless
+    # the change after it is older than change_feed_delay (the seq was rolled back, or the bound was broken):
+    # nothing is skipped as long as every transaction commits within change_feed_delay seconds of its writes.
+    # A rolled-back write holds the feed back for change_feed_delay once; without gaps there is no delay.
+    def changes_since(self, cursor=0, limit=None):
+        limit = limit or self.page_size
+        params = (self.change_feed_delay, cursor, limit)
+        try:
+            with self._borrow() as connection, self._execute(connection, SELECT_CHANGES, params) as result:
+                return make_changes(_settled_changes(result.fetchall(), cursor))
+        except self.Error as error:
+            self._report(f"❌  Error selecting task changes: {error}")
+            raise
+
+    # Function to load one page of archived tasks with ID greater than after_id
+    def fetch_archive_page_db(self, after_id=0, limit=None):
+        limit = limit or self.page_size
+        try:
+            with self._borrow() as connection, connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, title, description, status, created_at, archived_at FROM tasks_archive "
+                    "WHERE id > %s ORDER BY id LIMIT %s",
+                    (after_id, limit)
+                )
+                return make_records(ArchivedTask, cursor.fetchall())
+        except self.Error as error:
+            self._report(f"❌  Error selecting archived tasks: {error}")
+            raise
+
+    # Function to load one archived task by ID, returns None if it is not archived
+    def fetch_archived_task_db(self, task_id):
+        try:
+            with self._borrow() as connection, connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, title, description, status, created_at, archived_at FROM tasks_archive WHERE id = %s",
+                    (task_id,)
+                )
+                return make_record(ArchivedTask, cursor.fetchone())
+        except self.Error as error:
+            self._report(f"❌  Error selecting archived task: {error}")
+            raise
+
+    # Helper function copying one chunk of done tasks to the archive and deleting them, in one transaction.
+    # INSERT ... SELECT locks the copied rows, so their status can't change before they are deleted.
+    def _archive_ids_db(self, task_ids):
+        placeholders = ", ".join(["%s"] * len(task_ids))
+        with self._borrow() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO tasks_archive (id, title, description, status, created_at, completed_at) "
+                        f"SELECT id, title, description, status, created_at, completed_at FROM tasks WHERE id IN ({placeholders}) AND status = 'done'",
+                        tuple(task_ids)
+                    )
+                    cursor.execute(f"DELETE FROM tasks WHERE id IN ({placeholders}) AND status = 'done'", tuple(task_ids))
+                    archived = cursor.rowcount
+                connection.commit()
+                return archived
+            except self.Error as error:
+                self._report(f"\n❌  Error archiving tasks: {error}")
+                connection.rollback()
+                raise
+
+    # Helper function reading the counters maintained by the triggers: the summary rows plus the deltas written
+    # since the last read, which are folded into the summary rows first so they stay a handful of rows
+    def _fetch_counts_db(self, since):
+        try:
+            with self._borrow() as connection:
+                self._fold_stats(connection)
+                with connection.cursor() as cursor:
+                    cursor.execute(SELECT_STATUS_COUNTS)
+                    statuses = [(status, int(count)) for status, count in cursor.fetchall()]
+                    cursor.execute(SELECT_DAILY_COUNTS, (since, since))
+                    return statuses, [(day, int(created), int(completed)) for day, created, completed in cursor.fetchall()]
+        except self.Error as error:
+            self._report(f"❌  Error selecting statistics: {error}")
+            raise
+
+    # Helper function adding the deltas inserted by the triggers to the summary rows and deleting them, in one
+    # transaction. Only the folder locks the summary rows, writers never do. A fold already running elsewhere is
+    # not waited for: the reads add the remaining deltas anyway.
+    def _fold_stats(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (STATS_FOLD_LOCK,))
+            if cursor.fetchone()[0] != 1:
+                return
+            try:
+                for table, statements in (("task_status_deltas", FOLD_STATUS_DELTAS), ("task_daily_deltas", FOLD_DAILY_DELTAS)):
+                    cursor.execute(f"SELECT MAX(id) FROM {table}")
+                    last_id = cursor.fetchone()[0]
+                    if last_id is not None:
+                        for statement in statements:
+                            cursor.execute(statement, (last_id,))
+                connection.commit()
+            except self.Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (STATS_FOLD_LOCK,))
+                cursor.fetchone()
+
+    # Function to recompute the statistics from the tasks in one transaction.
+    # The rows read are locked until the commit, so writes made meanwhile can't be lost: a write that committed
+    # before is counted and its deltas deleted, a later one waits and leaves its deltas for the next read.
+    def rebuild_stats_db(self):
+        with self._borrow() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    for statement in REBUILD_STATS + CLEAR_STATS_DELTAS:
+                        cursor.execute(statement)
+                connection.commit()
+            except self.Error as error:
+                self._report(f"\n❌  Error rebuilding statistics: {error}")
+                connection.rollback()
+                raise
+
+    # Function to apply a group of queued writes (see write_queue.py) with a single commit.
+    # A statement failing on its own data (e.g. a CHECK) only undoes itself, so the rest of the group is still committed.
+    # Deadlocks and lock wait timeouts can roll back the whole transaction => the group is rolled back and
+    # replayed, and raises (failing every write of it) once WRITE_GROUP_ATTEMPTS are used up.
+    def apply_writes_db(self, operations):
+        for attempt in range(1, WRITE_GROUP_ATTEMPTS + 1):
+            with self._borrow() as connection:
+                try:
+                    results = []
+                    for kind, *args in operations:
+                        try:
+                            results.append(self._apply_write(connection, kind, args))
+                        except self.Error as error:
+                            if error.errno in TRANSACTION_ROLLBACK_ERRORS:
+                                raise
+                            results.append(error)
+                    connection.commit()
+                    return results
+                except self.Error as error:
+                    connection.rollback()
+                    if error.errno in TRANSACTION_ROLLBACK_ERRORS and attempt < WRITE_GROUP_ATTEMPTS:
+                        continue
+                    self._report(f"\n❌  Error writing tasks: {error}")
+                    raise
+
+    # Helper function selecting one chunk of IDs of tasks matching a bulk selection
+    def _select_ids_db(self, selection, after_id, limit):
+        where, params = selection_where(selection)
+        try:
+            with self._borrow() as connection, connection.cursor() as cursor:
+                cursor.execute(f"SELECT id FROM tasks WHERE {where} AND id > %s ORDER BY id LIMIT %s", (*params, after_id, limit))
+                return [task_id for (task_id,) in cursor.fetchall()]
+        except self.Error as error:
+            self._report(f"❌  Error selecting tasks: {error}")
+            raise
+
+    # Helper function updating one chunk of tasks with a set-based UPDATE in its own transaction
+    def _update_ids_db(self, task_ids, new_status):
+        placeholders = ", ".join(["%s"] * len(task_ids))
+        with self._borrow() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"UPDATE tasks SET status = %s WHERE id IN ({placeholders})", (new_status, *task_ids))
+                    affected = cursor.rowcount
+                connection.commit()
+                return affected
+            except self.Error as error:
+                self._report(f"\n❌  Error updating tasks: {error}")
+                connection.rollback()
+                raise
+
+    # Helper function deleting one chunk of tasks with a set-based DELETE in its own transaction
+    def _delete_ids_db(self, task_ids):
+        placeholders = ", ".join(["%s"] * len(task_ids))
+        with self._borrow() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", tuple(task_ids))
+                    deleted = cursor.rowcount
+                connection.commit()
+                return deleted
+            except self.Error as error:
+                self._report(f"❌  Error deleting tasks: {error}")
+                connection.rollback()
+                raise
+
+    # Helper function running one queued write on the connection and returning its result
+    def _apply_write(self, connection, kind, args):
+        if kind == "add":
+            with self._execute(connection, INSERT_TASK, tuple(args)) as cursor:
+                return cursor.lastrowid
+        if kind == "update":
+            task_id, new_status = args
+            with self._execute(connection, UPDATE_STATUS, (new_status, task_id)):
+                return True
+        with self._execute(connection, DELETE_TASK, tuple(args)) as cursor:
+            return cursor.rowcount > 0
+
+    # Function to close the connection pool (a single connection is closed by whoever opened it)
+    def close(self):
+        if self.statements is not None:
+            self.statements.clear()
+        if self.pool is not None:
+            self.pool.close()
+
+
+# Helper function returning the change rows (seq first, "older than the delay" flag last, dropped) up to the
+# first missing seq that an uncommitted transaction may still fill
+def _settled_changes(rows, cursor):
+    settled = []
+    for seq, *row, old_enough in rows:
+        if seq != cursor + 1 and not old_enough:
+            break
+        settled.append((seq, *row))
+        cursor = seq
+    return settled
@@ -1,10 +1,17 @@
 # task_manager
-from utils import normalize_state, validate_task
+from archive import archive_done_tasks, DEFAULT_ARCHIVE_AFTER_DAYS
+from rendering import TaskRenderer
+from utils import normalize_state, validate_task, parse_selection
+
+# Number of search results shown at once
+SEARCH_PAGE_SIZE = 10
 
 
 class TaskManager:
-    def __init__(self, db):
+    def __init__(self, db, renderer=None, archive_days=DEFAULT_ARCHIVE_AFTER_DAYS):
         self.db = db
+        self.renderer = renderer or TaskRenderer()
+        self.archive_days = archive_days
 
     # Function to create a new task
     def add_task(self):
@@ -31,41 +38,73 @@ class TaskManager:
                 break
 
     # Function to display tasks to the user
+    # Tasks are streamed page by page, so the first rows show up before the whole table is read
     def show_tasks(self):
-        tasks = self.db.fetch_tasks_db()
-        
-        if not tasks:
+        if self.renderer.render(self.db.iter_task_pages_db()) == 0:
             print(f"\n❗ No tasks to display.")
-        else:
-            for index, task in enumerate(tasks, 1):
-                print(f"{index}. ID: {task[0]} | Title: {task[1]} | Description: {task[2]} | Status: {task[3]} | Created: {task[4].strftime('%d.%m.%Y %H:%M')}") 
 
-    # Helper function to select a task ID
+    # Function to find tasks by words in their title or description, best matches first, one page at a time
+    def search_tasks(self):
+        try:
+            query = self.input_or_cancel("\nEnter words to search for (or 'b' to go back): ")
+            self.show_search_results(query)
+
+        except OperationCancelled:
+            print("\nℹ️  Operation cancelled. Returning to main menu.")
+
+        except Exception as error:
+            print(f"\n❌ Something went wrong: {error}")
+
+    # Helper function printing search results page by page; 'b' at the "more" prompt raises OperationCancelled
+    def show_search_results(self, query):
+        offset = 0
+
+        while True:
+            # One extra row tells whether there is another page
+            results = self.db.search_tasks_db(query, SEARCH_PAGE_SIZE + 1, offset)
+
+            if not results and offset == 0:
+                print("\n❗ No tasks match your search.")
+                return
+
+            self.renderer.render([results[:SEARCH_PAGE_SIZE]], start=offset + 1)
+
+            if len(results) <= SEARCH_PAGE_SIZE:
+                return
+
+            self.input_or_cancel("\nPress Enter for more results (or 'b' to go back): ")
+            offset += SEARCH_PAGE_SIZE
+
+    # Helper function to select a task ID.
+    # A typed ID is checked with one primary key lookup; anything else searches titles and descriptions,
+    # so no listing of every task is needed however large the table is.
     def select_task_id(self):
-        tasks = self.db.fetch_task_ids_db()
-        
-        if not tasks:
+        if not self.db.has_tasks_db():
             print("\n❗ The task list is empty.")
             return None
 
-        print("\n📋 Task list:")
-        for index, (task_id, title) in enumerate(tasks, 1):
-            print(f"{index}. ID: {task_id} | Title: {title}")
-
-        valid_ids = {str(task_id) for task_id, _ in tasks}
-
         while True:
             try:
-                choice = self.input_or_cancel("\nEnter task ID (or 'b' to go back): ")
+                choice = self.input_or_cancel("\nEnter task ID, or words to search for (or 'b' to go back): ")
             
             except OperationCancelled:
                 print("\nℹ️  Operation cancelled. Returning to main menu.")
                 return None
-        
-            if choice not in valid_ids:
-                print("\n❗ Invalid ID. Please enter a number from the list.")
+
+            if choice.isdigit():
+                if self.db.fetch_task_db(int(choice)) is not None:
+                    return int(choice)
+                print("\n❗ Invalid ID. There is no task with this ID.")
+
+            elif choice:
+                try:
+                    self.show_search_results(choice)
+                except OperationCancelled:
+                    # Back from the results => ask for the ID again
+                    pass
+
             else:
-                return int(choice)
+                print("\n❗ Please enter a task ID or words to search for.")
 
     # Function that interacts with the user to update task status
     def update_task(self):
@@ -118,6 +157,105 @@ class TaskManager:
         except Exception as error:
             print(f"❌ Error while deleting task: {error}")
     
+    # Helper function asking for a bulk selection: IDs, ID ranges and/or filters
+    def select_tasks_bulk(self):
+        while True:
+            text = self.input_or_cancel(
+                "\nEnter task IDs (e.g. 1,2,7-10) and/or filters (status=..., before=YYYY-MM-DD), or 'b' to go back: "
+            )
+            try:
+                return parse_selection(text)
+            except ValueError as error:
+                print(f"\n❗ {error} Please try again.")
+
+    # Function that changes the status of many tasks at once
+    def bulk_update_tasks(self):
+        try:
+            selection = self.select_tasks_bulk()
+
+            while True:
+                new_status = normalize_state(self.input_or_cancel(
+                    "\nEnter new status ('done' or 'in progress', or 'b' to go back): "
+                ))
+                if new_status in ['done', 'in progress']:
+                    break
+                print("\n❗ Invalid status. Please enter only 'in progress' or 'done'.")
+
+            updated = self.db.update_tasks_bulk_db(new_status, **selection)
+            print(f"\n✅ {updated} task(s) updated.")
+
+        except OperationCancelled:
+            print("\nℹ️  Operation cancelled. Returning to main menu.")
+
+        except Exception as error:
+            print(f"\n❌ Something went wrong: {error}")
+
+    # Function that deletes many tasks at once after a confirmation
+    def bulk_delete_tasks(self):
+        try:
+            selection = self.select_tasks_bulk()
+
+            confirmation = self.input_or_cancel("\nAre you sure you want to delete all selected tasks? (y/n, or 'b' to cancel): ").lower()
+            if confirmation != "y":
+                print("\nℹ️ Deletion cancelled.")
+                return
+
+            deleted = self.db.delete_tasks_bulk_db(**selection)
+            print(f"\n🗑️ {deleted} task(s) deleted.")
+
+        except OperationCancelled:
+            print("\nℹ️  Operation cancelled. Returning to main menu.")
+
+        except Exception as error:
+            print(f"❌ Error while deleting tasks: {error}")
+
+    # Function that moves old done tasks to the archive, so the task table only holds current work
+    def archive_tasks(self):
+        try:
+            while True:
+                days = self.input_or_cancel(
+                    f"\nArchive done tasks created more than how many days ago? (Enter for {self.archive_days}, or 'b' to go back): "
+                )
+                if not days:
+                    days = self.archive_days
+                    break
+                if days.isdigit():
+                    days = int(days)
+                    break
+                print("\n❗ Please enter a number of days.")
+
+            archived = archive_done_tasks(self.db, days)
+            print(f"\n🗄️  {archived} task(s) archived.")
+
+        except OperationCancelled:
+            print("\nℹ️  Operation cancelled. Returning to main menu.")
+
+        except Exception as error:
+            print(f"\n❌ Something went wrong: {error}")
+
+    # Function to display archived tasks, page by page like the task list
+    def show_archived_tasks(self):
+        if self.renderer.render(self.db.iter_archive_pages_db()) == 0:
+            print("\n❗ No archived tasks to display.")
+
+    # Function to display how many tasks are in each status, and how many were created and completed per day
+    def show_stats(self):
+        try:
+            stats = self.db.fetch_stats_db()
+        except Exception as error:
+            print(f"\n❌ Something went wrong: {error}")
+            return
+
+        lines = ["\n📊 Task statistics\n"]
+        for status, count in stats["statuses"].items():
+            lines.append(f"   {status:<12} {count:>8}")
+        lines.append(f"   {'total':<12} {stats['total']:>8}\n")
+
+        lines.append(f"   {'Day':<12} {'Created':>8} {'Completed':>10}")
+        for day, created, completed in stats["daily"]:
+            lines.append(f"   {day.strftime('%d.%m.%Y'):<12} {created:>8} {completed:>10}")
+        print("\n".join(lines))
+
     def input_or_cancel(self, prompt):
         user_input = input(prompt).strip()
         if user_input.lower() in ("b", "back"):
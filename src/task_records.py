@@ -0,0 +1,90 @@
+# task_records
+from array import array
+from collections import namedtuple
+from utils import STATUSES
+
+# Status codes stored in TaskColumns: the index of the status in STATUSES
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+# One task as returned by every storage backend.
+# A namedtuple with empty __slots__: no per-record __dict__, so it takes exactly the memory of the plain
+# tuple it replaces, still unpacks and compares like one, and fields are read by name (task.status).
+class Task(namedtuple("Task", "id title description status created_at")):
+    __slots__ = ()
+
+
+# One archived task: a Task plus the moment it was moved to the archive
+class ArchivedTask(namedtuple("ArchivedTask", "id title description status created_at archived_at")):
+    __slots__ = ()
+
+
+# ID and title of a task (fetch_task_ids_db)
+class TaskTitle(namedtuple("TaskTitle", "id title")):
+    __slots__ = ()
+
+
+# One entry of the change feed (changes_since): seq orders the changes, kind is "insert", "update" or "delete".
+# task is the current state of the task, None for a delete (tombstone) or a task deleted since the change.
+class TaskChange(namedtuple("TaskChange", "seq task_id kind changed_at task")):
+    __slots__ = ()
+
+
+# Row factory: turns the rows of a query into records of the given type in one pass
+# (record._make is called from C by map(), no Python frame per row)
+def make_records(record, rows):
+    return list(map(record._make, rows))
+
+
+# Row factory for single-row queries: the record, or None when there was no row
+def make_record(record, row):
+    return None if row is None else record._make(row)
+
+
+# Columnar batch of tasks for bulk consumers: parallel arrays of IDs (8-byte integers) and status codes
+# (1 byte each, see STATUS_CODES) instead of one tuple per task, i.e. 9 bytes per task instead of ~150
+# for a tuple row with its boxed integer. Iterating yields (id, status) pairs.
+class TaskColumns:
+    __slots__ = ("ids", "statuses")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.statuses = array("B")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return ((task_id, STATUSES[code]) for task_id, code in zip(self.ids, self.statuses))
+
+    # Function to add one task
+    def append(self, task_id, status):
+        self.ids.append(task_id)
+        self.statuses.append(STATUS_CODES[status])
+
+    # Function to add (id, status) rows, e.g. one fetchmany() chunk
+    def extend(self, rows):
+        for task_id, status in rows:
+            self.ids.append(task_id)
+            self.statuses.append(STATUS_CODES[status])
+
+    # Function returning the IDs of the tasks with the given status, as an array
+    def ids_with_status(self, status):
+        code = STATUS_CODES[status]
+        return array("q", (task_id for task_id, task_code in zip(self.ids, self.statuses) if task_code == code))
+
+    # Function returning the number of tasks per status
+    def count_statuses(self):
+        counts = dict.fromkeys(STATUSES, 0)
+        for code in self.statuses:
+            counts[STATUSES[code]] += 1
+        return counts
+
+
+# Row factory for the change feed: (seq, task_id, kind, changed_at, *task columns) rows, where the task
+# columns are NULL when the task no longer exists
+def make_changes(rows):
+    return [
+        TaskChange(seq, task_id, kind, changed_at, None if task[0] is None else Task._make(task))
+        for seq, task_id, kind, changed_at, *task in rows
+    ]
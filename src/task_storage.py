@@ -0,0 +1,461 @@
+# task_storage
+import re
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from instrumentation import InstrumentedConnection, default_instrumentation
+from utils import validate_task, STATUSES
+
+# Number of rows loaded per page when streaming task listings
+DEFAULT_PAGE_SIZE = 500
+
+# Number of rows written (and committed) together by add_tasks_bulk
+DEFAULT_BATCH_SIZE = 1000
+
+# Number of tasks changed in one transaction by the bulk update/delete operations
+DEFAULT_CHUNK_SIZE = 500
+
+# Number of search results returned per page
+DEFAULT_SEARCH_LIMIT = 20
+
+# Number of days (today included) in the daily part of the statistics
+DEFAULT_STATS_DAYS = 7
+
+# Words of a search query; everything else (quotes, operators) is ignored
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+# Storage backends that can be selected with TASK_STORAGE in .env
+BACKENDS = ("mysql", "sqlite", "memory")
+
+
+# Interface shared by all storage backends (MySQL, SQLite, in-memory).
+# TaskManager only talks to this interface, so the backend can be chosen from config.
+# Every backend sets Error to the exception class its database raises.
+class TaskStorage(ABC):
+    Error = Exception
+    instrumentation = None
+    quiet = False
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self._schema_pending = False
+        self._schema_lock = threading.Lock()
+
+    # Creates the tasks table (or equivalent) and brings the schema up to date
+    @abstractmethod
+    def create_table_db(self):
+        pass
+
+    # Inserts one task and returns its ID
+    @abstractmethod
+    def add_task_db(self, title, description):
+        pass
+
+    # Returns all unfinished tasks as (id, title, description, status, created_at) tuples
+    @abstractmethod
+    def fetch_tasks_db(self):
+        pass
+
+    # Returns one page of unfinished tasks with ID greater than after_id, ordered by ID
+    @abstractmethod
+    def fetch_task_page_db(self, after_id=0, limit=None):
+        pass
+
+    # Returns one task as a Task record (id, title, description, status, created_at), or None if it does not exist
+    @abstractmethod
+    def fetch_task_db(self, task_id):
+        pass
+
+    # Returns up to limit tasks (any status) containing every word of the query (or words starting with it)
+    # in title or description, best match first, skipping the first offset results
+    @abstractmethod
+    def search_tasks_db(self, query, limit=None, offset=0):
+        pass
+
+    # Returns True if there is at least one task (any status), reading a single row at most
+    @abstractmethod
+    def has_tasks_db(self):
+        pass
+
+    # Returns a TaskTitle (id, title) for every task
+    @abstractmethod
+    def fetch_task_ids_db(self):
+        pass
+
+    # Returns the ID and status of every task as one columnar TaskColumns batch, in ID order,
+    # reading chunk_size rows at a time (compact form for bulk consumers)
+    @abstractmethod
+    def fetch_task_columns_db(self, chunk_size=None):
+        pass
+
+    # Changes the status of one task, returns False if the database refused it
+    @abstractmethod
+    def update_task_db(self, task_id, new_status):
+        pass
+
+    # Deletes one task, returns False if there was no task with that ID
+    @abstractmethod
+    def delete_task_db(self, task_id):
+        pass
+
+    # Yields every task (all statuses) in ID order, chunk_size rows at a time, for exports
+    @abstractmethod
+    def stream_tasks_db(self, chunk_size=None):
+        pass
+
+    # Returns one page of archived tasks with ID greater than after_id, ordered by ID,
+    # as (id, title, description, status, created_at, archived_at) tuples
+    @abstractmethod
+    def fetch_archive_page_db(self, after_id=0, limit=None):
+        pass
+
+    # Returns one archived task (same columns as fetch_archive_page_db), or None if it is not archived
+    @abstractmethod
+    def fetch_archived_task_db(self, task_id):
+        pass
+
+    # Returns up to limit changes (TaskChange) with seq greater than cursor, in seq order: inserts, updates and
+    # deletes (tombstones) of tasks, each with the current state of its task. The seq of the last change is the
+    # cursor of the next call; a page shorter than limit means the caller is up to date (up to the first change
+    # whose transaction may still commit, see TaskDatabase.changes_since).
+    @abstractmethod
+    def changes_since(self, cursor=0, limit=None):
+        pass
+
+    # Recomputes the statistics tables from the tasks (and archived tasks) in one transaction, to fix any drift
+    @abstractmethod
+    def rebuild_stats_db(self):
+        pass
+
+    # Returns the maintained statistics: [(status, count), ...] and [(day, created, completed), ...] since the given date
+    @abstractmethod
+    def _fetch_counts_db(self, since):
+        pass
+
+    # Applies a group of ("add", title, description), ("update", task_id, status) and ("delete", task_id)
+    # operations in one transaction. Returns one result per operation: the new ID for add, True for update,
+    # True/False (task found) for delete, or the error the database raised for that operation alone.
+    @abstractmethod
+    def apply_writes_db(self, operations):
+        pass
+
+    # Inserts one batch of validated (row_index, title, description, status, created_at) rows and records the outcome in result.
+    # A status or created_at of None means the column default.
+    @abstractmethod
+    def _insert_batch(self, batch, result):
+        pass
+
+    # Moves the given done tasks (with their IDs) to the archive in one transaction, returns the number of moved tasks
+    @abstractmethod
+    def _archive_ids_db(self, task_ids):
+        pass
+
+    # Returns up to limit IDs (ascending, greater than after_id) of tasks matching the selection
+    @abstractmethod
+    def _select_ids_db(self, selection, after_id, limit):
+        pass
+
+    # Sets the status of the given tasks in one transaction, returns the number of affected rows
+    @abstractmethod
+    def _update_ids_db(self, task_ids, new_status):
+        pass
+
+    # Deletes the given tasks in one transaction, returns the number of deleted rows
+    @abstractmethod
+    def _delete_ids_db(self, task_ids):
+        pass
+
+    # Releases the connection (or pool) held by the backend
+    def close(self):
+        pass
+
+    # Function to report every statement and commit to an Instrumentation (None turns it off again)
+    def instrument(self, instrumentation):
+        self.instrumentation = instrumentation
+
+    # Function to silence the messages meant for the menu user ("✅ Task was added...", "❌  Error ...");
+    # the results and exceptions are unchanged. Used by the API server, where they would be written per request.
+    def set_quiet(self, quiet=True):
+        self.quiet = quiet
+
+    # Helper function printing a message for the menu user, unless the storage is quiet
+    def _report(self, message):
+        if not self.quiet:
+            print(message)
+
+    # Function to postpone create_table_db() until the first operation that needs the database,
+    # so opening the storage costs no connection and no schema check (used by open_storage)
+    def defer_schema(self):
+        self._schema_pending = True
+
+    # Helper function the backends call before borrowing a connection: runs the postponed
+    # create_table_db() once; a failed check is tried again by the next operation
+    def _check_schema(self):
+        if self._schema_pending:
+            with self._schema_lock:
+                if self._schema_pending:
+                    self.create_table_db()
+
+    # Helper function giving the connection an operation should use: the connection itself,
+    # or a measuring wrapper when instrumentation is on (a single None check otherwise)
+    def _instrumented(self, connection):
+        if self.instrumentation is None:
+            return connection
+        return InstrumentedConnection(connection, self.instrumentation)
+
+    # Function to insert many tasks at once, each a (title, description) pair
+    # or a (title, description, status, created_at) tuple (imports keep the original status and date).
+    # Rows are validated, grouped into batches and committed once per batch.
+    # Returns {"inserted": [(first_id, last_id), ...], "rejected": [(row_index, error), ...]} instead of printing.
+    def add_tasks_bulk(self, tasks, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        result = {"inserted": [], "rejected": []}
+        batch = []
+
+        for index, task in enumerate(tasks):
+            try:
+                title, description, status, created_at = (*task, None, None) if len(task) == 2 else task
+            except (TypeError, ValueError):
+                result["rejected"].append((index, "Task must be a (title, description) pair."))
+                continue
+
+            title = title.strip() if isinstance(title, str) else title
+            description = description.strip() if isinstance(description, str) else description
+
+            error = validate_task(title, description)
+            if error is None and status is not None and status not in STATUSES:
+                error = f"Invalid status '{status}'."
+            if error:
+                result["rejected"].append((index, error))
+                continue
+
+            batch.append((index, title, description, status, created_at))
+            if len(batch) >= batch_size:
+                self._insert_batch(batch, result)
+                batch = []
+
+        if batch:
+            self._insert_batch(batch, result)
+
+        return result
+
+    # Function to set the status of every selected task.
+    # Tasks are selected by an ID list, an (first_id, last_id) range, a list of such ranges (any of them matches)
+    # and/or filters on status and creation date,
+    # and changed in chunks of chunk_size, each chunk in its own short transaction.
+    # Returns the number of affected tasks.
+    def update_tasks_bulk_db(self, new_status, ids=None, id_range=None, status=None, created_before=None, chunk_size=None,
+                             id_ranges=None):
+        selection = make_selection(ids, id_range, status, created_before, id_ranges)
+        affected = 0
+
+        for chunk in self._selected_id_chunks(selection, chunk_size or DEFAULT_CHUNK_SIZE):
+            affected += self._update_ids_db(chunk, new_status)
+
+        return affected
+
+    # Function to delete every selected task (same selection and chunking as update_tasks_bulk_db).
+    # Returns the number of deleted tasks.
+    def delete_tasks_bulk_db(self, ids=None, id_range=None, status=None, created_before=None, chunk_size=None,
+                             id_ranges=None):
+        selection = make_selection(ids, id_range, status, created_before, id_ranges)
+        deleted = 0
+
+        for chunk in self._selected_id_chunks(selection, chunk_size or DEFAULT_CHUNK_SIZE):
+            deleted += self._delete_ids_db(chunk)
+
+        return deleted
+
+    # Function to move done tasks created before created_before from the tasks table to the archive.
+    # Tasks are moved chunk_size at a time, each chunk in its own short transaction (copy, then delete),
+    # so other writers never wait for more than one chunk. Returns the number of archived tasks.
+    def archive_tasks_db(self, created_before, chunk_size=None):
+        selection = make_selection(status="done", created_before=created_before)
+        archived = 0
+
+        for chunk in self._selected_id_chunks(selection, chunk_size or DEFAULT_CHUNK_SIZE):
+            archived += self._archive_ids_db(chunk)
+
+        return archived
+
+    # Function returning task statistics read from the summary tables, so the cost doesn't depend on the number of tasks:
+    # {"statuses": {status: count}, "total": count, "daily": [(day, created, completed), ...]} for the last days days.
+    # Statuses and days without any task are reported as 0.
+    def fetch_stats_db(self, days=DEFAULT_STATS_DAYS):
+        first_day = date.today() - timedelta(days=days - 1)
+        status_counts, daily_counts = self._fetch_counts_db(first_day)
+
+        statuses = dict.fromkeys(STATUSES, 0)
+        statuses.update(status_counts)
+        by_day = {day: (created, completed) for day, created, completed in daily_counts}
+        daily = []
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            daily.append((day, *by_day.get(day, (0, 0))))
+
+        return {"statuses": statuses, "total": sum(statuses.values()), "daily": daily}
+
+    # Function returning the set of the given task IDs that exist (primary key lookups, in chunks)
+    def fetch_existing_ids_db(self, task_ids):
+        task_ids = sorted(set(task_ids))
+        existing = set()
+
+        for start in range(0, len(task_ids), DEFAULT_CHUNK_SIZE):
+            chunk = task_ids[start:start + DEFAULT_CHUNK_SIZE]
+            existing.update(self._select_ids_db({"ids": chunk}, 0, len(chunk)))
+
+        return existing
+
+    # Generator yielding the IDs of the selected tasks in chunks (keyset pagination on id)
+    def _selected_id_chunks(self, selection, chunk_size):
+        ids = selection.pop("ids", None)
+
+        if ids is not None:
+            ids = sorted(set(ids))
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                if selection:
+                    # Other filters too => keep only the listed IDs that match them
+                    chunk = self._select_ids_db(dict(selection, ids=chunk), 0, len(chunk))
+                if chunk:
+                    yield chunk
+            return
+
+        after_id = 0
+        while True:
+            chunk = self._select_ids_db(selection, after_id, chunk_size)
+            if not chunk:
+                return
+
+            yield chunk
+
+            if len(chunk) < chunk_size:
+                return
+            after_id = chunk[-1]
+
+    # Generator that yields unfinished tasks page by page, so memory stays flat no matter how big the table is
+    def iter_task_pages_db(self, page_size=None):
+        return self._iter_pages(self.fetch_task_page_db, page_size)
+
+    # Generator that yields archived tasks page by page
+    def iter_archive_pages_db(self, page_size=None):
+        return self._iter_pages(self.fetch_archive_page_db, page_size)
+
+    # Helper generator calling fetch_page(after_id, limit) until a short page (keyset pagination on id)
+    def _iter_pages(self, fetch_page, page_size=None):
+        page_size = page_size or self.page_size
+        after_id = 0
+
+        while True:
+            page = fetch_page(after_id, page_size)
+            if not page:
+                return
+
+            yield page
+
+            if len(page) < page_size:
+                # Short page => no more rows after it
+                return
+            after_id = page[-1][0]
+
+
+# Helper function splitting a search query into lowercase words
+def search_terms(query):
+    return SEARCH_TERM_PATTERN.findall(query.lower())
+
+
+# Helper function to add an ID range to the list, merging it with the previous range when they touch
+def append_id_range(ranges, first_id, last_id):
+    if ranges and ranges[-1][1] + 1 == first_id:
+        ranges[-1] = (ranges[-1][0], last_id)
+    else:
+        ranges.append((first_id, last_id))
+
+
+# Helper function building a bulk selection; at least one criterion is required,
+# so a missing argument can never turn into "change every task"
+def make_selection(ids=None, id_range=None, status=None, created_before=None, id_ranges=None):
+    selection = {}
+    if ids is not None:
+        selection["ids"] = list(ids)
+    if id_range is not None:
+        selection["id_range"] = tuple(id_range)
+    if id_ranges is not None:
+        selection["id_ranges"] = [tuple(id_range) for id_range in id_ranges]
+    if status is not None:
+        selection["status"] = status
+    if created_before is not None:
+        selection["created_before"] = created_before
+
+    if not selection:
+        raise ValueError("Select tasks by IDs, an ID range, a status or a creation date.")
+    return selection
+
+
+# Helper function turning a selection into an SQL condition and its parameters
+def selection_where(selection, placeholder="%s"):
+    conditions = []
+    params = []
+
+    if "ids" in selection:
+        conditions.append(f"id IN ({', '.join([placeholder] * len(selection['ids']))})")
+        params.extend(selection["ids"])
+    if "id_range" in selection:
+        conditions.append(f"id BETWEEN {placeholder} AND {placeholder}")
+        params.extend(selection["id_range"])
+    if "id_ranges" in selection:
+        # Each range is a primary key range scan; an empty list selects nothing
+        ranges = [f"id BETWEEN {placeholder} AND {placeholder}"] * len(selection["id_ranges"])
+        conditions.append(f"({' OR '.join(ranges)})" if ranges else "1 = 0")
+        params.extend(task_id for id_range in selection["id_ranges"] for task_id in id_range)
+    if "status" in selection:
+        conditions.append(f"status = {placeholder}")
+        params.append(selection["status"])
+    if "created_before" in selection:
+        conditions.append(f"created_at < {placeholder}")
+        params.append(selection["created_before"])
+
+    return " AND ".join(conditions), params
+
+
+# Function to create the storage backend selected in the config (TASK_STORAGE in .env), with query instrumentation
+# (TASK_INSTRUMENT=1) and the read-through cache (TASK_CACHE=1) when they are turned on, without connecting or
+# migrating yet: that happens on the first operation (or an explicit create_table_db())
+def open_storage(backend=None, cached=None, pool_size=None):
+    from db_config import STORAGE_BACKEND, CACHE_ENABLED, CACHE_SIZE, CACHE_TTL
+    from db_config import INSTRUMENTATION_ENABLED, SLOW_QUERY_MS, METRICS_PATH
+
+    storage = _open_backend(backend or STORAGE_BACKEND, pool_size)
+    storage.defer_schema()
+
+    if INSTRUMENTATION_ENABLED:
+        storage.instrument(default_instrumentation(SLOW_QUERY_MS / 1000, METRICS_PATH))
+
+    if CACHE_ENABLED if cached is None else cached:
+        from task_cache import CachedTaskStorage
+        storage = CachedTaskStorage(storage, CACHE_SIZE, CACHE_TTL)
+
+    return storage
+
+
+# Helper function creating one storage backend by name
+def _open_backend(backend, pool_size=None):
+    from db_config import SQLITE_PATH
+
+    if backend == "mysql":
+        from db_config import ConnectionPool, STATEMENT_CACHE_SIZE
+        from task_database import TaskDatabase
+        # The pool keeps the sessions (and with them the cached prepared statements) of returned connections
+        pool = ConnectionPool(size=pool_size, reset_session=not STATEMENT_CACHE_SIZE)
+        return TaskDatabase(pool=pool, statement_cache_size=STATEMENT_CACHE_SIZE)
+
+    if backend == "sqlite":
+        from sqlite_database import SQLiteTaskDatabase
+        return SQLiteTaskDatabase(SQLITE_PATH)
+
+    if backend == "memory":
+        from memory_database import MemoryTaskDatabase
+        return MemoryTaskDatabase()
+
+    raise ValueError(f"Unknown storage backend '{backend}'. Choose one of: {', '.join(BACKENDS)}.")
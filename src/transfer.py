@@ -0,0 +1,160 @@
+# transfer
+import csv
+import json
+import sys
+from contextlib import nullcontext
+from datetime import datetime
+from itertools import islice
+from task_storage import DEFAULT_BATCH_SIZE
+from utils import normalize_state
+
+# File formats for import and export
+FORMATS = ("csv", "jsonl")
+
+# Columns of an exported task, in file order
+FIELDS = ("id", "title", "description", "status", "created_at")
+
+# Rows read from the database per chunk during an export
+EXPORT_CHUNK_SIZE = 5000
+
+
+# Function to pick the file format: the given one, or guessed from the file extension
+def file_format(path, fmt=None):
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Choose one of: {', '.join(FORMATS)}.")
+        return fmt
+
+    if path.lower().endswith(".csv"):
+        return "csv"
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    raise ValueError(f"Can't tell the format of '{path}', choose one with --format ({', '.join(FORMATS)}).")
+
+
+# Helper function opening a file for reading or writing as text, "-" means stdin / stdout
+def _open(path, mode):
+    if path == "-":
+        return nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    # newline="" lets the csv module handle line endings inside quoted values
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+# Function to write every task (all statuses) to a CSV or JSONL file, streamed chunk by chunk.
+# Only one chunk is held in memory, so the table size doesn't matter. Returns the number of exported tasks.
+def export_tasks(storage, path, fmt=None, chunk_size=EXPORT_CHUNK_SIZE):
+    fmt = file_format(path, fmt)
+    count = 0
+
+    with _open(path, "w") as file:
+        write_chunk = _csv_writer(file) if fmt == "csv" else _jsonl_writer(file)
+
+        for chunk in storage.stream_tasks_db(chunk_size):
+            write_chunk([_task_values(task) for task in chunk])
+            count += len(chunk)
+
+    # Exporting to stdout => keep the message out of the data
+    print(f"\n✅ Exported {count} task(s) to {path}.", file=sys.stderr if path == "-" else sys.stdout)
+    return count
+
+
+# Helper function returning the exported values of one task row
+def _task_values(task):
+    created_at = task.created_at.isoformat(" ", "seconds") if task.created_at else None
+    return (task.id, task.title, task.description, task.status, created_at)
+
+
+def _csv_writer(file):
+    writer = csv.writer(file)
+    writer.writerow(FIELDS)
+    return writer.writerows
+
+
+def _jsonl_writer(file):
+    def write_chunk(rows):
+        file.write("".join(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n" for row in rows))
+    return write_chunk
+
+
+# Generator reading records lazily from an open CSV or JSONL file.
+# JSONL lines are yielded unparsed, so one broken line is rejected on its own instead of stopping the import.
+def read_records(file, fmt):
+    if fmt == "csv":
+        yield from csv.DictReader(file)
+        return
+
+    for line in file:
+        if line.strip():
+            yield line
+
+
+# Function to turn one record into a (title, description, status, created_at) task.
+# The exported ID is ignored, the target database gives out its own. Raises ValueError if invalid.
+def task_from_record(record):
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Invalid JSON: {error}")
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object with title and description.")
+
+    # Typos are corrected ("doen" => "done"), anything else is refused by the storage
+    status = normalize_state(str(record.get("status") or "")) or None
+
+    created_at = record.get("created_at") or None
+    if created_at is not None:
+        try:
+            created_at = datetime.fromisoformat(str(created_at))
+        except ValueError:
+            raise ValueError(f"Invalid creation date '{created_at}'.")
+
+    return (record.get("title") or "", record.get("description") or "", status, created_at)
+
+
+# Function to import tasks from a CSV or JSONL file.
+# Records are read lazily and inserted batch_size at a time, one transaction per batch.
+# resume_from skips the records an earlier, interrupted import already committed.
+# Returns {"imported": count, "rejected": [(offset, error), ...], "offset": records processed}.
+def import_tasks(storage, path, fmt=None, batch_size=DEFAULT_BATCH_SIZE, resume_from=0):
+    fmt = file_format(path, fmt)
+    summary = {"imported": 0, "rejected": [], "offset": resume_from}
+    batch = []  # (offset, task)
+    offset = resume_from - 1
+
+    try:
+        with _open(path, "r") as file:
+            records = islice(read_records(file, fmt), resume_from, None)
+
+            for offset, record in enumerate(records, resume_from):
+                try:
+                    batch.append((offset, task_from_record(record)))
+                except ValueError as error:
+                    summary["rejected"].append((offset, str(error)))
+
+                if len(batch) >= batch_size:
+                    _import_batch(storage, batch, summary)
+                    batch = []
+
+            if batch:
+                _import_batch(storage, batch, summary)
+            summary["offset"] = offset + 1
+
+    except Exception as error:
+        print(f"\n❌  Import stopped at record {summary['offset']}: {error}")
+        print(f"ℹ️  {summary['imported']} task(s) were imported, continue with --resume-from {summary['offset']}.")
+        raise
+
+    # Rows the database refused are reported after the records that failed to parse => restore file order
+    summary["rejected"].sort()
+    print(f"\n✅ Imported {summary['imported']} task(s), {len(summary['rejected'])} rejected.")
+    return summary
+
+
+# Helper function inserting one batch in a single transaction and moving the resume offset past it
+def _import_batch(storage, batch, summary):
+    result = storage.add_tasks_bulk([task for _, task in batch], batch_size=len(batch))
+
+    summary["imported"] += sum(last - first + 1 for first, last in result["inserted"])
+    summary["rejected"].extend((batch[index][0], error) for index, error in result["rejected"])
+    summary["offset"] = batch[-1][0] + 1
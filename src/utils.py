@@ -1,32 +1,107 @@
 # utils
+import re
+from datetime import datetime
+from functools import lru_cache
 
-# Function to normalize mistyped state values for "in progress"
+# Valid values of the task status column
+STATUSES = ("not started", "done", "in progress")
+
+# Longest task title: the VARCHAR(50) title column of the SQL backends, enforced by every backend and the API
+MAX_TITLE_LENGTH = 50
+
+# "key=value" filters of a bulk selection; a value runs until the next filter or the end of the text
+FILTER_PATTERN = re.compile(r"\b(status|before)\s*=\s*(.*?)\s*(?=\b(?:status|before)\s*=|$)", re.IGNORECASE)
+
+# Longest typo (insertions, deletions, substitutions, swapped neighbours) corrected to a status;
+# statuses of up to SHORT_STATUS_LENGTH characters ("done") only get one edit that keeps the first letter,
+# so "doen" or "dne" is corrected but "none" or "gone" is not
+MAX_EDIT_DISTANCE = 2
+SHORT_STATUS_LENGTH = 4
+
+# Characters ignored when matching: "InProgress", "in-progress" and "in_progress" are the same status
+IGNORED_CHARACTERS = re.compile(r"[\s_-]+")
+
+
+# Helper function returning the text reduced to its matching key
+def _status_key(text):
+    return IGNORED_CHARACTERS.sub("", text.lower())
+
+
+# Helper function returning every string made by deleting up to distance characters from word (word included)
+def _deletes(word, distance):
+    result = {word}
+    layer = {word}
+    for _ in range(distance):
+        layer = {variant[:index] + variant[index + 1:] for variant in layer for index in range(len(variant))}
+        result |= layer
+    return result
+
+
+# Function returning the edit distance of two strings, a swap of two neighbouring characters counting as one edit
+def edit_distance(first, second):
+    previous = None
+    row = list(range(len(second) + 1))
+
+    for i, a in enumerate(first, 1):
+        before, previous, row = previous, row, [i] + [0] * len(second)
+        for j, b in enumerate(second, 1):
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (a != b))
+            if i > 1 and j > 1 and a == second[j - 2] and first[i - 2] == b:
+                row[j] = min(row[j], before[j - 2] + 1)
+    return row[-1]
+
+
+# Lookup structure built once at import: matching key of every status, and every deletion of those keys
+# pointing back to the keys it came from. Two strings within MAX_EDIT_DISTANCE share a deletion,
+# so a lookup only generates the deletions of the typed text, whatever the number of statuses.
+def _build_delete_index(keys):
+    index = {}
+    for key in keys:
+        for variant in _deletes(key, MAX_EDIT_DISTANCE):
+            index.setdefault(variant, set()).add(key)
+    return index
+
+
+STATUS_KEYS = {_status_key(status): status for status in STATUSES}
+STATUS_DELETES = _build_delete_index(STATUS_KEYS)
+LONGEST_STATUS_KEY = max(map(len, STATUS_KEYS))
+
+
+# Function returning the status nearest to the typed text, or None if no status is close enough
+# (or two are equally close). Cached, so the repeated values of a bulk import are resolved once.
+@lru_cache(maxsize=65536)
+def match_status(text):
+    key = _status_key(text)
+    if key in STATUS_KEYS:
+        return STATUS_KEYS[key]
+    if not key or len(key) > LONGEST_STATUS_KEY + MAX_EDIT_DISTANCE:
+        return None
+
+    candidates = set()
+    for variant in _deletes(key, MAX_EDIT_DISTANCE):
+        candidates |= STATUS_DELETES.get(variant, set())
+
+    matches = []
+    for candidate in candidates:
+        distance = edit_distance(key, candidate)
+        if len(candidate) <= SHORT_STATUS_LENGTH:
+            close_enough = distance <= 1 and key[0] == candidate[0]
+        else:
+            close_enough = distance <= MAX_EDIT_DISTANCE
+        if close_enough:
+            matches.append((distance, candidate))
+
+    matches.sort()
+    if not matches or (len(matches) > 1 and matches[0][0] == matches[1][0]):
+        return None
+    return STATUS_KEYS[matches[0][1]]
+
+
+# Function to normalize mistyped status values, e.g. "inprogres" => "in progress", "doen" => "done".
+# Text that isn't close to any status is returned stripped and lowercased.
 def normalize_state(status):
     status = status.strip().lower()
-    # Remove all spaces for matching
-    compressed = status.replace(" ", "")
-
-    accepted_variants = {
-        "inprogress",
-        "in progres",
-        "inprogres",
-        "inproggres",
-        "inproggress",
-        "inprogres",
-        "inproggress",
-        "inprogess",
-        "inprogesss",
-        "inprogres",
-        "inprogrees",
-        "inprgress",
-        "inprgress",
-        "inprogresss",
-        "inprogressss"
-    }
-
-    if compressed in accepted_variants:
-        return "in progress"
-    return status
+    return match_status(status) or status
 
 
 # Validate task title and description.
@@ -36,4 +111,64 @@ def validate_task(title: str, description: str) -> str | None:
             return "Task title and description must not be empty or contain only spaces."
         if not description:
             return "Task title and description must not be empty or contain only spaces."
-        return None
\ No newline at end of file
+        return None
+
+
+# Merge overlapping and adjacent (first, last) ID ranges into a sorted list of ranges
+def merge_id_ranges(ranges):
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+# Parse a bulk selection typed by the user: IDs and ranges first, then filters,
+# e.g. "1, 2, 7-10" or "status=in progress before=2024-01-31".
+# Returns keyword arguments for update_tasks_bulk_db / delete_tasks_bulk_db, raises ValueError if invalid.
+def parse_selection(text):
+    selection = {}
+
+    for key, value in FILTER_PATTERN.findall(text):
+        if key.lower() == "status":
+            status = normalize_state(value)
+            if status not in STATUSES:
+                raise ValueError(f"Unknown status '{value}'.")
+            selection["status"] = status
+        else:
+            try:
+                selection["created_before"] = datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError("Date must be in the format YYYY-MM-DD.")
+
+    ids = []
+    ranges = []
+    for token in re.split(r"[,\s]+", FILTER_PATTERN.sub(" ", text).strip()):
+        if not token:
+            continue
+
+        first, separator, last = token.partition("-")
+        if not first.isdigit() or (separator and not last.isdigit()):
+            raise ValueError(f"Invalid ID or range '{token}'.")
+
+        if not separator:
+            ids.append(int(first))
+        elif int(first) > int(last):
+            raise ValueError(f"Invalid range '{token}', the first ID must not be greater than the last.")
+        else:
+            ranges.append((int(first), int(last)))
+
+    if len(ranges) == 1 and not ids:
+        selection["id_range"] = ranges[0]
+    elif ranges:
+        # Several ranges or ranges with single IDs => kept as ranges (a single ID is a one-ID range),
+        # never expanded into the IDs they cover
+        selection["id_ranges"] = merge_id_ranges(ranges + [(task_id, task_id) for task_id in ids])
+    elif ids:
+        selection["ids"] = ids
+
+    if not selection:
+        raise ValueError("Enter task IDs, an ID range or a filter.")
+    return selection
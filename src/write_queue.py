@@ -0,0 +1,152 @@
+# write_queue
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Operations flushed together in one transaction at most
+DEFAULT_MAX_BATCH = 100
+
+# Seconds the first operation of a group waits for others to join it before the group is flushed
+DEFAULT_MAX_DELAY = 0.05
+
+# Operations waiting in the queue before add/update/delete block the caller (backpressure)
+DEFAULT_MAX_PENDING = 10000
+
+# Queue items telling the worker to flush the operations queued before them now, or to flush and stop
+_FLUSH = object()
+_STOP = object()
+
+
+class WriteQueueClosed(Exception):
+    """Exception raised when a write is queued after the write queue was closed."""
+    pass
+
+
+# Opt-in write-behind queue in front of any storage backend.
+# add(), update() and delete() return a Future at once; a background worker flushes the queued
+# operations in groups (max_batch operations, or whatever arrived within max_delay seconds) with one
+# commit per group, so many producers share each commit and fsync instead of paying for one each.
+# Each future resolves to the result of its operation (new ID, True/False) or raises its error.
+# A full queue blocks the callers until the worker catches up; close() flushes everything still queued.
+class WriteQueue:
+    def __init__(self, storage, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY, max_pending=DEFAULT_MAX_PENDING):
+        self.storage = storage
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self.transactions = 0   # groups flushed so far
+        self.operations = 0     # operations flushed so far
+        self._queue = queue.Queue(max_pending)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="task-write-queue", daemon=True)
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Function to queue a new task, the future resolves to its ID.
+    # timeout limits how long a full queue may block the caller (queue.Full is raised after it).
+    def add(self, title, description, timeout=None):
+        return self._submit(("add", title, description), timeout)
+
+    # Function to queue a status change, the future resolves to True
+    def update(self, task_id, new_status, timeout=None):
+        return self._submit(("update", task_id, new_status), timeout)
+
+    # Function to queue a deletion, the future resolves to False if there was no task with that ID
+    def delete(self, task_id, timeout=None):
+        return self._submit(("delete", task_id), timeout)
+
+    # Helper function queueing an operation. The closed check and the put happen under the close lock,
+    # so nothing can be queued behind the stop marker of close() (where it would never be flushed).
+    # A caller blocked on a full queue holds the lock until the worker frees a place.
+    def _submit(self, operation, timeout):
+        future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise WriteQueueClosed("The write queue is closed.")
+            self._queue.put((operation, future), timeout=timeout)
+        return future
+
+    # Function to commit every operation queued so far without waiting for max_delay, and wait for it
+    # The marker is queued under the close lock, like writes, so it can't land behind the stop marker of close().
+    def flush(self):
+        with self._close_lock:
+            if self._closed:
+                # close() commits everything
+                return
+            self._queue.put(_FLUSH)
+        self._queue.join()
+
+    # Function to stop accepting writes, commit everything still queued and stop the worker
+    def close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._queue.put(_STOP)
+        self._worker.join()
+
+    # Worker loop: takes the first waiting operation, collects more until the group is full or
+    # max_delay has passed, and flushes the group
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            group = [item]
+            deadline = time.monotonic() + self.max_delay
+            marker = None
+
+            while len(group) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    marker = item
+                    break
+                group.append(item)
+
+            self._flush(group)
+            for _ in group:
+                self._queue.task_done()
+
+            if marker is not None:
+                self._queue.task_done()
+                if marker is _STOP:
+                    return
+
+    # Helper function applying one group in a single transaction and resolving its futures
+    def _flush(self, group):
+        # Futures cancelled while they waited are skipped
+        group = [(operation, future) for operation, future in group if future.set_running_or_notify_cancel()]
+        if not group:
+            return
+
+        try:
+            results = self.storage.apply_writes_db([operation for operation, _ in group])
+        except Exception as error:
+            # The whole transaction failed => every operation of the group failed with it
+            for _, future in group:
+                future.set_exception(error)
+            return
+
+        self.transactions += 1
+        self.operations += len(group)
+        for (_, future), result in zip(group, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,149 @@
+# conftest
+# Shared fixtures of the database tests.
+# - --db-backend picks the storage the task_db tests run against (default: all, MySQL is skipped without a server).
+# - Under pytest-xdist (pytest -n auto) every worker gets its own MySQL database, test_task_manager_gw0, ...
+# - The schema is migrated once per worker. Each test then runs in a transaction on one connection that is
+#   rolled back afterwards: commits of the code under test only move a savepoint, so no DDL runs between tests.
+# - InnoDB FULLTEXT indexes only see committed rows => tests searching (MATCH ... AGAINST) are marked
+#   @pytest.mark.commits and run on a connection that really commits; the tables are truncated afterwards.
+import os
+import pytest
+import mysql.connector
+from tests.test_init import create_test_db, create_test_table, drop_test_db, drop_test_table
+from src.db_config import connect_to_test_db, connection_args, ConnectionPool, TEST_DB_NAME
+from src.task_database import TaskDatabase
+from src.sqlite_database import SQLiteTaskDatabase
+from src.memory_database import MemoryTaskDatabase
+
+DB_BACKENDS = ("mysql", "sqlite", "memory")
+
+# Savepoint standing for "the last commit" inside the transaction of a test
+TEST_SAVEPOINT = "test_commit"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--db-backend", choices=(*DB_BACKENDS, "all"), default="all",
+        help="storage backend of the database tests (default: all; MySQL tests are skipped without a server)"
+    )
+
+
+# Parametrizes every test using the db_backend fixture (through task_db) with the selected backends
+def pytest_generate_tests(metafunc):
+    if "db_backend" in metafunc.fixturenames:
+        option = metafunc.config.getoption("db_backend")
+        metafunc.parametrize("db_backend", DB_BACKENDS if option == "all" else (option,))
+
+
+# Helper to check (with a single quick attempt) whether a MySQL server is running
+def mysql_available():
+    try:
+        mysql.connector.connect(connection_timeout=2, **connection_args()).close()
+        return True
+    except mysql.connector.Error:
+        return False
+
+
+# Connection wrapper isolating a test in a transaction that is rolled back when the test ends.
+# commit() only replaces the savepoint and rollback() returns to it, so the code under test sees the usual
+# commit/rollback behaviour while nothing it writes (rows, trigger counters, archive) outlives the test.
+class SavepointConnection:
+    def __init__(self, connection):
+        self._connection = connection
+        self._execute(f"SAVEPOINT {TEST_SAVEPOINT}")
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def commit(self):
+        self._execute(f"RELEASE SAVEPOINT {TEST_SAVEPOINT}")
+        self._execute(f"SAVEPOINT {TEST_SAVEPOINT}")
+
+    def rollback(self):
+        self._execute(f"ROLLBACK TO SAVEPOINT {TEST_SAVEPOINT}")
+
+    # Function to undo everything the test did (the real rollback)
+    def end_test(self):
+        self._connection.rollback()
+
+    def _execute(self, statement):
+        with self._connection.cursor() as cursor:
+            cursor.execute(statement)
+
+
+# Fixture giving the name of this worker's MySQL test database, created and migrated once per session
+@pytest.fixture(scope="session")
+def mysql_database(request):
+    if request.config.getoption("db_backend") not in ("mysql", "all"):
+        pytest.skip("MySQL tests are not selected (--db-backend)")
+    if not mysql_available():
+        pytest.skip("MySQL server is not available")
+
+    # PYTEST_XDIST_WORKER is "gw0", "gw1", ... in the workers of a parallel run
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    database = f"{TEST_DB_NAME}_{worker}" if worker else TEST_DB_NAME
+
+    drop_test_db(database)    # leftovers of an interrupted run
+    create_test_db(database)
+    create_test_table(database)
+    yield database
+    drop_test_db(database)
+
+
+# Fixture giving the session's MySQL connection
+@pytest.fixture(scope="session")
+def db_connection(mysql_database):
+    connection = connect_to_test_db(mysql_database)
+    yield connection
+    connection.close()
+
+
+# Fixture giving a connection whose work is rolled back after the test
+@pytest.fixture
+def mysql_connection(db_connection):
+    connection = SavepointConnection(db_connection)
+    yield connection
+    connection.end_test()
+
+
+# Fixture giving a connection that really commits, for tests marked @pytest.mark.commits.
+# The tables are emptied after the test.
+@pytest.fixture
+def mysql_committing_connection(mysql_database):
+    connection = connect_to_test_db(mysql_database)
+    yield connection
+    connection.close()
+    drop_test_table(mysql_database)
+
+
+# Fixture giving a connection pool on the test database, for tests that need several connections.
+# Pooled connections really commit, so the tables are emptied after the test.
+@pytest.fixture
+def mysql_pool(mysql_database):
+    pool = ConnectionPool(database=mysql_database, size=2)
+    yield pool
+    pool.close()
+    drop_test_table(mysql_database)
+
+
+# Fixture giving a fresh storage backend for each test, the same tests run on every selected backend
+@pytest.fixture
+def task_db(request, db_backend):
+    if db_backend == "mysql":
+        # Schema is migrated once per session (mysql_database)
+        committing = request.node.get_closest_marker("commits") is not None
+        # The rolled-back earlier tests leave fresh gaps in the change feed seqs, which would hold the feed back
+        yield TaskDatabase(
+            request.getfixturevalue("mysql_committing_connection" if committing else "mysql_connection"),
+            change_feed_delay=0
+        )
+        return
+
+    if db_backend == "sqlite":
+        storage = SQLiteTaskDatabase(":memory:")
+    else:
+        storage = MemoryTaskDatabase()
+
+    storage.create_table_db()
+    yield storage
+    storage.close()
@@ -0,0 +1,175 @@
+# test_api_server
+import http.client
+import json
+import socket
+import threading
+import pytest
+from src.api_server import TaskHTTPServer
+from src.memory_database import MemoryTaskDatabase
+
+
+# Fixture starting the API over an in-memory storage on a free port, returns a function making servers
+@pytest.fixture
+def make_server():
+    servers = []
+
+    def start(**options):
+        server = TaskHTTPServer(("127.0.0.1", 0), MemoryTaskDatabase(), **options)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+# Fixture giving a keep-alive client connection to a started server
+@pytest.fixture
+def client(make_server):
+    server = make_server(workers=4)
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    yield connection
+    connection.close()
+
+
+# Helper sending one request and returning (status, decoded JSON body or None)
+def call(connection, method, path, body=None):
+    data = None if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    connection.request(method, path, data)
+    response = connection.getresponse()
+    payload = response.read()
+    return response.status, json.loads(payload) if payload else None
+
+
+# Test the single-task endpoints: create, get, update (typos corrected) and delete
+def test_task_crud(client):
+    status, created = call(client, "POST", "/tasks", {"title": " Write report ", "description": "Quarterly"})
+    assert (status, created) == (201, {"id": 1})
+
+    status, task = call(client, "GET", "/tasks/1")
+    assert status == 200
+    assert (task["title"], task["status"]) == ("Write report", "not started")
+
+    status, task = call(client, "PATCH", "/tasks/1", {"status": "in progres"})
+    assert (status, task["status"]) == (200, "in progress")
+
+    assert call(client, "DELETE", "/tasks/1") == (204, None)
+    assert call(client, "GET", "/tasks/1")[0] == 404
+    assert call(client, "DELETE", "/tasks/1")[0] == 404
+
+
+# Test that the list is paginated by ID and that next_after_id leads through every page
+def test_list_pagination(client):
+    call(client, "POST", "/tasks/bulk", {"tasks": [{"title": f"Task {index}", "description": "Desc"} for index in range(5)]})
+
+    seen = []
+    after_id = 0
+    while after_id is not None:
+        status, page = call(client, "GET", f"/tasks?after_id={after_id}&limit=2")
+        assert status == 200 and len(page["tasks"]) <= 2
+        seen.extend(task["id"] for task in page["tasks"])
+        after_id = page["next_after_id"]
+
+    assert seen == [1, 2, 3, 4, 5]
+
+
+# Test the bulk endpoints: rejected rows are reported, updates and deletes need a selection
+def test_bulk_endpoints(client):
+    status, result = call(client, "POST", "/tasks/bulk", {"tasks": [
+        {"title": "A", "description": "Desc"}, {"title": "", "description": "Desc"}, {"title": "C", "description": "Desc"},
+    ]})
+    assert status == 200
+    assert result["inserted"] == [[1, 2]]
+    assert [index for index, _ in result["rejected"]] == [1]
+
+    assert call(client, "PATCH", "/tasks/bulk", {"set_status": "done", "ids": [1, 2]}) == (200, {"updated": 2})
+    assert call(client, "DELETE", "/tasks/bulk", {})[0] == 400
+    assert call(client, "DELETE", "/tasks/bulk", {"status": "done"}) == (200, {"deleted": 2})
+
+
+# Test that invalid requests get a JSON error with the right status
+@pytest.mark.parametrize("method, path, body, expected", [
+    ("POST", "/tasks", b"{not json", 400),
+    ("POST", "/tasks", {"title": "No description"}, 400),
+    ("POST", "/tasks", {"title": "x" * 51, "description": "Too long"}, 400),
+    ("PATCH", "/tasks/1", {"status": "someday"}, 400),
+    ("GET", "/tasks?limit=abc", None, 400),
+    ("PATCH", "/tasks/bulk", {"set_status": "done", "id_range": ["a", None]}, 400),
+    ("PATCH", "/tasks/bulk", {"set_status": "done", "id_range": [True, 5]}, 400),
+    ("DELETE", "/tasks/bulk", {"id_range": [5, 1]}, 400),
+    ("DELETE", "/tasks/bulk", {"ids": [1, False]}, 400),
+    ("DELETE", "/tasks/bulk", {}, 400),
+    ("DELETE", "/tasks/bulk", {"created_before": "yesterday"}, 400),
+    ("GET", "/unknown", None, 404),
+    ("DELETE", "/tasks", None, 405),
+    ("PUT", "/tasks/1", {}, 501),
+])
+def test_invalid_requests(client, method, path, body, expected):
+    status, payload = call(client, method, path, body)
+
+    assert status == expected
+    assert "error" in payload
+
+
+# Test that one connection serves many requests (keep-alive) on the same socket
+def test_keep_alive(client):
+    call(client, "POST", "/tasks", {"title": "Task", "description": "Desc"})
+    first_socket = client.sock
+
+    for _ in range(20):
+        assert call(client, "GET", "/tasks/1")[0] == 200
+    assert client.sock is first_socket
+
+
+# Test that a connection that sends nothing is closed after the request timeout, freeing its worker
+def test_request_timeout(make_server):
+    server = make_server(workers=1, request_timeout=0.2)
+
+    with socket.create_connection(server.server_address, timeout=5) as idle:
+        idle.sendall(b"GET /tasks HTTP/1.1\r\n")   # never finishes the request
+        assert idle.recv(1024) == b""              # closed by the server
+
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    assert call(connection, "GET", "/tasks")[0] == 200
+    connection.close()
+
+
+# Test that connections beyond the workers and the backlog are refused with 503 instead of queueing
+def test_busy_server_answers_503(make_server):
+    server = make_server(workers=1, max_pending=0)
+
+    # Keeps the only worker busy: the connection stays open (keep-alive) after its request
+    busy = http.client.HTTPConnection(*server.server_address, timeout=5)
+    assert call(busy, "GET", "/tasks")[0] == 200
+
+    refused = http.client.HTTPConnection(*server.server_address, timeout=5)
+    status, payload = call(refused, "GET", "/tasks")
+    assert status == 503 and "error" in payload
+
+    busy.close()
+    refused.close()
+
+# Test that the storage stays quiet while serving: no menu message ("✅ Task was added...") per request
+def test_server_silences_storage_messages(client, capsys):
+    assert call(client, "POST", "/tasks", {"title": "Task", "description": "Desc"})[0] == 201
+    assert call(client, "PATCH", "/tasks/1", {"status": "someday"})[0] == 400
+
+    assert capsys.readouterr().out == ""
+
+
+# Test that an unexpected exception from the storage gives a 500 answer (not a dropped connection, nor a 400)
+def test_unexpected_error_answers_500(make_server, capsys):
+    server = make_server(workers=1)
+    server.storage.fetch_task_db = lambda task_id: {}["missing"]   # KeyError: a bug, not a bad request
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+
+    status, payload = call(connection, "GET", "/tasks/1")
+    assert status == 500 and "KeyError" in payload["error"]
+    assert call(connection, "GET", "/tasks")[0] == 200   # the connection and the worker are still usable
+    connection.close()
+    assert "KeyError" in capsys.readouterr().err
+
+# pytest tests/test_api_server.py
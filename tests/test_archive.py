@@ -0,0 +1,48 @@
+# test_archive
+import time
+from datetime import datetime
+from src.archive import Archiver, archive_cutoff, archive_done_tasks
+from src.memory_database import MemoryTaskDatabase
+
+
+# Helper giving an in-memory storage with one old done task and one open task
+def make_storage():
+    storage = MemoryTaskDatabase()
+    storage.add_tasks_bulk([
+        ("Old done", "Description", "done", datetime(2020, 1, 1)),
+        ("Old open", "Description", "in progress", datetime(2020, 1, 1)),
+    ])
+    return storage
+
+
+# Test that the cutoff is the given number of days before now, in whole seconds
+def test_archive_cutoff():
+    assert archive_cutoff(30, datetime(2024, 3, 31, 12, 0, 0, 500)) == datetime(2024, 3, 1, 12, 0)
+
+
+# Test that archiving once moves only the old done task
+def test_archive_done_tasks():
+    storage = make_storage()
+
+    assert archive_done_tasks(storage, 30) == 1
+    assert [task[1] for task in storage.fetch_archive_page_db()] == ["Old done"]
+
+
+# Test that a background archiver keeps archiving until it is stopped
+def test_archiver_runs_until_stopped():
+    storage = make_storage()
+    archiver = Archiver(storage, days=30, interval=0.01)
+    archiver.start()
+
+    deadline = time.monotonic() + 5
+    while archiver.archived == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    storage.add_tasks_bulk([("Second", "Description", "done", datetime(2020, 1, 2))])
+    while archiver.archived == 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    archiver.stop()
+
+    assert archiver.archived == 2
+    assert storage.fetch_task_ids_db() == [(2, "Old open")]
+
+# pytest tests/test_archive.py
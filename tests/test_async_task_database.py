@@ -0,0 +1,125 @@
+# test_async_task_database
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock
+from src.async_task_database import AsyncTaskDatabase
+from src.memory_database import MemoryTaskDatabase
+from src.sqlite_database import SQLiteTaskDatabase
+
+
+# Test that many concurrent adds all succeed and get distinct IDs
+@pytest.mark.parametrize("make_storage", [MemoryTaskDatabase, SQLiteTaskDatabase])
+def test_concurrent_adds(make_storage):
+    async def scenario():
+        async with AsyncTaskDatabase(make_storage(), max_workers=4) as db:
+            await db.create_table_db()
+            ids = await asyncio.gather(*(db.add_task_db(f"Task {index}", "Desc") for index in range(200)))
+            pages = [page async for page in db.iter_task_pages_db(page_size=50)]
+            return ids, pages
+
+    ids, pages = asyncio.run(scenario())
+
+    assert len(set(ids)) == 200
+    assert sum(len(page) for page in pages) == 200
+
+
+# Test that no more storage calls run at once than there are workers
+def test_concurrency_is_bounded():
+    running = []
+    peak = []
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def slow_fetch(task_id):
+        with lock:
+            running.append(task_id)
+            peak.append(len(running))
+        release.wait(1)
+        with lock:
+            running.remove(task_id)
+        return task_id
+
+    storage = MagicMock()
+    storage.fetch_task_db.side_effect = slow_fetch
+
+    async def scenario():
+        db = AsyncTaskDatabase(storage, max_workers=3)
+        calls = asyncio.gather(*(db.fetch_task_db(task_id) for task_id in range(10)))
+        await asyncio.sleep(0.05)
+        release.set()
+        result = await calls
+        await db.close()
+        return result
+
+    assert asyncio.run(scenario()) == list(range(10))
+    assert max(peak) == 3
+
+
+# Test that a call taking longer than the timeout raises TimeoutError
+def test_timeout():
+    release = threading.Event()
+    storage = MagicMock()
+    storage.fetch_tasks_db.side_effect = lambda: release.wait(1)
+
+    async def scenario():
+        db = AsyncTaskDatabase(storage, max_workers=1, timeout=0.05)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await db.fetch_tasks_db()
+        finally:
+            release.set()
+            await db.close()
+
+    asyncio.run(scenario())
+
+
+# Test that the time spent waiting for a free worker counts toward the timeout
+def test_timeout_while_waiting_for_worker():
+    release = threading.Event()
+    storage = MagicMock()
+    storage.fetch_tasks_db.side_effect = lambda: release.wait(1)
+
+    async def scenario():
+        db = AsyncTaskDatabase(storage, max_workers=1)
+        busy = asyncio.ensure_future(db.fetch_tasks_db())
+        await asyncio.sleep(0.01)
+        try:
+            start = asyncio.get_running_loop().time()
+            with pytest.raises(asyncio.TimeoutError):
+                await db.delete_task_db(1, timeout=0.05)
+            assert asyncio.get_running_loop().time() - start < 0.5
+        finally:
+            release.set()
+            await busy
+            await db.close()
+
+    asyncio.run(scenario())
+    storage.delete_task_db.assert_not_called()
+
+
+# Test that a caller waiting for a free worker can be cancelled before its call starts
+def test_cancel_waiting_call():
+    release = threading.Event()
+    storage = MagicMock()
+    storage.fetch_tasks_db.side_effect = lambda: release.wait(1)
+
+    async def scenario():
+        db = AsyncTaskDatabase(storage, max_workers=1)
+        busy = asyncio.ensure_future(db.fetch_tasks_db())
+        await asyncio.sleep(0.01)
+
+        waiting = asyncio.ensure_future(db.delete_task_db(1))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+
+        release.set()
+        await busy
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await db.close()
+
+    asyncio.run(scenario())
+    storage.delete_task_db.assert_not_called()
+
+# pytest tests/test_async_task_database.py
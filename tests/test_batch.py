@@ -0,0 +1,135 @@
+# test_batch
+import io
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.batch import BatchRunner, parse_command
+from src.memory_database import MemoryTaskDatabase
+
+
+# Helper running commands against a fresh in-memory storage, returns (results by line, summary, storage)
+def run(lines, batch_size=1000):
+    storage = MemoryTaskDatabase()
+    out = io.StringIO()
+    summary = BatchRunner(storage, out, batch_size).run(lines)
+
+    results = {}
+    for record in map(json.loads, out.getvalue().splitlines()):
+        if "op" in record:
+            results[record["line"]] = record
+    return results, summary, storage
+
+
+# Tests that line syntax and JSON lines are parsed into the same commands
+@pytest.mark.parametrize("line, expected", [
+    ("add Title | Some description", {"op": "add", "title": "Title", "description": "Some description"}),
+    ('{"op": "add", "title": "Title", "description": "Some description"}', {"op": "add", "title": "Title", "description": "Some description"}),
+    ("update 5 in progres", {"op": "update", "id": 5, "status": "in progress"}),
+    ('{"op": "update", "id": "5", "status": "done"}', {"op": "update", "id": 5, "status": "done"}),
+    ("DELETE 7", {"op": "delete", "id": 7}),
+    ("list", {"op": "list"}),
+    ("archive", {"op": "archive"}),
+    ("stats", {"op": "stats"}),
+    ("archive 90", {"op": "archive", "days": 90}),
+    ('{"op": "archive", "days": 7}', {"op": "archive", "days": 7}),
+    ("   ", None),
+    ("# comment", None),
+])
+def test_parse_command(line, expected):
+    assert parse_command(line) == expected
+
+
+# Tests that invalid commands are refused with a message
+@pytest.mark.parametrize("line", ["add no separator", "add  | desc", "update x done", "update 1 waiting", "delete", "move 1", "{not json", "archive soon", "archive -1"])
+def test_parse_command_invalid(line):
+    with pytest.raises(ValueError):
+        parse_command(line)
+
+
+# Test that a mixed stream gets one result per command and a correct summary
+def test_batch_run_mixed_commands():
+    results, summary, storage = run([
+        "add Task A | Description A",
+        "add Task B | Description B",
+        "add   | missing title",
+        "update 1 done",
+        "update 42 done",
+        "delete 2",
+        "bogus",
+    ])
+
+    assert results[1] == {"line": 1, "op": "add", "ok": True, "id": 1}
+    assert results[2]["id"] == 2
+    assert results[3]["ok"] is False
+    assert results[4]["ok"] is True
+    assert results[5] == {"line": 5, "op": "update", "ok": False, "id": 42, "error": "Task not found."}
+    assert results[6]["ok"] is True
+    assert results[7]["ok"] is False
+
+    assert summary["commands"] == 7
+    assert summary["succeeded"] == 4
+    assert summary["failed"] == 3
+
+    assert storage.fetch_task_db(1)[3] == "done"
+    assert storage.fetch_task_db(2) is None
+
+
+# Test that consecutive adds are written with one bulk call per batch
+def test_batch_groups_adds():
+    storage = MagicMock()
+    storage.add_tasks_bulk.side_effect = lambda tasks: {"inserted": [(1, len(tasks))], "rejected": []}
+
+    summary = BatchRunner(storage, io.StringIO(), batch_size=50).run(f"add Task {index} | Desc" for index in range(120))
+
+    assert [len(call.args[0]) for call in storage.add_tasks_bulk.call_args_list] == [50, 50, 20]
+    assert summary["succeeded"] == 120
+
+
+# Test that list streams every unfinished task before its result line
+def test_batch_list():
+    storage = MemoryTaskDatabase()
+    out = io.StringIO()
+    BatchRunner(storage, out).run(["add Task A | Desc", "add Task B | Desc", "update 1 done", "list"])
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    listed = [record["task"]["title"] for record in records if "task" in record]
+
+    assert listed == ["Task B"]
+    assert records[-1] == {"line": 4, "op": "list", "ok": True, "count": 1}
+
+
+# Test that archive moves the old done tasks and reports how many
+def test_batch_archive():
+    storage = MemoryTaskDatabase()
+    storage.add_tasks_bulk([("Task A", "Desc", "done", datetime(2020, 1, 1)), ("Task B", "Desc", "done", None)])
+    out = io.StringIO()
+
+    BatchRunner(storage, out, archive_days=30).run(["archive", "archive 0"])
+
+    assert [json.loads(line)["archived"] for line in out.getvalue().splitlines()] == [1, 0]
+    assert storage.fetch_archived_task_db(1)[1] == "Task A"
+    assert storage.fetch_task_db(2) is not None
+
+
+# Test that stats reports the status counts as one JSON result
+def test_batch_stats():
+    results, summary, storage = run(["add Task A | Desc", "add Task B | Desc", "update 1 done", "stats"])
+
+    assert results[4]["statuses"] == {"not started": 1, "done": 1, "in progress": 0}
+    assert results[4]["total"] == 2
+    assert results[4]["daily"][-1]["created"] == 2
+
+
+# Test that a storage failure marks every command of the group as failed instead of stopping the run
+def test_batch_storage_failure():
+    storage = MagicMock()
+    storage.fetch_existing_ids_db.side_effect = Exception("connection lost")
+
+    out = io.StringIO()
+    summary = BatchRunner(storage, out).run(["delete 1", "delete 2"])
+
+    assert summary["failed"] == 2
+    assert "connection lost" in out.getvalue()
+
+# pytest tests/test_batch.py
@@ -0,0 +1,138 @@
+# test_db_config
+import pytest
+import mysql.connector
+from unittest.mock import MagicMock
+from mysql.connector import Error
+from mysql.connector.errors import PoolError, InterfaceError
+from src import db_config
+from src.db_config import ConnectionPool, retry_with_backoff
+
+
+# Fixture that records sleeps instead of waiting, so backoff tests run instantly
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(db_config.time, "sleep", recorded.append)
+    return recorded
+
+
+# Helper to build a ConnectionPool around a mocked MySQLConnectionPool
+def make_pool(monkeypatch, mysql_pool, **kwargs):
+    monkeypatch.setattr(mysql.connector.pooling, "MySQLConnectionPool", lambda **_: mysql_pool)
+    return ConnectionPool(database="test_db", **kwargs)
+
+
+# Test that retry_with_backoff retries failed connects with doubling delays and returns the connection
+def test_retry_with_backoff_recovers(sleeps):
+    connection = MagicMock()
+    connect = MagicMock(side_effect=[Error("down"), Error("down"), connection])
+
+    result = retry_with_backoff(connect, "test server", retries=5, backoff=0.5)
+
+    assert result is connection
+    assert connect.call_count == 3
+    assert sleeps == [0.5, 1.0]
+
+
+# Test that retry_with_backoff raises the last error instead of exiting the process
+def test_retry_with_backoff_gives_up(sleeps, capsys):
+    connect = MagicMock(side_effect=Error("server gone"))
+
+    with pytest.raises(Error):
+        retry_with_backoff(connect, "test server", retries=3, backoff=0.5)
+
+    assert connect.call_count == 3
+    assert sleeps == [0.5, 1.0]
+    assert "server gone" in capsys.readouterr().out
+
+
+# Test that retries=0 (e.g. DB_CONNECT_RETRIES=0) still makes one attempt instead of returning None
+def test_retry_with_backoff_without_retries(sleeps):
+    connection = MagicMock()
+    connect = MagicMock(return_value=connection)
+
+    assert retry_with_backoff(connect, "test server", retries=0) is connection
+    connect.assert_called_once()
+
+    connect = MagicMock(side_effect=Error("down"))
+    with pytest.raises(Error):
+        retry_with_backoff(connect, "test server", retries=0)
+    assert sleeps == []
+
+
+# Test that connect_to_db retries instead of calling sys.exit on failure
+def test_connect_to_db_retries(monkeypatch, sleeps):
+    connection = MagicMock()
+    connect = MagicMock(side_effect=[Error("down"), connection])
+    monkeypatch.setattr(mysql.connector, "connect", connect)
+
+    assert db_config.connect_to_db() is connection
+    assert connect.call_args.kwargs["database"] == db_config.DB_NAME
+
+
+# Test that the pool waits for a connection to be returned when it is exhausted
+def test_pool_waits_when_exhausted(monkeypatch, sleeps):
+    connection = MagicMock()
+    mysql_pool = MagicMock()
+    mysql_pool.get_connection.side_effect = [PoolError("exhausted"), PoolError("exhausted"), connection]
+
+    pool = make_pool(monkeypatch, mysql_pool, timeout=5)
+
+    assert pool.get_connection() is connection
+    assert len(sleeps) == 2
+
+
+# Test that the pool backs off and retries when reconnecting a stale connection fails
+def test_pool_reconnects_with_backoff(monkeypatch, sleeps):
+    connection = MagicMock()
+    mysql_pool = MagicMock()
+    mysql_pool.get_connection.side_effect = [InterfaceError("lost"), connection]
+
+    pool = make_pool(monkeypatch, mysql_pool, timeout=5, backoff=0.5)
+
+    assert pool.get_connection() is connection
+    assert sleeps == [0.5]
+
+
+# Test that the pool raises once the timeout is used up
+def test_pool_times_out(monkeypatch, sleeps):
+    mysql_pool = MagicMock()
+    mysql_pool.get_connection.side_effect = PoolError("exhausted")
+
+    pool = make_pool(monkeypatch, mysql_pool, timeout=0)
+
+    with pytest.raises(PoolError):
+        pool.get_connection()
+
+
+# Test that the pool connects on the first borrow, not when it is created
+def test_pool_connects_lazily(monkeypatch):
+    created = []
+    mysql_pool = MagicMock()
+    monkeypatch.setattr(mysql.connector.pooling, "MySQLConnectionPool", lambda **_: created.append(1) or mysql_pool)
+
+    pool = ConnectionPool(database="test_db")
+    pool.close()
+    assert created == []
+
+    pool.get_connection()
+    pool.get_connection()
+    assert created == [1]
+
+
+# Test that a borrowed connection is always returned to the pool, even after an error
+def test_pool_connection_is_returned(monkeypatch):
+    connection = MagicMock()
+    mysql_pool = MagicMock()
+    mysql_pool.get_connection.return_value = connection
+
+    pool = make_pool(monkeypatch, mysql_pool)
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as borrowed:
+            assert borrowed is connection
+            raise RuntimeError("operation failed")
+
+    connection.close.assert_called_once()
+
+# pytest tests/test_db_config.py
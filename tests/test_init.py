@@ -1,69 +1,58 @@
 # test_init
-from src.db_config import connect_to_test_db, connect_to_mysql
+from src.db_config import connect_to_test_db, connect_to_mysql, TEST_DB_NAME
+from src.task_database import TaskDatabase
 import mysql.connector
 
-# Connects to mysql, creates test database and table
-def create_test_db():
+# Tables emptied by drop_test_table: the tasks and everything the triggers and the archive fill from them
+TEST_TABLES = ("tasks", "tasks_archive", "task_status_counts", "task_daily_counts", "task_changes")
+
+
+# Connects to mysql, creates test database (one per parallel test worker, see conftest.py)
+def create_test_db(database=TEST_DB_NAME):
     try:
         with connect_to_mysql() as connection:  # Connects to mysql | (connection.close() and cursor.close() not needed when using 'with')
             with connection.cursor() as cursor:
-                cursor.execute("CREATE DATABASE IF NOT EXISTS test_task_manager") # Creates test database
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database}") # Creates test database
                 connection.commit()
 
     except mysql.connector.Error as error:
         print(f"\n❌ Error while creating test database: {error}")
         raise
 
-    print("\n✔️  Test database created.")
-
+    print(f"\n✔️  Test database {database} created.")
 
-# Creates test table 
-def create_test_table():
-    try:
-        with connect_to_test_db() as connection:  # Connects to test database
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS tasks (
-                        id INT AUTO_INCREMENT PRIMARY KEY, 
-                        title VARCHAR(50) NOT NULL,
-                        description TEXT NOT NULL,
-                        status ENUM('not started', 'done', 'in progress') NOT NULL DEFAULT 'not started',
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        CHECK (CHAR_LENGTH(TRIM(title)) > 0),
-                        CHECK (CHAR_LENGTH(TRIM(description)) > 0) 
-                    );
-                """)
-                connection.commit()
 
-    except mysql.connector.Error as error:
-        print(f"\n❌ Error while creating test table: {error}")
-        raise
+# Creates the test tables with the same migrations as the application (tables, indexes, triggers)
+def create_test_table(database=TEST_DB_NAME):
+    with connect_to_test_db(database) as connection:  # Connects to test database
+        TaskDatabase(connection).create_table_db()
 
     print("\n✔️  Test table created.")
 
 
 # Deletes test database
-def drop_test_db():
+def drop_test_db(database=TEST_DB_NAME):
     try:
         with connect_to_mysql() as connection: # Connects to mysql
             with connection.cursor() as cursor:
-                cursor.execute("DROP DATABASE IF EXISTS test_task_manager")
+                cursor.execute(f"DROP DATABASE IF EXISTS {database}")
                 connection.commit()
 
     except mysql.connector.Error as error:
         print(f"\n❌ Error while deleting test database: {error}")
         raise
-    
-    print("\n✔️  Test database deleted.")
 
+    print(f"\n✔️  Test database {database} deleted.")
 
-# Deletes test table
-def drop_test_table():
+
+# Empties the test tables (for tests that really commit, e.g. through a connection pool).
+# TRUNCATE also clears the FULLTEXT index and fires no triggers, so the next test starts from empty tables.
+def drop_test_table(database=TEST_DB_NAME):
     try:
-        with connect_to_test_db() as connection:  # Connects to test database
+        with connect_to_test_db(database) as connection:  # Connects to test database
             with connection.cursor() as cursor:
-                cursor.execute("DELETE FROM tasks") # Deletes test table contents
-                connection.commit()
+                for table in TEST_TABLES:
+                    cursor.execute(f"TRUNCATE TABLE {table}") # Deletes test table contents
 
     except mysql.connector.Error as error:
         print(f"\n❌ Error while deleting test table: {error}")
@@ -74,3 +63,4 @@ def drop_test_table():
 
 if __name__ == "__main__":
     create_test_db()
+    create_test_table()
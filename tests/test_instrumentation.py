@@ -0,0 +1,125 @@
+# test_instrumentation
+import io
+import pytest
+from src.instrumentation import (
+    fingerprint, Instrumentation, LatencyHistogram, SlowQueryLog, PrometheusFile, QueryEvent
+)
+from src.sqlite_database import SQLiteTaskDatabase
+
+
+# Fixture giving a SQLite storage whose statements are collected in a list
+@pytest.fixture
+def instrumented_db():
+    events = []
+    storage = SQLiteTaskDatabase(":memory:")
+    storage.create_table_db()
+    storage.instrument(Instrumentation([events.append]))
+    yield storage, events
+    storage.close()
+
+
+# Tests that statements differing only in literals, placeholders or list lengths share one fingerprint
+@pytest.mark.parametrize("statement, expected", [
+    ("SELECT * FROM tasks WHERE id = 42", "SELECT * FROM tasks WHERE id = ?"),
+    ("SELECT  *\n FROM tasks WHERE title = 'it''s'", "SELECT * FROM tasks WHERE title = ?"),
+    ("DELETE FROM tasks WHERE id IN (%s, %s, %s)", "DELETE FROM tasks WHERE id IN (?, ...)"),
+    ("DELETE FROM tasks WHERE id IN (1, 2)", "DELETE FROM tasks WHERE id IN (?, ...)"),
+    (
+        "INSERT INTO tasks (title, description) VALUES (%s, COALESCE(%s, 'x')), (%s, COALESCE(%s, 'x'))",
+        "INSERT INTO tasks (title, description) VALUES (?, COALESCE(?, ...)), ...",
+    ),
+])
+def test_fingerprint(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+# Test that every statement of an operation is reported with its row count, plus the commit
+def test_instrumented_operations(instrumented_db):
+    storage, events = instrumented_db
+
+    storage.add_tasks_bulk([("Task 1", "Description"), ("Task 2", "Description")])
+    storage.fetch_task_ids_db()
+    storage.delete_tasks_bulk_db(ids=[1, 2])
+
+    reported = [(event.kind, event.fingerprint.split()[0], event.rows) for event in events]
+    assert reported == [
+        ("execute", "INSERT", 2),
+        ("execute", "SELECT", 1),     # last_insert_rowid()
+        ("commit", "COMMIT", 0),
+        ("execute", "SELECT", 2),     # fetch_task_ids_db
+        ("execute", "DELETE", 2),
+        ("commit", "COMMIT", 0),
+    ]
+    assert all(event.seconds >= 0 for event in events)
+
+
+# Test that a streamed SELECT is reported once, after all its chunks were read
+def test_instrumented_streaming(instrumented_db):
+    storage, events = instrumented_db
+    storage.add_tasks_bulk([(f"Task {index}", "Description") for index in range(5)])
+    events.clear()
+
+    assert sum(len(chunk) for chunk in storage.stream_tasks_db(chunk_size=2)) == 5
+
+    assert [event.rows for event in events] == [2, 2, 1, 0]
+
+
+# Test that turning instrumentation off hands out the plain connection again
+def test_instrumentation_off(instrumented_db):
+    storage, events = instrumented_db
+
+    with storage._borrow() as connection:
+        # The backend imports instrumentation without the src. prefix => compare by class name
+        assert type(connection).__name__ == "InstrumentedConnection"
+
+    storage.instrument(None)
+    storage.add_task_db("Task", "Description")
+
+    with storage._borrow() as connection:
+        assert connection is storage.connection
+    assert events == []
+
+
+# Test that the histogram counts events per fingerprint and dumps them as Prometheus text
+def test_latency_histogram_prometheus_text():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1))
+    histogram(QueryEvent("execute", 'SELECT "x"', "", 0.005, 3))
+    histogram(QueryEvent("execute", 'SELECT "x"', "", 0.05, 1))
+    histogram(QueryEvent("commit", "COMMIT", "COMMIT", 0.5, 0))
+
+    text = histogram.prometheus_text()
+
+    labels = 'kind="execute",query="SELECT \\"x\\""'
+    assert f'task_db_query_duration_seconds_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'task_db_query_duration_seconds_bucket{{{labels},le="0.1"}} 2' in text
+    assert f'task_db_query_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"task_db_query_duration_seconds_count{{{labels}}} 2" in text
+    assert f"task_db_query_rows_total{{{labels}}} 4" in text
+    assert 'kind="commit",query="COMMIT",le="0.1"} 0' in text
+
+
+# Test that only statements over the threshold reach the slow-query log
+def test_slow_query_log():
+    out = io.StringIO()
+    log = SlowQueryLog(threshold=0.1, file=out)
+
+    log(QueryEvent("execute", "SELECT ?", "SELECT 1", 0.05, 1))
+    log(QueryEvent("execute", "DELETE FROM tasks", "DELETE FROM tasks", 0.25, 7))
+
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 1
+    assert "250.0 ms rows=7: DELETE FROM tasks" in lines[0]
+
+
+# Test that closing the instrumentation writes the metrics file
+def test_prometheus_file_written_on_close(tmp_path):
+    histogram = LatencyHistogram()
+    path = tmp_path / "metrics.prom"
+    instrumentation = Instrumentation([histogram, PrometheusFile(histogram, str(path))])
+
+    instrumentation.emit(QueryEvent("execute", "SELECT ?", "SELECT 1", 0.001, 1))
+    instrumentation.close()
+
+    assert "task_db_query_duration_seconds_count" in path.read_text(encoding="utf-8")
+
+# pytest tests/test_instrumentation.py
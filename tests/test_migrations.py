@@ -0,0 +1,150 @@
+# test_migrations
+import pytest
+from unittest.mock import MagicMock
+from mysql.connector import Error, ProgrammingError, errorcode
+from src.migrations import migrate, add_index, add_column, backfill, MIGRATIONS, LATEST_VERSION
+
+
+# Helper building a mocked connection whose cursor returns the given fetchone() results in order
+def make_connection(fetch_results):
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = fetch_results
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    return connection, cursor
+
+
+# Helper returning the SQL text of every executed statement
+def executed(cursor):
+    return [" ".join(call.args[0].split()) for call in cursor.execute.call_args_list]
+
+
+# Test that migration versions are unique and strictly increasing
+def test_migrations_are_ordered():
+    versions = [version for version, _, _ in MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert LATEST_VERSION == versions[-1]
+
+
+# Test that a fresh database gets every migration applied and recorded
+def test_migrate_fresh_database():
+    # Up-to-date check, GET_LOCK, current version, index and column existence checks with the ID ranges of the
+    # (empty) backfilled tables in between, RELEASE_LOCK
+    empty = (None, None)
+    connection, cursor = make_connection([
+        (0,), (1,), (0,),
+        (0,), (0,), (0,),                       # indexes of versions 2-4
+        (0,), (0,), empty, empty,               # version 6: completed_at columns and backfills
+        (0,), empty, empty,                     # version 7: updated_at column and backfills
+        (1,),
+    ])
+
+    applied = migrate(connection)
+
+    assert applied == [version for version, _, _ in MIGRATIONS]
+    statements = executed(cursor)
+    assert any(statement.startswith("CREATE TABLE IF NOT EXISTS tasks") for statement in statements)
+    assert any("ADD INDEX idx_tasks_status_created (status, created_at, id)" in statement for statement in statements)
+    assert any("ADD FULLTEXT INDEX ft_tasks_title_description (title, description), ALGORITHM=INPLACE, LOCK=SHARED" in statement for statement in statements)
+    assert any(statement.startswith("CREATE TABLE IF NOT EXISTS tasks_archive") for statement in statements)
+    assert "ALTER TABLE tasks ADD COLUMN completed_at DATETIME NULL" in statements
+    assert any(statement.startswith("CREATE TRIGGER tasks_stats_update AFTER UPDATE ON tasks") for statement in statements)
+    assert any(statement.startswith("ALTER TABLE tasks ADD COLUMN updated_at DATETIME") for statement in statements)
+    assert any(statement.startswith("CREATE TABLE IF NOT EXISTS task_changes") for statement in statements)
+    assert any(statement.startswith("CREATE TRIGGER tasks_changes_delete AFTER DELETE ON tasks") for statement in statements)
+    assert any(statement.startswith("CREATE TRIGGER tasks_archive_stats_insert AFTER INSERT ON tasks_archive") for statement in statements)
+    # The last statistics triggers only insert deltas, no shared counter row is updated (and locked) by a write
+    stats_trigger = [statement for statement in statements if statement.startswith("CREATE TRIGGER tasks_stats_update")][-1]
+    assert "INSERT INTO task_status_deltas" in stats_trigger and "task_status_counts" not in stats_trigger
+    assert connection.commit.call_count == len(MIGRATIONS)
+
+
+# Test that already applied versions are skipped
+def test_migrate_skips_applied_versions():
+    # Up-to-date check finds an older version, GET_LOCK, current version, RELEASE_LOCK
+    connection, cursor = make_connection([(LATEST_VERSION - 1,), (1,), (LATEST_VERSION - 1,), (1,)])
+
+    applied = migrate(connection)
+
+    assert applied == [LATEST_VERSION]
+    assert not any("CREATE TABLE IF NOT EXISTS tasks (" in statement for statement in executed(cursor))
+    assert connection.commit.call_count == 1
+
+
+# Test that an up-to-date schema is checked with a single SELECT: no lock, no DDL
+def test_migrate_up_to_date():
+    connection, cursor = make_connection([(LATEST_VERSION,)])
+
+    applied = migrate(connection)
+
+    assert applied == []
+    assert executed(cursor) == ["SELECT COALESCE(MAX(version), 0) FROM schema_version"]
+    connection.commit.assert_not_called()
+
+
+# Test that a database without the version table goes through the full (locked) migration
+def test_migrate_missing_version_table():
+    connection, cursor = make_connection([(1,), (LATEST_VERSION,), (1,)])
+    cursor.execute.side_effect = [ProgrammingError(errno=errorcode.ER_NO_SUCH_TABLE), None, None, None, None]
+
+    assert migrate(connection) == []
+    assert executed(cursor)[1].startswith("SELECT GET_LOCK")
+
+
+# Test that an index that already exists (e.g. created by hand) is not added again
+def test_add_index_is_idempotent():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (1,)
+
+    add_index("tasks", "idx_example", "status")(cursor)
+
+    assert not any("ALTER TABLE" in statement for statement in executed(cursor))
+
+
+# Test that a column that already exists is not added again
+def test_add_column_is_idempotent():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (1,)
+
+    add_column("tasks", "completed_at", "DATETIME NULL")(cursor)
+
+    assert not any("ALTER TABLE" in statement for statement in executed(cursor))
+
+
+# Test that a backfill runs over the primary key in ID ranges, committing after each one
+def test_backfill_commits_per_id_range():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (5, 25004)
+
+    backfill("tasks", "UPDATE tasks SET x = 1 WHERE id BETWEEN %s AND %s", chunk_size=10000)(cursor)
+
+    ranges = [call.args[1] for call in cursor.execute.call_args_list if call.args[0].startswith("UPDATE")]
+    assert ranges == [(5, 10004), (10005, 20004), (20005, 25004)]
+    assert executed(cursor).count("COMMIT") == 3
+
+
+# Test that an interrupted backfill continues after the last ID it had done, and an empty table costs one query
+def test_backfill_resumes_and_skips_empty_table():
+    cursor = MagicMock()
+    cursor.fetchone.side_effect = [(1, 30000), (20000,)]
+
+    backfill("tasks", "INSERT ... WHERE id BETWEEN %s AND %s", chunk_size=10000, resume_after="SELECT MAX(task_id) FROM task_changes")(cursor)
+
+    assert [call.args[1] for call in cursor.execute.call_args_list if call.args[0].startswith("INSERT")] == [(20001, 30000)]
+
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (None, None)
+    backfill("tasks", "UPDATE tasks SET x = 1 WHERE id BETWEEN %s AND %s")(cursor)
+    assert executed(cursor) == ["SELECT MIN(id), MAX(id) FROM tasks"]
+
+
+# Test that migrate() refuses to run when another process holds the migration lock
+def test_migrate_lock_timeout():
+    connection, cursor = make_connection([(0,), (0,)])
+
+    with pytest.raises(Error):
+        migrate(connection)
+
+    assert not any("CREATE TABLE IF NOT EXISTS schema_version" in statement for statement in executed(cursor))
+
+# pytest tests/test_migrations.py
@@ -0,0 +1,85 @@
+# test_rendering
+import io
+import os
+import pytest
+from datetime import datetime
+from src.rendering import TaskRenderer, format_created
+from src.task_records import Task
+
+CREATED = datetime(2024, 5, 1, 9, 30, 15)
+
+
+# Helper output that counts write() calls and can pretend to be a terminal
+class Output(io.StringIO):
+    def __init__(self, tty=False):
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+# Helper building pages of tasks
+def make_pages(page_count, page_size):
+    return [
+        [Task(page * page_size + index, f"Task {page * page_size + index}", "Description", "not started", CREATED) for index in range(1, page_size + 1)]
+        for page in range(page_count)
+    ]
+
+
+# Test that cached date formatting gives the same text as strftime
+@pytest.mark.parametrize("created_at", [CREATED, datetime(1999, 12, 31, 23, 59, 59), datetime(2024, 1, 2, 0, 5)])
+def test_format_created(created_at):
+    assert format_created(created_at) == created_at.strftime("%d.%m.%Y %H:%M")
+
+
+# Test that a pipe gets plain numbered lines, written once per page
+def test_render_plain_one_write_per_page():
+    out = Output()
+
+    written = TaskRenderer(out=out).render(make_pages(3, 100))
+
+    lines = out.getvalue().splitlines()
+    assert written == 300
+    assert lines[0] == "1. ID: 1 | Title: Task 1 | Description: Description | Status: not started | Created: 01.05.2024 09:30"
+    assert lines[-1].startswith("300. ID: 300 |")
+    assert out.writes == 3
+
+
+# Test that table rows line up and the pager stops when the user types q
+def test_render_table_paged_on_terminal(monkeypatch):
+    monkeypatch.setattr("shutil.get_terminal_size", lambda: os.terminal_size((120, 11)))
+    out = Output(tty=True)
+    answers = iter(["", "q"])
+
+    written = TaskRenderer(out=out, prompt=lambda _: next(answers)).render(make_pages(5, 10))
+
+    lines = out.getvalue().splitlines()
+    # Header + 9 rows, then 10 rows, then quit
+    assert len(lines) == 20
+    assert written == 19
+    assert lines[0].split() == ["#", "ID", "Title", "Status", "Created", "Description"]
+    assert len({line.index("not started") for line in lines[1:]}) == 1
+
+
+# Test that TSV output keeps every task on one line
+def test_render_tsv():
+    out = Output()
+    rows = [Task(7, "Tab\there", "Two\nlines", "done", CREATED)]
+
+    TaskRenderer("tsv", out=out).render([rows])
+
+    assert out.getvalue() == "7\tTab\\there\tTwo\\nlines\tdone\t2024-05-01 09:30:15\n"
+
+
+# Test that an unknown mode is refused
+def test_render_unknown_mode():
+    with pytest.raises(ValueError):
+        TaskRenderer("html")
+
+# pytest tests/test_rendering.py
@@ -0,0 +1,64 @@
+# test_startup
+import os
+import subprocess
+import sys
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Modules main.py must not import before a command needs the database
+DEFERRED_MODULES = ("mysql", "dotenv", "db_config", "task_database", "sqlite3")
+
+
+# Helper running python with src on the path, returning the completed process
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args], cwd=SRC, capture_output=True, text=True, timeout=60,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+
+
+# Test that importing main.py loads neither the MySQL driver nor the config
+def test_main_import_is_lazy():
+    result = run_python("-c", "import sys, main; print(' '.join(sorted(sys.modules)))")
+
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.split()
+    assert [module for module in loaded if module.split(".")[0] in DEFERRED_MODULES] == []
+
+
+# Test that opening the MySQL storage and showing the menu doesn't load the MySQL driver (nor connect):
+# it is only imported by the first operation that reaches the database
+def test_menu_does_not_load_mysql_driver():
+    script = (
+        "import sys, builtins, main\n"
+        "builtins.input = lambda prompt='': '11'\n"
+        "code = main.main(['--storage', 'mysql'])\n"
+        "print('MODULES', code, ' '.join(sorted(sys.modules)))\n"
+    )
+    result = run_python("-c", script)
+
+    assert result.returncode == 0, result.stderr
+    code, *loaded = result.stdout.split("MODULES ")[-1].split()
+    assert code == "0"
+    assert "task_database" in loaded
+    assert [module for module in loaded if module.split(".")[0] == "mysql"] == []
+
+
+# Test that --help and argument errors answer without loading the config or the MySQL driver
+@pytest.mark.parametrize("argv, returncode", [
+    (["--help"], 0),
+    (["--storage", "postgres"], 2),
+    (["--serve", "--workers", "33"], 2),   # above the MySQL connection pool limit
+    (["--serve", "--workers", "0"], 2),
+])
+def test_help_and_argument_errors_skip_storage(argv, returncode):
+    result = run_python("-X", "importtime", "main.py", *argv)
+
+    assert result.returncode == returncode
+    imported = [line.split("|")[2].strip() for line in result.stderr.splitlines() if line.startswith("import time:")]
+    assert "argparse" in imported
+    assert [module for module in imported if module.split(".")[0] in DEFERRED_MODULES] == []
+
+
+# pytest tests/test_startup.py
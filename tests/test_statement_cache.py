@@ -0,0 +1,147 @@
+# test_statement_cache
+import pytest
+from unittest.mock import MagicMock
+from mysql.connector.errors import DatabaseError, OperationalError, PoolError
+from src.statement_cache import StatementCache, ER_UNKNOWN_STMT_HANDLER
+from src.task_database import TaskDatabase
+
+
+# Helper giving a mocked cursor with an empty result
+def mock_cursor(**kwargs):
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    cursor.fetchall.return_value = []
+    return cursor
+
+
+# Helper giving a mocked MySQL connection whose cursor() returns a new mocked cursor every time
+def mock_connection(connection_id=1):
+    connection = MagicMock()
+    connection.connection_id = connection_id
+    connection.cursor.side_effect = mock_cursor
+    return connection
+
+
+# Test that a statement is prepared once per connection and then reused
+def test_statement_cache_reuses_prepared_cursor():
+    cache = StatementCache()
+    connection = mock_connection()
+
+    first = cache.execute(connection, "SELECT 1 WHERE 1 = %s", (1,))
+    second = cache.execute(connection, "SELECT 1 WHERE 1 = %s", (2,))
+
+    assert first is second
+    connection.cursor.assert_called_once_with(prepared=True)
+    assert first.execute.call_count == 2
+    assert (cache.prepares, cache.hits, len(cache)) == (1, 1, 1)
+
+
+# Test that the least recently used statement is closed once a connection has more than size statements
+def test_statement_cache_evicts_least_recently_used():
+    cache = StatementCache(size=2)
+    connection = mock_connection()
+
+    a = cache.execute(connection, "A", ())
+    b = cache.execute(connection, "B", ())
+    cache.execute(connection, "A", ())     # B is now the least recently used
+    cache.execute(connection, "C", ())
+
+    b.close.assert_called_once()
+    a.close.assert_not_called()
+    assert len(cache) == 2
+    assert cache.execute(connection, "A", ()) is a
+
+
+# Test that a reconnected connection (new server connection ID) prepares its statements again
+def test_statement_cache_reprepares_after_reconnect():
+    cache = StatementCache()
+    connection = mock_connection(connection_id=10)
+
+    before = cache.execute(connection, "A", ())
+    connection.connection_id = 11
+    after = cache.execute(connection, "A", ())
+
+    assert after is not before
+    assert cache.prepares == 2
+    # The old session's statements died with it: its cursor is dropped, not closed over the new session
+    before.close.assert_not_called()
+
+
+# Test that old sessions are forgotten beyond max_sessions
+def test_statement_cache_bounds_sessions():
+    cache = StatementCache(max_sessions=2)
+    for connection_id in range(5):
+        cache.execute(mock_connection(connection_id), "A", ())
+
+    assert len(cache) == 2
+
+
+# Test that a statement the server no longer knows (session reset) is prepared again and retried once
+def test_statement_cache_retries_unknown_statement():
+    cache = StatementCache()
+    connection = mock_connection()
+    stale = cache.execute(connection, "A", ())
+    stale.execute.side_effect = DatabaseError(msg="Unknown prepared statement handler", errno=ER_UNKNOWN_STMT_HANDLER)
+
+    fresh = cache.execute(connection, "A", (1,))
+
+    assert fresh is not stale
+    stale.close.assert_called_once()
+    fresh.execute.assert_called_once_with("A", (1,))
+
+
+# Test that any other error is raised, and the failed cursor is not reused
+def test_statement_cache_discards_failed_cursor():
+    cache = StatementCache()
+    connection = mock_connection()
+    broken = cache.execute(connection, "A", ())
+    broken.execute.side_effect = OperationalError(msg="Lost connection", errno=2013)
+
+    with pytest.raises(OperationalError):
+        cache.execute(connection, "A", ())
+
+    assert len(cache) == 0
+    assert cache.execute(connection, "A", ()) is not broken
+
+
+# Test that clear() (TaskDatabase.close()) closes the cached cursors of every connection, even if one fails to close
+def test_statement_cache_clear_closes_cursors():
+    cache = StatementCache()
+    first, second = mock_connection(connection_id=1), mock_connection(connection_id=2)
+    cursors = [cache.execute(first, "A", ()), cache.execute(first, "B", ()), cache.execute(second, "A", ())]
+    cursors[0].close.side_effect = OperationalError(msg="Lost connection")
+
+    cache.clear()
+
+    assert len(cache) == 0
+    for cursor in cursors:
+        cursor.close.assert_called_once()
+
+
+# Test that TaskDatabase runs its single-task queries on cached prepared cursors, or on plain ones with the cache off
+@pytest.mark.parametrize("statement_cache_size, prepared", [(16, True), (0, False)])
+def test_task_database_statement_cache(statement_cache_size, prepared):
+    connection = mock_connection()
+    storage = TaskDatabase(connection, statement_cache_size=statement_cache_size)
+
+    for task_id in (1, 2, 3):
+        assert storage.fetch_task_db(task_id) is None
+
+    if prepared:
+        connection.cursor.assert_called_once_with(prepared=True)
+        assert storage.statements.hits == 2
+    else:
+        assert connection.cursor.call_count == 3
+        assert storage.statements is None
+    assert connection.cursor.call_args.kwargs == ({"prepared": True} if prepared else {})
+
+
+# Test that update_task_db reports a connection it can't get (pool exhausted, server down) as False, not an exception
+def test_update_task_db_without_connection():
+    pool = MagicMock()
+    pool.connection.side_effect = PoolError(msg="Failed getting connection; pool exhausted")
+    storage = TaskDatabase(pool=pool)
+
+    assert storage.update_task_db(1, "done") is False
+
+# pytest tests/test_statement_cache.py
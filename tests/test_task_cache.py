@@ -0,0 +1,134 @@
+# test_task_cache
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from src import task_cache
+from src.task_cache import CachedTaskStorage
+from src.memory_database import MemoryTaskDatabase
+
+
+# Fixture giving a cache around a mocked backend, so database calls can be counted
+@pytest.fixture
+def mock_db():
+    mock_db = MagicMock()
+    mock_db.page_size = 500
+    mock_db.batch_size = 1000
+    mock_db.fetch_tasks_db.return_value = [(1, "Task A", "Desc", "not started", None)]
+    mock_db.fetch_task_ids_db.return_value = [(1, "Task A")]
+    return mock_db
+
+
+# Test that repeated reads are served from the cache and counted as hits
+def test_cache_hits(mock_db):
+    cache = CachedTaskStorage(mock_db)
+
+    for _ in range(3):
+        assert cache.fetch_tasks_db() == [(1, "Task A", "Desc", "not started", None)]
+
+    mock_db.fetch_tasks_db.assert_called_once()
+    assert cache.cache_stats()["hits"] == 2
+    assert cache.cache_stats()["misses"] == 1
+
+
+# Test that an update only invalidates the reads that show status
+def test_update_invalidates_precisely(mock_db):
+    cache = CachedTaskStorage(mock_db)
+    cache.fetch_tasks_db()
+    cache.fetch_task_ids_db()
+
+    cache.update_task_db(1, "done")
+    cache.fetch_tasks_db()
+    cache.fetch_task_ids_db()
+
+    assert mock_db.fetch_tasks_db.call_count == 2
+    assert mock_db.fetch_task_ids_db.call_count == 1
+
+
+# Test that add and delete invalidate both listings
+@pytest.mark.parametrize("write", [
+    lambda cache: cache.add_task_db("Task B", "Desc"),
+    lambda cache: cache.delete_task_db(1),
+])
+def test_add_and_delete_invalidate_listings(mock_db, write):
+    cache = CachedTaskStorage(mock_db)
+    cache.fetch_tasks_db()
+    cache.fetch_task_ids_db()
+
+    write(cache)
+    cache.fetch_tasks_db()
+    cache.fetch_task_ids_db()
+
+    assert mock_db.fetch_tasks_db.call_count == 2
+    assert mock_db.fetch_task_ids_db.call_count == 2
+
+
+# Test that cached entries expire after the TTL
+def test_cache_ttl(mock_db, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(task_cache.time, "monotonic", lambda: clock[0])
+    cache = CachedTaskStorage(mock_db, ttl=5)
+
+    cache.fetch_task_ids_db()
+    clock[0] += 4
+    cache.fetch_task_ids_db()
+    clock[0] += 2
+    cache.fetch_task_ids_db()
+
+    assert mock_db.fetch_task_ids_db.call_count == 2
+
+
+# Test that the least recently used entry is evicted when the cache is full
+def test_cache_lru_eviction(mock_db):
+    cache = CachedTaskStorage(mock_db, max_size=2)
+
+    cache.fetch_task_db(1)
+    cache.fetch_task_db(2)
+    cache.fetch_task_db(1)  # 1 becomes most recently used
+    cache.fetch_task_db(3)  # evicts 2
+    cache.fetch_task_db(1)
+    cache.fetch_task_db(2)
+
+    called_ids = [call.args[0] for call in mock_db.fetch_task_db.call_args_list]
+    assert called_ids == [1, 2, 3, 2]
+    assert cache.cache_stats()["size"] == 2
+
+
+# Test that the cache stays correct on top of a real backend, including paged listings
+def test_cache_with_backend():
+    cache = CachedTaskStorage(MemoryTaskDatabase())
+
+    assert cache.fetch_task_db(1) is None
+    task_id = cache.add_task_db("Task A", "Desc")
+    assert cache.fetch_task_db(task_id)[1] == "Task A"
+
+    assert len(list(cache.iter_task_pages_db())) == 1
+    cache.update_task_db(task_id, "done")
+    assert list(cache.iter_task_pages_db()) == []
+    assert cache.fetch_task_db(task_id)[3] == "done"
+
+
+# Test that archiving drops the archived tasks from the cached reads
+def test_cache_archive_invalidates():
+    cache = CachedTaskStorage(MemoryTaskDatabase())
+    task_id = cache.add_task_db("Task A", "Desc")
+    cache.update_task_db(task_id, "done")
+
+    assert cache.fetch_task_db(task_id) is not None
+    assert cache.has_tasks_db() is True
+
+    assert cache.archive_tasks_db(datetime.now() + timedelta(days=1)) == 1
+    assert cache.fetch_task_db(task_id) is None
+    assert cache.has_tasks_db() is False
+    assert cache.fetch_archived_task_db(task_id)[1] == "Task A"
+
+
+# Test that set_quiet() reaches the wrapped storage, which then prints no menu messages
+def test_cache_set_quiet(capsys):
+    cache = CachedTaskStorage(MemoryTaskDatabase())
+    cache.set_quiet()
+
+    assert cache.storage.quiet is True
+    cache.add_task_db("Task A", "Desc")
+    assert capsys.readouterr().out == ""
+
+# pytest tests/test_task_cache.py
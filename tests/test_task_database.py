@@ -1,107 +1,145 @@
 # test_task_manager
+# Fixtures (task_db on every backend, MySQL test database per worker, rollback isolation) are in conftest.py
 import pytest
-from tests.test_init import create_test_db, create_test_table, drop_test_db, drop_test_table
-from src.db_config import connect_to_test_db
+from decimal import Decimal
+from unittest.mock import MagicMock
+from datetime import date, datetime, timedelta
 from src.task_database import TaskDatabase
-import mysql.connector
-from mysql.connector import Error
+from src.sqlite_database import SQLiteTaskDatabase
 
 
-# Fixture to create and drop test database and table for the entire test session
-@pytest.fixture(scope="session", autouse=True)
-def db_connection():
-    create_test_db()
-    connection = connect_to_test_db()
-    yield connection
-    connection.close()
-    drop_test_db()
+# Helper to insert a task with a given status through the storage API
+def insert_task(task_db, title, description, status="not started"):
+    task_id = task_db.add_task_db(title, description)
+    if status != "not started":
+        task_db.update_task_db(task_id, status)
+    return task_id
 
 
-# Fixture for each test function to work with the cursor
-@pytest.fixture(scope="function", autouse=True)
-def db_cursor(db_connection):
-    create_test_table()
-    cursor = db_connection.cursor()
-    yield cursor
-    cursor.close()
-    drop_test_table()
+# Helper to count all stored tasks
+def count_tasks(task_db):
+    return len(task_db.fetch_task_ids_db())
 
 
 """TESTS"""
 
 
 # Test: verifies that a valid task is correctly inserted into the database
-def test_add_task_db_valid(db_connection, db_cursor):
+def test_add_task_db_valid(task_db):
     title = "Test Task"
     description = "Description of test task"
 
-    task_db = TaskDatabase(db_connection) # create an instance with connection
-    task_db.add_task_db(title, description) # call the instance method
+    task_id = task_db.add_task_db(title, description)
 
-    db_cursor.execute("SELECT title, description FROM tasks ORDER BY id DESC LIMIT 1")
-    result = db_cursor.fetchone()
-
-    assert result == (title, description)
+    task = task_db.fetch_task_db(task_id)
+    assert (task[1], task[2], task[3]) == (title, description, "not started")
 
 
 # Test: verifies that inserting a task with NULL title fails at the database level
-def test_add_task_db_rejects_null(db_connection, db_cursor):
+def test_add_task_db_rejects_null(task_db):
     title = None
     description = "Test description"
 
-    task_db = TaskDatabase(db_connection)  # create instance
+    count_before = count_tasks(task_db)
 
-    db_cursor.execute("SELECT COUNT(*) FROM tasks")
-    count_before = db_cursor.fetchone()[0]
+    with pytest.raises(task_db.Error):
+        task_db.add_task_db(title, description)
 
-    with pytest.raises(mysql.connector.Error):
-        task_db.add_task_db(title, description)  # call method on instance
-    
-    db_cursor.execute("SELECT COUNT(*) FROM tasks")
-    count_after = db_cursor.fetchone()[0]
+    count_after = count_tasks(task_db)
 
     assert count_before == count_after
 
 
 # Test: verifies that the database rejects a task with an empty title (even though Python validation happens before)
 @pytest.mark.parametrize("invalid_title", ["", "   "])
-def test_add_task_db_rejects_empty_title(db_connection, db_cursor, invalid_title):
+def test_add_task_db_rejects_empty_title(task_db, invalid_title):
     description = "Test description"
 
-    task_db = TaskDatabase(db_connection)
     # Get count of tasks before attempt
-    db_cursor.execute("SELECT COUNT(*) FROM tasks")
-    count_before = db_cursor.fetchone()[0]
-    
+    count_before = count_tasks(task_db)
+
     # Expect a database error due to empty title values
-    with pytest.raises(mysql.connector.Error):
+    with pytest.raises(task_db.Error):
         task_db.add_task_db(invalid_title, description)
 
     # Get count of tasks after attempt
-    db_cursor.execute("SELECT COUNT(*) FROM tasks")
-    count_after = db_cursor.fetchone()[0]
+    count_after = count_tasks(task_db)
 
     # Verify the number of tasks has not changed
     assert count_before == count_after
 
 
-# Tests that fetching a task returns a task correctly 
-# if it has status "not started" or "in progress"
-def test_fetch_task(db_connection, db_cursor):
-    task_db = TaskDatabase(db_connection)
+# Test: verifies that bulk insert stores valid rows in batches and reports rejected ones by index
+def test_add_tasks_bulk(task_db):
+    tasks = [
+        ("Bulk 1", "Description 1"),
+        ("   ", "Description 2"),      # rejected: empty title
+        ("Bulk 3", "Description 3"),
+        ("Bulk 4", ""),                # rejected: empty description
+        ("Bulk 5", "Description 5"),
+        "not a pair",                  # rejected: wrong shape
+    ]
 
-    # Insert tasks with different statuses
+    result = task_db.add_tasks_bulk(tasks, batch_size=2)
+
+    assert [index for index, _ in result["rejected"]] == [1, 3, 5]
+
+    inserted_ids = [task_id for first, last in result["inserted"] for task_id in range(first, last + 1)]
+    assert len(inserted_ids) == 3
+
+    rows = sorted(task_db.fetch_task_ids_db())
+    assert [task_id for task_id, _ in rows] == inserted_ids
+    assert [title for _, title in rows] == ["Bulk 1", "Bulk 3", "Bulk 5"]
+
+
+# Test: verifies that a row the database refuses (title too long) only rejects that row, not its batch
+def test_add_tasks_bulk_database_reject(task_db):
+    tasks = [
+        ("Bulk 1", "Description 1"),
+        ("x" * 51, "Description 2"),   # passes validate_task, refused by the database
+        ("Bulk 3", "Description 3"),
+    ]
+
+    result = task_db.add_tasks_bulk(tasks, batch_size=10)
+
+    assert [index for index, _ in result["rejected"]] == [1]
+    assert sorted(title for _, title in task_db.fetch_task_ids_db()) == ["Bulk 1", "Bulk 3"]
+
+
+# Test: verifies that bulk insert keeps a given status and creation date (used by imports)
+def test_add_tasks_bulk_with_status_and_date(task_db):
+    created_at = datetime(2024, 1, 31, 12, 30, 5)
     tasks = [
-        ("Task 1", "Description 1", "not started"),
-        ("Task 2", "Description 1", "in progress"),
-        ("Task 3", "Description 3", "done"), # This should not be fatched
+        ("Imported 1", "Description 1", "done", created_at),
+        ("Imported 2", "Description 2", None, None),       # column defaults
+        ("Imported 3", "Description 3", "waiting", None),  # rejected: unknown status
     ]
 
-    db_cursor.executemany(
-        "INSERT INTO tasks (title, description, status) VALUES (%s, %s, %s)",
-        tasks
-    )
-    db_connection.commit()
+    result = task_db.add_tasks_bulk(tasks)
+
+    assert [index for index, _ in result["rejected"]] == [2]
+    first_id = result["inserted"][0][0]
+    assert task_db.fetch_task_db(first_id)[3:] == ("done", created_at)
+    assert task_db.fetch_task_db(first_id + 1)[3] == "not started"
+
+
+# Test: verifies that streaming returns every task, finished ones too, in ID order and in chunks
+def test_stream_tasks_db(task_db):
+    task_ids = [insert_task(task_db, f"Task {index}", "Description", "done" if index % 2 else "not started") for index in range(5)]
+
+    chunks = list(task_db.stream_tasks_db(chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [task[0] for chunk in chunks for task in chunk] == task_ids
+
+
+# Tests that fetching a task returns a task correctly
+# if it has status "not started" or "in progress"
+def test_fetch_task(task_db):
+    # Insert tasks with different statuses
+    insert_task(task_db, "Task 1", "Description 1", "not started")
+    insert_task(task_db, "Task 2", "Description 1", "in progress")
+    insert_task(task_db, "Task 3", "Description 3", "done")  # This should not be fatched
 
     # Fetch tasks
     fetched_tasks = task_db.fetch_tasks_db()
@@ -110,29 +148,56 @@ def test_fetch_task(db_connection, db_cursor):
     fetched_titles = []
     for task in fetched_tasks:
         fetched_titles.append(task[1])
-    
+
     assert "Task 1" in fetched_titles
     assert "Task 2" in fetched_titles
     assert "Task 3" not in fetched_titles
 
 
-def test_select_task_id_db_returns_ids_and_titles(db_connection, db_cursor):
-    task_db = TaskDatabase(db_connection)
+# Tests that streaming pages returns every unfinished task exactly once, in ID order
+def test_iter_task_pages_db_keyset_pagination(task_db):
+    insert_task(task_db, "Task 1", "Description 1", "not started")
+    insert_task(task_db, "Task 2", "Description 2", "done")  # This should be skipped
+    insert_task(task_db, "Task 3", "Description 3", "in progress")
+    insert_task(task_db, "Task 4", "Description 4", "not started")
+    insert_task(task_db, "Task 5", "Description 5", "in progress")
+
+    pages = list(task_db.iter_task_pages_db(page_size=2))
+
+    # Four unfinished tasks with page size 2 => two full pages
+    assert [len(page) for page in pages] == [2, 2]
+
+    fetched_titles = [task[1] for page in pages for task in page]
+    assert fetched_titles == ["Task 1", "Task 3", "Task 4", "Task 5"]
+
+
+# Test: verifies that fetching a missing task returns None
+def test_fetch_task_db_missing(task_db):
+    assert task_db.fetch_task_db(999999) is None
+
 
+# Test: verifies the existence check used before asking for a task ID
+def test_has_tasks_db(task_db):
+    assert task_db.has_tasks_db() is False
+
+    task_id = insert_task(task_db, "Task", "Description", "done")
+    assert task_db.has_tasks_db() is True
+
+    task_db.delete_task_db(task_id)
+    assert task_db.has_tasks_db() is False
+
+
+def test_select_task_id_db_returns_ids_and_titles(task_db):
     # Insert test data
-    tasks = [
-        ("Task A", "Description A"),
-        ("Task B", "Description B"),
-    ]
-    db_cursor.executemany("INSERT INTO tasks (title, description) VALUES (%s, %s)", tasks)
-    db_connection.commit()
+    insert_task(task_db, "Task A", "Description A")
+    insert_task(task_db, "Task B", "Description B")
 
     # Fetch using method
-    result = task_db.select_task_id_db()
+    result = task_db.fetch_task_ids_db()
 
     # There should be two results, matching what we inserted
     fetched_titles = [title for _, title in result]
-    
+
     assert "Task A" in fetched_titles
     assert "Task B" in fetched_titles
 
@@ -142,53 +207,91 @@ def test_select_task_id_db_returns_ids_and_titles(db_connection, db_cursor):
         assert isinstance(title, str)
 
 
+# Test: verifies that every backend returns typed records with named fields
+def test_fetch_returns_task_records(task_db):
+    task_id = insert_task(task_db, "Typed", "Record", "in progress")
+
+    task = task_db.fetch_task_db(task_id)
+    assert type(task).__name__ == "Task"
+    assert (task.id, task.title, task.description, task.status) == (task_id, "Typed", "Record", "in progress")
+    assert task.created_at is not None
+
+    assert [type(row).__name__ for row in task_db.fetch_tasks_db()] == ["Task"]
+    assert [(row.id, row.title) for row in task_db.fetch_task_ids_db()] == [(task_id, "Typed")]
+
+
+# Test: verifies that the columnar batch holds the ID and status of every task, in ID order
+def test_fetch_task_columns_db(task_db):
+    first = insert_task(task_db, "Task A", "Description")
+    second = insert_task(task_db, "Task B", "Description", "done")
+    third = insert_task(task_db, "Task C", "Description", "in progress")
+
+    columns = task_db.fetch_task_columns_db(chunk_size=2)
+
+    assert len(columns) == 3
+    assert list(columns) == [(first, "not started"), (second, "done"), (third, "in progress")]
+    assert list(columns.ids_with_status("done")) == [second]
+
+
+# Test: verifies that search finds tasks containing every word (or a word prefix) in title or description
+@pytest.mark.commits
+def test_search_tasks_db(task_db):
+    acme_id = insert_task(task_db, "Invoice Acme", "Send the quarterly invoice to Acme")
+    insert_task(task_db, "Pay invoice", "Electricity bill", "done")
+    insert_task(task_db, "Write report", "Quarterly numbers")
+
+    def found(query, **page):
+        return sorted(task[1] for task in task_db.search_tasks_db(query, **page))
+
+    assert found("invoice") == ["Invoice Acme", "Pay invoice"]
+    assert found("INVOICE acme") == ["Invoice Acme"]
+    assert found("quarter") == ["Invoice Acme", "Write report"]
+    assert found("electricity") == ["Pay invoice"]
+    assert found("missing") == []
+    assert found("  ") == []
+
+    # Best match first: "invoice" twice beats once
+    assert task_db.search_tasks_db("invoice")[0][0] == acme_id
+
+    task_db.delete_task_db(acme_id)
+    assert found("acme") == []
+
+
+# Test: verifies that search results are paginated with limit and offset, without duplicates
+@pytest.mark.commits
+def test_search_tasks_db_pagination(task_db):
+    task_db.add_tasks_bulk([(f"Meeting {index}", "Weekly meeting notes") for index in range(5)])
+
+    pages = [task_db.search_tasks_db("meeting", limit=2, offset=offset) for offset in (0, 2, 4)]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert len({task[0] for page in pages for task in page}) == 5
+
+
 # Test: verifies that updating task status to valid values ('in progress' / 'done') works correctly
 @pytest.mark.parametrize("new_status", ["in progress", "done"])
-def test_update_status_db_valid_input(db_connection, db_cursor, new_status):
+def test_update_status_db_valid_input(task_db, new_status):
     title = "Test task for update"
     description = "Task description"
-    initial_status = "not started"
-
-    task_db = TaskDatabase(db_connection)
 
-    # Directly insert test task into database
-    db_cursor.execute(
-        "INSERT INTO tasks (title, description, status) VALUES (%s, %s, %s)",
-        (title, description, initial_status)
-    )
-    db_connection.commit()
-
-    # Get ID of newly inserted task
-    db_cursor.execute("SELECT id FROM tasks ORDER BY id DESC LIMIT 1")
-    task_id = db_cursor.fetchone()[0]
+    task_id = insert_task(task_db, title, description)
 
     # Perform the update
     update_ok = task_db.update_task_db(task_id, new_status)
     assert update_ok is True
 
     # Verify the change in database
-    db_cursor.execute("SELECT status FROM tasks WHERE id = %s", (task_id,))
-    status_in_db = db_cursor.fetchone()[0]
+    status_in_db = task_db.fetch_task_db(task_id)[3]
     assert status_in_db == new_status
 
 
 # Test: verifies that attempting to update task status to an invalid value returns False
-def test_update_status_db_invalid_status(db_connection, db_cursor):
-    task_db = TaskDatabase(db_connection)
-
+def test_update_status_db_invalid_status(task_db):
     # First insert a task to test on
-    db_cursor.execute(
-        "INSERT INTO tasks (title, description) VALUES (%s, %s)",
-        ("Task for invalid status test", "Description")
-    )
-    db_connection.commit()
-
-    db_cursor.execute("SELECT id FROM tasks ORDER BY id DESC LIMIT 1")
-    task_id = db_cursor.fetchone()[0]
+    task_id = insert_task(task_db, "Task for invalid status test", "Description")
 
     # Get original status of the task (default)
-    db_cursor.execute("SELECT status FROM tasks WHERE id = %s", (task_id,))
-    status_before = db_cursor.fetchone()[0]
+    status_before = task_db.fetch_task_db(task_id)[3]
 
     # Try updating to an invalid status
     invalid_status = "Waiting for confirmation"
@@ -197,54 +300,301 @@ def test_update_status_db_invalid_status(db_connection, db_cursor):
     assert update_ok is False
 
     # Verify status did not change
-    db_cursor.execute("SELECT status FROM tasks WHERE id = %s", (task_id,))
-    status_after = db_cursor.fetchone()[0]
+    status_after = task_db.fetch_task_db(task_id)[3]
     assert status_before == status_after
 
 
 # Test: verifies deleting a task from the database
-def test_delete_task_db_valid_task(db_connection, db_cursor):
+def test_delete_task_db_valid_task(task_db):
     title = "Task to delete"
     description = "Description of deletable task"
-    
-    task_db = TaskDatabase(db_connection)
 
-    db_cursor.execute(
-        "INSERT INTO tasks (title, description) VALUES (%s, %s)", (title, description)
-    )
-    db_connection.commit()
-
-    db_cursor.execute("SELECT id FROM tasks ORDER BY id DESC LIMIT 1")
-    task_id = db_cursor.fetchone()[0]
+    task_id = insert_task(task_db, title, description)
 
     # Verify that deletion attempt succeeds
     delete_ok = task_db.delete_task_db(task_id)
     assert delete_ok is True
 
     # Verify task was deleted
-    db_cursor.execute("SELECT COUNT(*) FROM tasks WHERE id = %s", (task_id,))
-    count = db_cursor.fetchone()[0]
-    assert count == 0
+    assert task_db.fetch_task_db(task_id) is None
 
 
 # Test: verifies that attempting to delete a task with invalid ID returns False
-def test_delete_task_db_invalid_id(db_connection, db_cursor):
+def test_delete_task_db_invalid_id(task_db):
     invalid_id = 999999  # Assume this ID does not exist in DB
 
-    task_db = TaskDatabase(db_connection)
-
-    db_cursor.execute("SELECT COUNT(*) FROM tasks")
-    count_before = db_cursor.fetchone()[0]
+    count_before = count_tasks(task_db)
 
     # Try deleting task with invalid ID, expect False
     delete_ok = task_db.delete_task_db(invalid_id)
     assert delete_ok is False
 
-    db_cursor.execute("SELECT COUNT(*) FROM tasks")
-    count_after = db_cursor.fetchone()[0]
+    count_after = count_tasks(task_db)
 
     # Verify the number of tasks has not changed (no task was deleted)
     assert count_before == count_after
 
 
+# Test: verifies bulk status updates by ID list, ID range and status filter, in chunks
+def test_update_tasks_bulk_db(task_db):
+    task_ids = [insert_task(task_db, f"Task {index}", "Description") for index in range(6)]
+    task_db.update_task_db(task_ids[5], "in progress")
+
+    # ID list, chunk size smaller than the list
+    assert task_db.update_tasks_bulk_db("done", ids=task_ids[:3], chunk_size=2) == 3
+    # ID range combined with a status filter => only the matching task in the range
+    assert task_db.update_tasks_bulk_db("done", id_range=(task_ids[3], task_ids[5]), status="in progress") == 1
+
+    statuses = [task_db.fetch_task_db(task_id)[3] for task_id in task_ids]
+    assert statuses == ["done", "done", "done", "not started", "not started", "done"]
+
+
+# Test: verifies bulk deletes by a list of ID ranges (single IDs are one-ID ranges), never expanding the ranges
+def test_delete_tasks_bulk_db_id_ranges(task_db):
+    task_ids = [insert_task(task_db, f"Task {index}", "Description") for index in range(6)]
+
+    deleted = task_db.delete_tasks_bulk_db(id_ranges=[(task_ids[0], task_ids[0]), (task_ids[3], task_ids[4] + 10**9)])
+
+    assert deleted == 4
+    assert [task_id for task_id, _ in task_db.fetch_task_ids_db()] == [task_ids[1], task_ids[2]]
+    assert task_db.delete_tasks_bulk_db(id_ranges=[]) == 0
+
+
+# Test: verifies bulk deletes by status filter and creation date, reporting the deleted count
+def test_delete_tasks_bulk_db(task_db):
+    task_ids = [insert_task(task_db, f"Task {index}", "Description") for index in range(5)]
+    task_db.update_tasks_bulk_db("done", ids=task_ids[:4])
+
+    assert task_db.delete_tasks_bulk_db(status="done", chunk_size=3) == 4
+    assert [task_id for task_id, _ in task_db.fetch_task_ids_db()] == [task_ids[4]]
+
+    # Nothing was created before 2000
+    assert task_db.delete_tasks_bulk_db(created_before=datetime(2000, 1, 1)) == 0
+    assert task_db.delete_tasks_bulk_db(created_before=datetime.now() + timedelta(days=1)) == 1
+
+
+# Test: verifies that a bulk operation without any selection is refused instead of changing every task
+def test_bulk_operations_require_selection(task_db):
+    insert_task(task_db, "Task", "Description")
+
+    with pytest.raises(ValueError):
+        task_db.update_tasks_bulk_db("done")
+    with pytest.raises(ValueError):
+        task_db.delete_tasks_bulk_db()
+
+    assert count_tasks(task_db) == 1
+
+
+# Test: verifies that a group of queued writes is applied in order and a failing operation only fails itself
+def test_apply_writes_db(task_db):
+    task_id = insert_task(task_db, "Existing", "Description")
+
+    results = task_db.apply_writes_db([
+        ("add", "Queued", "Description"),
+        ("update", task_id, "done"),
+        ("add", "", "Description"),
+        ("delete", 999999),
+        ("add", "Queued 2", "Description"),
+    ])
+
+    assert results[0] > task_id
+    assert results[1] is True
+    assert isinstance(results[2], task_db.Error)
+    assert results[3] is False
+    assert results[4] > results[0]
+
+    assert task_db.fetch_task_db(task_id)[3] == "done"
+    assert task_db.fetch_task_db(results[4])[1] == "Queued 2"
+
+
+# Test: verifies that only old done tasks are moved to the archive (keeping their IDs) and can still be read there
+@pytest.mark.commits
+def test_archive_tasks_db(task_db):
+    old = datetime(2020, 1, 1, 8, 0)
+    result = task_db.add_tasks_bulk([
+        ("Old done 1", "Description", "done", old),
+        ("Old open", "Description", "not started", old),
+        ("Old done 2", "Description", "done", old),
+        ("New done", "Description", "done", None),
+        ("Old done 3", "Description", "done", old),
+    ])
+    task_ids = [task_id for first, last in result["inserted"] for task_id in range(first, last + 1)]
+
+    assert task_db.archive_tasks_db(datetime(2021, 1, 1), chunk_size=2) == 3
+    assert task_db.archive_tasks_db(datetime(2021, 1, 1)) == 0
+
+    assert [task_id for task_id, _ in task_db.fetch_task_ids_db()] == [task_ids[1], task_ids[3]]
+    assert task_db.fetch_task_db(task_ids[0]) is None
+    assert task_db.search_tasks_db("done") == [task_db.fetch_task_db(task_ids[3])]
+
+    archived = task_db.fetch_archived_task_db(task_ids[0])
+    assert archived[:5] == (task_ids[0], "Old done 1", "Description", "done", old)
+    assert isinstance(archived[5], datetime)
+    assert task_db.fetch_archived_task_db(task_ids[1]) is None
+
+    pages = list(task_db.iter_archive_pages_db(page_size=2))
+    assert [[task[0] for task in page] for page in pages] == [[task_ids[0], task_ids[2]], [task_ids[4]]]
+
+
+# Test: verifies that the statistics follow every kind of write and that a rebuild gives the same numbers
+def test_fetch_stats_db(task_db):
+    task_ids = [insert_task(task_db, f"Task {index}", "Description") for index in range(3)]
+    task_db.update_task_db(task_ids[0], "done")
+    task_db.update_task_db(task_ids[1], "in progress")
+    task_db.update_task_db(task_ids[1], "in progress")
+    task_db.add_tasks_bulk([("Old", "Description", "done", datetime(2020, 1, 1))])
+
+    stats = task_db.fetch_stats_db()
+    assert stats["statuses"] == {"not started": 1, "done": 2, "in progress": 1}
+    assert stats["total"] == 4
+    assert len(stats["daily"]) == 7
+    assert stats["daily"][-1] == (date.today(), 3, 1)
+
+    # Reopened => no longer counted as completed today; archived => no longer in the status counts;
+    # deleted => drops out of the daily counts too (they count the tasks that still exist, archived ones included)
+    task_db.update_task_db(task_ids[0], "not started")
+    task_db.archive_tasks_db(datetime(2021, 1, 1))
+    task_db.delete_task_db(task_ids[2])
+    task_db.update_task_db(task_ids[1], "done")
+    task_db.delete_task_db(task_ids[1])
+
+    stats = task_db.fetch_stats_db(days=1)
+    assert stats["statuses"] == {"not started": 1, "done": 0, "in progress": 0}
+    assert stats["daily"] == [(date.today(), 1, 0)]
+
+    # The rebuild gives the same numbers, the archived task is still counted on its own day
+    days = (date.today() - date(2020, 1, 1)).days + 1
+    before = task_db.fetch_stats_db(days=days)
+    task_db.rebuild_stats_db()
+    after = task_db.fetch_stats_db(days=days)
+    assert after == before
+    assert after["daily"][0] == (date(2020, 1, 1), 1, 1)
+
+
+# Test: verifies that the MySQL statistics read folds the trigger deltas into the summary rows under the fold lock,
+# and only reads (summary + deltas) when another process is folding
+@pytest.mark.parametrize("locked", [True, False])
+def test_mysql_stats_fold(locked):
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    fold = [(1 if locked else 0,)] + ([(5,), (None,), (1,)] if locked else [])
+    cursor.fetchone.side_effect = fold
+    cursor.fetchall.side_effect = [[("done", Decimal(2))], [(date.today(), Decimal(3), Decimal(1))]]
+
+    statuses, daily = TaskDatabase(connection)._fetch_counts_db(date.today())
+
+    assert statuses == [("done", 2)]
+    assert daily == [(date.today(), 3, 1)]
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    folded = [statement for statement in statements if statement.startswith(("INSERT INTO task_status_counts", "DELETE FROM task_status_deltas"))]
+    assert len(folded) == (2 if locked else 0)
+    assert not any("task_daily_deltas WHERE id" in statement for statement in statements)   # no daily deltas to fold
+    assert connection.commit.call_count == (1 if locked else 0)
+
+
+# Test: verifies that adds, real updates and deletes (tombstones) appear in the change feed in order
+def test_changes_since(task_db):
+    first = task_db.add_task_db("Task A", "Description")
+    second = task_db.add_task_db("Task B", "Description")
+    task_db.update_task_db(first, "done")
+    task_db.update_task_db(first, "done")   # same status again => not a change
+    task_db.delete_task_db(second)
+
+    changes = task_db.changes_since(0)
+    assert [(change.task_id, change.kind) for change in changes] == [
+        (first, "insert"), (second, "insert"), (first, "update"), (second, "delete"),
+    ]
+    assert [change.seq for change in changes] == sorted(set(change.seq for change in changes))
+    assert isinstance(changes[0].changed_at, datetime)
+
+    # Every change carries the current state of its task, None once the task is gone
+    assert changes[0].task.status == changes[2].task.status == "done"
+    assert changes[1].task is None and changes[3].task is None
+
+    # The seq of the last change seen is the cursor of the next call
+    assert task_db.changes_since(changes[1].seq, limit=1) == [changes[2]]
+    assert task_db.changes_since(changes[-1].seq) == []
+
+
+# Test: verifies that bulk writes and archiving are in the change feed too
+def test_changes_since_bulk_writes(task_db):
+    task_db.add_tasks_bulk([("Task A", "Description"), ("Task B", "Description", "done", datetime(2020, 1, 1))])
+    task_db.update_tasks_bulk_db("in progress", status="not started")
+    task_db.archive_tasks_db(datetime(2021, 1, 1))
+
+    assert [change.kind for change in task_db.changes_since(0)] == ["insert", "insert", "update", "delete"]
+
+
+# Test: verifies that the MySQL change feed stops before a missing seq, which a transaction still running may
+# commit later, and only passes it once the change after it is older than the change feed delay
+def test_mysql_changes_since_stops_at_uncommitted_seq():
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    changed_at = datetime(2024, 1, 1)
+    task = (None,) * 5
+
+    def rows(*changes):
+        return [(seq, 1, "update", changed_at, *task, old_enough) for seq, old_enough in changes]
+
+    cursor.fetchall.side_effect = [
+        rows((1, 0), (3, 0)),           # seq 2 not committed yet => the page ends at 1
+        rows((2, 0), (3, 0)),           # seq 2 committed => read in order
+        rows((5, 0)),                   # seq 4 missing right after the cursor
+        rows((5, 1), (7, 1), (9, 0)),   # 4 and 6 rolled back long ago, 8 may still come
+    ]
+    storage = TaskDatabase(connection, statement_cache_size=0)
+
+    assert [change.seq for change in storage.changes_since(0)] == [1]
+    assert [change.seq for change in storage.changes_since(1)] == [2, 3]
+    assert storage.changes_since(3) == []
+    assert [change.seq for change in storage.changes_since(3)] == [5, 7]
+    assert cursor.execute.call_args.args[1] == (storage.change_feed_delay, 3, storage.page_size)
+
+
+# Test: verifies on two MySQL connections that a change committed after a later one is not skipped by the feed
+def test_mysql_changes_since_concurrent_commits(mysql_pool):
+    task_db = TaskDatabase(pool=mysql_pool)
+    task_db.add_task_db("Before", "Description")
+    with mysql_pool.connection() as connection, connection.cursor() as cursor:
+        # Earlier tests rolled back seqs => start after the last committed change
+        cursor.execute("SELECT MAX(seq) FROM task_changes")
+        start = cursor.fetchone()[0]
+
+    with mysql_pool.connection() as slow:
+        with slow.cursor() as cursor:
+            cursor.execute("INSERT INTO tasks (title, description) VALUES ('Slow', 'Description')")   # start + 1, open
+        fast = task_db.add_task_db("Fast", "Description")                                              # start + 2
+
+        assert task_db.changes_since(start) == []
+        slow.commit()
+
+    assert [(change.seq, change.task_id) for change in task_db.changes_since(start)] == [(start + 1, fast - 1), (start + 2, fast)]
+
+
+# Test: verifies that SQLite sets updated_at on insert and moves it on a real change
+def test_sqlite_updated_at():
+    storage = SQLiteTaskDatabase(":memory:")
+    storage.create_table_db()
+    task_id = storage.add_task_db("Task", "Description")
+    assert storage.connection.execute("SELECT updated_at FROM tasks").fetchone()[0] is not None
+
+    storage.connection.execute("UPDATE tasks SET updated_at = '2000-01-01 00:00:00'")
+    storage.update_task_db(task_id, "in progress")
+
+    assert storage.connection.execute("SELECT updated_at FROM tasks").fetchone()[0].year > 2000
+    storage.close()
+
+
+# Test: verifies that a pool-backed TaskDatabase borrows a connection per operation and returns it
+def test_task_database_with_pool(mysql_pool):
+    task_db = TaskDatabase(pool=mysql_pool)
+
+    # More operations than pooled connections => connections must be returned after each one
+    for index in range(3):
+        task_db.add_task_db(f"Pooled {index}", "Description")
+
+    fetched_titles = [task[1] for task in task_db.fetch_tasks_db()]
+    assert fetched_titles == ["Pooled 0", "Pooled 1", "Pooled 2"]
+
+
 # pytest tests/test_task_database.py -s
@@ -1,7 +1,9 @@
 # test_task_manager
 import pytest
+from datetime import datetime
 from unittest.mock import MagicMock
 from src.task_manager import TaskManager, OperationCancelled
+from src.task_records import Task
 
 # Test that add_task() sends the correct data to the db through add_task_db function
 def test_add_task_valid_input(monkeypatch):
@@ -16,6 +18,20 @@ def test_add_task_valid_input(monkeypatch):
     mock_db.add_task_db.assert_called_once_with("Test Title", "Test Description")
 
 
+# Helper building a mocked db holding the given {id: title} tasks, with ID lookup and search
+def make_db(tasks):
+    created = datetime(2024, 5, 1, 9, 30)
+    rows = {task_id: Task(task_id, title, "Description", "not started", created) for task_id, title in tasks.items()}
+
+    mock_db = MagicMock()
+    mock_db.has_tasks_db.return_value = bool(rows)
+    mock_db.fetch_task_db.side_effect = rows.get
+    mock_db.search_tasks_db.side_effect = lambda query, limit, offset: [
+        row for row in rows.values() if query.lower() in row[1].lower()
+    ][offset:offset + limit]
+    return mock_db
+
+
 # Test that add_task() handles exceptions from the DB and prints an error message
 def test_add_task_db_exception(monkeypatch, capsys):
     mock_db = MagicMock()
@@ -58,8 +74,7 @@ def test_add_task_rejects_invalid_inputs_until_valid(monkeypatch):
 
 # Test that select_task_id() informs when the task list is empty
 def test_select_task_id_empty_list(capsys):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = []
+    mock_db = make_db({})
 
     manager = TaskManager(mock_db)
     result = manager.select_task_id()
@@ -69,10 +84,29 @@ def test_select_task_id_empty_list(capsys):
     assert "The task list is empty" in captured.out
 
 
+# Test that select_task_id() lists search results for words and returns the ID typed afterwards,
+# without ever loading the whole task list
+def test_select_task_id_search_then_id(monkeypatch, capsys):
+    mock_db = make_db({1: "Buy milk", 2: "Call plumber", 3: "Buy bread"})
+
+    inputs = iter(["buy", "7", "3"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    manager = TaskManager(mock_db)
+    result = manager.select_task_id()
+
+    captured = capsys.readouterr()
+    assert result == 3
+    assert "ID: 1 | Title: Buy milk" in captured.out
+    assert "Call plumber" not in captured.out
+    assert "There is no task with this ID" in captured.out
+    mock_db.fetch_task_ids_db.assert_not_called()
+
+
 # tes tthat show_tasks() informs when the task list is empty   
 def test_show_tasks_empty_list(capsys):
     mock_db = MagicMock()
-    mock_db.fetch_tasks_db.return_value = []
+    mock_db.iter_task_pages_db.return_value = iter([])
 
     manager = TaskManager(mock_db)
     result = manager.show_tasks()
@@ -82,6 +116,58 @@ def test_show_tasks_empty_list(capsys):
     assert "No tasks to display." in captured.out
 
 
+# Test that show_tasks() prints every page and keeps numbering across pages
+def test_show_tasks_prints_all_pages(capsys):
+    created = datetime(2024, 5, 1, 9, 30)
+    mock_db = MagicMock()
+    mock_db.iter_task_pages_db.return_value = iter([
+        [Task(1, "Task A", "Desc A", "not started", created), Task(2, "Task B", "Desc B", "in progress", created)],
+        [Task(5, "Task C", "Desc C", "not started", created)],
+    ])
+
+    manager = TaskManager(mock_db)
+    manager.show_tasks()
+
+    captured = capsys.readouterr()
+    assert "1. ID: 1 | Title: Task A" in captured.out
+    assert "3. ID: 5 | Title: Task C" in captured.out
+    assert "Created: 01.05.2024 09:30" in captured.out
+    assert "No tasks to display." not in captured.out
+
+
+# Test that search_tasks() pages through the results until the user goes back
+def test_search_tasks_pages(monkeypatch, capsys):
+    created = datetime(2024, 5, 1, 9, 30)
+    mock_db = MagicMock()
+    mock_db.search_tasks_db.side_effect = lambda query, limit, offset: [
+        Task(task_id, f"Invoice {task_id}", "Desc", "not started", created) for task_id in range(offset + 1, 26)
+    ][:limit]
+
+    inputs = iter(["invoice", "", "b"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    manager = TaskManager(mock_db)
+    manager.search_tasks()
+
+    captured = capsys.readouterr()
+    assert "1. ID: 1 | Title: Invoice 1" in captured.out
+    assert "20. ID: 20 | Title: Invoice 20" in captured.out
+    assert "21. ID: 21" not in captured.out
+    assert [call.args[2] for call in mock_db.search_tasks_db.call_args_list] == [0, 10]
+
+
+# Test that search_tasks() tells the user when nothing matches
+def test_search_tasks_no_results(monkeypatch, capsys):
+    mock_db = MagicMock()
+    mock_db.search_tasks_db.return_value = []
+    monkeypatch.setattr("builtins.input", lambda _: "nothing")
+
+    manager = TaskManager(mock_db)
+    manager.search_tasks()
+
+    assert "No tasks match your search." in capsys.readouterr().out
+
+
 # Test that update_task() correctly updates a task's statu swhen given valid user inputs
 # including input that would accepted for normalization
 @pytest.mark.parametrize("user_inputs, expected_call", [
@@ -90,8 +176,7 @@ def test_show_tasks_empty_list(capsys):
     (["3", "inprogress"], (3, "in progress")), # testing no space (normalized)    
 ])
 def test_update_task_various_valid_inputs(monkeypatch, user_inputs, expected_call):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A"), (2, "Task B"), (3, "Task C")]
+    mock_db = make_db({1: "Task A", 2: "Task B", 3: "Task C"})
     mock_db.update_task_db.return_value = True
 
     inputs = iter(user_inputs)
@@ -106,8 +191,7 @@ def test_update_task_various_valid_inputs(monkeypatch, user_inputs, expected_cal
 # Test that update_task() retries if the user first enters an invalid ID
 # and only proceeds once a valid task ID and status are provided
 def test_update_task_rejects_invalid_inputs_until_valid(monkeypatch):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A"), (2, "Task B")]
+    mock_db = make_db({1: "Task A", 2: "Task B"})
     mock_db.update_task_db.return_value = True
 
     inputs = iter(["999", "2", "done" ])
@@ -122,8 +206,7 @@ def test_update_task_rejects_invalid_inputs_until_valid(monkeypatch):
 # Test that update_task() does NOT call update_task_db
 # if the user enters only invalid statuses and the input runs out.
 def test_update_task_all_invalid_status(monkeypatch):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A")]
+    mock_db = make_db({1: "Task A"})
 
     # User selects valid ID "1", then enters 5 invalid statuses
     inputs = iter(["1", "started", "waiting", "pending", "123", ""])  # all invalid
@@ -138,8 +221,7 @@ def test_update_task_all_invalid_status(monkeypatch):
 
 # Test that update_task() handles DB exceptions and prints an error message
 def test_update_task_db_exception(monkeypatch, capsys):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A")]
+    mock_db = make_db({1: "Task A"})
     mock_db.update_task_db.side_effect = Exception("DB update failure")
 
     inputs = iter(["1", "done"])
@@ -156,8 +238,7 @@ def test_update_task_db_exception(monkeypatch, capsys):
 # Test that delete_task() calls the db if valid input provided
 # Test that delete_task() calls the db if valid input is provided
 def test_delete_task_valid_input(monkeypatch):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A")]
+    mock_db = make_db({1: "Task A"})
     mock_db.delete_task_db.return_value = True  # Simulate successful deletion
 
     # First input is task ID, second is confirmation "y"
@@ -173,8 +254,7 @@ def test_delete_task_valid_input(monkeypatch):
 
 # Test that delete_task() handles exceptions from the DB and prints an error message
 def test_delete_task_db_exception(monkeypatch, capsys):
-    mock_db = MagicMock()
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A")]
+    mock_db = make_db({1: "Task A"})
     mock_db.delete_task_db.side_effect = Exception ("DB delete failure")
 
     inputs = iter(["1", "y"])
@@ -190,9 +270,8 @@ def test_delete_task_db_exception(monkeypatch, capsys):
 
 # Test that delete_task() does not call delete_task_db when user cancels
 def test_delete_task_rejects_invalid_ids_until_valid_then_cancel(monkeypatch):
-    mock_db = MagicMock()
     # Provide a valid task list with IDs 1 and 2
-    mock_db.fetch_task_ids_db.return_value = [(1, "Task A"), (2, "Task B")]
+    mock_db = make_db({1: "Task A", 2: "Task B"})
 
     # Simulate invalid IDs first ("999", "abc"), then valid ID "2",
     # then user cancels deletion by inputting "n"
@@ -206,6 +285,83 @@ def test_delete_task_rejects_invalid_ids_until_valid_then_cancel(monkeypatch):
     mock_db.delete_task_db.assert_not_called()
 
 
+# Test that bulk_update_tasks() asks again after an invalid selection and passes the parsed one to the db
+def test_bulk_update_tasks(monkeypatch, capsys):
+    mock_db = MagicMock()
+    mock_db.update_tasks_bulk_db.return_value = 3
+
+    inputs = iter(["abc", "1-3", "done"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    manager = TaskManager(mock_db)
+    manager.bulk_update_tasks()
+
+    mock_db.update_tasks_bulk_db.assert_called_once_with("done", id_range=(1, 3))
+    captured = capsys.readouterr()
+    assert "Invalid ID or range" in captured.out
+    assert "3 task(s) updated" in captured.out
+
+
+# Test that bulk_delete_tasks() deletes by filter only after confirmation
+@pytest.mark.parametrize("confirmation, called", [("y", True), ("n", False)])
+def test_bulk_delete_tasks(monkeypatch, confirmation, called):
+    mock_db = MagicMock()
+    mock_db.delete_tasks_bulk_db.return_value = 2
+
+    inputs = iter(["status=done", confirmation])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    manager = TaskManager(mock_db)
+    manager.bulk_delete_tasks()
+
+    if called:
+        mock_db.delete_tasks_bulk_db.assert_called_once_with(status="done")
+    else:
+        mock_db.delete_tasks_bulk_db.assert_not_called()
+
+
+# Test that archive_tasks() archives with the default age on Enter, or the typed number of days
+@pytest.mark.parametrize("inputs, days", [([""], 30), (["soon", "7"], 7)])
+def test_archive_tasks(monkeypatch, capsys, inputs, days):
+    mock_db = MagicMock()
+    mock_db.archive_tasks_db.return_value = 4
+    inputs = iter(inputs)
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+
+    TaskManager(mock_db, archive_days=30).archive_tasks()
+
+    created_before = mock_db.archive_tasks_db.call_args.args[0]
+    assert (datetime.now() - created_before).days == days
+    assert "4 task(s) archived" in capsys.readouterr().out
+
+
+# Test that archive_tasks() can be cancelled before anything is archived
+def test_archive_tasks_cancel(monkeypatch):
+    mock_db = MagicMock()
+    monkeypatch.setattr("builtins.input", lambda _: "b")
+
+    TaskManager(mock_db).archive_tasks()
+
+    mock_db.archive_tasks_db.assert_not_called()
+
+
+# Test that show_stats() prints the counts per status and per day
+def test_show_stats(capsys):
+    mock_db = MagicMock()
+    mock_db.fetch_stats_db.return_value = {
+        "statuses": {"not started": 3, "done": 5, "in progress": 1},
+        "total": 9,
+        "daily": [(datetime(2024, 5, 1).date(), 4, 2)],
+    }
+
+    TaskManager(mock_db).show_stats()
+
+    output = capsys.readouterr().out
+    assert "done                5" in output
+    assert "total               9" in output
+    assert "01.05.2024" in output
+
+
 def test_input_or_cancel(monkeypatch):
     manager = TaskManager(None)  # db argument is not needed here
 
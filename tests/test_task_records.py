@@ -0,0 +1,70 @@
+# test_task_records
+import sys
+import pytest
+from datetime import datetime
+from src.task_records import Task, ArchivedTask, TaskColumns, make_records, make_record
+
+CREATED = datetime(2024, 5, 1, 9, 30)
+
+
+# Test that a Task reads by name and still behaves like the tuple rows it replaces
+def test_task_record_fields():
+    task = Task(1, "Title", "Description", "done", CREATED)
+
+    assert (task.id, task.title, task.description, task.status, task.created_at) == tuple(task)
+    assert task == (1, "Title", "Description", "done", CREATED)
+    task_id, title, *_ = task
+    assert (task_id, title) == (1, "Title")
+
+
+# Test that records carry no per-instance dict and are no bigger than a plain tuple
+def test_task_record_is_compact():
+    task = Task(1, "Title", "Description", "done", CREATED)
+
+    assert not hasattr(task, "__dict__")
+    assert sys.getsizeof(task) == sys.getsizeof(tuple(task))
+    with pytest.raises(AttributeError):
+        task.priority = 1
+
+
+# Test that the row factories build records from rows, and None from a missing row
+def test_make_records():
+    rows = [(1, "A", "Desc", "done", CREATED, CREATED), (2, "B", "Desc", "done", CREATED, CREATED)]
+
+    archived = make_records(ArchivedTask, rows)
+
+    assert [task.archived_at for task in archived] == [CREATED, CREATED]
+    assert make_record(Task, None) is None
+    assert make_record(Task, rows[0][:5]).title == "A"
+
+
+# Test that the columnar batch round-trips IDs and statuses and filters and counts by status
+def test_task_columns():
+    columns = TaskColumns()
+    columns.extend([(1, "done"), (2, "not started")])
+    columns.append(5, "done")
+
+    assert len(columns) == 3
+    assert list(columns) == [(1, "done"), (2, "not started"), (5, "done")]
+    assert list(columns.ids_with_status("done")) == [1, 5]
+    assert columns.count_statuses() == {"not started": 1, "done": 2, "in progress": 0}
+
+    with pytest.raises(KeyError):
+        columns.append(6, "unknown")
+
+
+# Test that a columnar batch takes a fraction of the memory of (id, status) tuples in a list
+def test_task_columns_memory():
+    count = 10_000
+    columns = TaskColumns()
+    rows = []
+    for task_id in range(100_000, 100_000 + count):
+        columns.append(task_id, "done")
+        rows.append((task_id, "done"))
+
+    columnar = sys.getsizeof(columns.ids) + sys.getsizeof(columns.statuses)
+    tuples = sys.getsizeof(rows) + sum(sys.getsizeof(row) + sys.getsizeof(row[0]) for row in rows)
+
+    assert columnar * 5 < tuples
+
+# pytest tests/test_task_records.py
@@ -0,0 +1,124 @@
+# test_task_storage
+import pytest
+from src.task_storage import open_storage
+from src.sqlite_database import SQLiteTaskDatabase, SQLITE_MIGRATIONS
+
+
+# Test that open_storage() builds the embedded backends by name
+@pytest.mark.parametrize("backend, class_name", [
+    ("sqlite", "SQLiteTaskDatabase"),
+    ("memory", "MemoryTaskDatabase"),
+])
+def test_open_storage_embedded_backends(monkeypatch, backend, class_name):
+    # open_storage() reads the config from the top-level db_config module (src is on pythonpath)
+    monkeypatch.setattr("db_config.SQLITE_PATH", ":memory:")
+
+    storage = open_storage(backend)
+
+    assert type(storage).__name__ == class_name
+    storage.close()
+
+
+# Test that the backend configured in db_config is used when none is given
+def test_open_storage_uses_config(monkeypatch):
+    monkeypatch.setattr("db_config.STORAGE_BACKEND", "memory")
+
+    assert type(open_storage()).__name__ == "MemoryTaskDatabase"
+
+
+# Test that open_storage() leaves the schema alone until the first operation needs it
+def test_open_storage_defers_schema(monkeypatch, tmp_path):
+    monkeypatch.setattr("db_config.SQLITE_PATH", str(tmp_path / "tasks.db"))
+
+    storage = open_storage("sqlite")
+    assert storage.connection.execute("PRAGMA user_version").fetchone()[0] == 0
+
+    assert storage.fetch_tasks_db() == []
+    assert storage.connection.execute("PRAGMA user_version").fetchone()[0] == SQLITE_MIGRATIONS[-1][0]
+    storage.close()
+
+
+# Test that an unknown backend name is refused
+def test_open_storage_unknown_backend():
+    with pytest.raises(ValueError):
+        open_storage("postgres")
+
+
+# Test that a SQLite file keeps tasks between connections and is not migrated twice
+def test_sqlite_file_persists(tmp_path, capsys):
+    path = str(tmp_path / "tasks.db")
+
+    storage = SQLiteTaskDatabase(path)
+    storage.create_table_db()
+    task_id = storage.add_task_db("Persisted", "Description")
+    storage.close()
+
+    storage = SQLiteTaskDatabase(path)
+    capsys.readouterr()
+    storage.create_table_db()
+
+    assert storage.fetch_task_db(task_id)[1] == "Persisted"
+    assert storage.connection.execute("PRAGMA user_version").fetchone()[0] == SQLITE_MIGRATIONS[-1][0]
+    assert "schema upgraded" not in capsys.readouterr().out
+    storage.close()
+
+# Test that the search index built by the SQLite migration also covers tasks added before it existed
+def test_sqlite_search_index_covers_existing_tasks(tmp_path):
+    path = str(tmp_path / "tasks.db")
+
+    storage = SQLiteTaskDatabase(path)
+    for _, _, statements in SQLITE_MIGRATIONS[:3]:
+        for statement in statements:
+            storage.connection.execute(statement)
+    storage.connection.execute("PRAGMA user_version = 3")
+    storage.connection.execute("INSERT INTO tasks (title, description) VALUES ('Old task', 'Added before search')")
+    storage.connection.commit()
+
+    storage.create_table_db()
+
+    assert [task[1] for task in storage.search_tasks_db("before search")] == ["Old task"]
+    storage.close()
+
+
+# Test that the statistics migration counts the tasks that existed before it, and a rebuild fixes drifted counts
+def test_sqlite_stats_cover_existing_tasks(tmp_path):
+    path = str(tmp_path / "tasks.db")
+
+    storage = SQLiteTaskDatabase(path)
+    for _, _, statements in SQLITE_MIGRATIONS[:5]:
+        for statement in statements:
+            storage.connection.execute(statement)
+    storage.connection.execute("PRAGMA user_version = 5")
+    storage.connection.execute("INSERT INTO tasks (title, description, status) VALUES ('Old task', 'Finished before stats', 'done')")
+    storage.connection.commit()
+
+    storage.create_table_db()
+    assert storage.fetch_stats_db()["statuses"]["done"] == 1
+    assert storage.fetch_stats_db(days=1)["daily"][0][1:] == (1, 1)
+
+    storage.connection.execute("UPDATE task_status_counts SET task_count = 42")
+    storage.connection.commit()
+    storage.rebuild_stats_db()
+
+    assert storage.fetch_stats_db()["total"] == 1
+    storage.close()
+
+
+# Test that a migration failing after its ALTER TABLE is rolled back completely, so it can simply be run again
+def test_sqlite_failed_migration_can_rerun(tmp_path, monkeypatch):
+    path = str(tmp_path / "tasks.db")
+    storage = SQLiteTaskDatabase(path)
+    broken = [(version, description, [*statements[:2], "SELECT * FROM no_such_table"]) if version == 6 else (version, description, statements)
+              for version, description, statements in SQLITE_MIGRATIONS]
+    monkeypatch.setattr("src.sqlite_database.SQLITE_MIGRATIONS", broken)
+
+    with pytest.raises(storage.Error):
+        storage.create_table_db()
+    assert storage.connection.execute("PRAGMA user_version").fetchone()[0] == 5
+
+    monkeypatch.undo()
+    storage.create_table_db()
+    assert storage.connection.execute("PRAGMA user_version").fetchone()[0] == SQLITE_MIGRATIONS[-1][0]
+    storage.close()
+
+# pytest tests/test_task_storage.py
@@ -0,0 +1,113 @@
+# test_transfer
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.transfer import export_tasks, import_tasks, file_format, task_from_record
+from src.memory_database import MemoryTaskDatabase
+from src.sqlite_database import SQLiteTaskDatabase
+
+
+# Helper returning a side effect that calls function for the first calls, then fails
+def fail_after(function, calls):
+    def side_effect(*args, **kwargs):
+        side_effect.calls += 1
+        if side_effect.calls > calls:
+            raise Exception("connection lost")
+        return function(*args, **kwargs)
+    side_effect.calls = 0
+    return side_effect
+
+
+# Fixture giving a storage with a few tasks in different statuses
+@pytest.fixture
+def source():
+    storage = MemoryTaskDatabase()
+    storage.add_tasks_bulk([
+        ("Plain", "Description"),
+        ("Comma, \"quotes\"", "Line one\nline two"),
+        ("Finished", "Done already", "done", datetime(2024, 1, 31, 8, 0, 0)),
+    ])
+    return storage
+
+
+# Test that an export/import round trip keeps titles, descriptions, statuses and dates, in both formats
+@pytest.mark.parametrize("file_name", ["tasks.csv", "tasks.jsonl"])
+def test_export_import_round_trip(tmp_path, source, file_name):
+    path = str(tmp_path / file_name)
+
+    assert export_tasks(source, path, chunk_size=2) == 3
+
+    target = SQLiteTaskDatabase(":memory:")
+    target.create_table_db()
+    summary = import_tasks(target, path, batch_size=2)
+
+    assert summary == {"imported": 3, "rejected": [], "offset": 3}
+    assert [task[1:] for chunk in target.stream_tasks_db() for task in chunk] == \
+        [task[1:] for chunk in source.stream_tasks_db() for task in chunk]
+    target.close()
+
+
+# Test that invalid records are rejected with their offset and the rest is imported
+def test_import_rejects_invalid_records(tmp_path):
+    path = tmp_path / "tasks.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"title": "Good 1", "description": "Description"}),
+        "{broken json",
+        json.dumps({"title": "", "description": "Description"}),
+        json.dumps({"title": "Good 2", "description": "Description", "status": "waiting"}),
+        json.dumps({"title": "Good 3", "description": "Description", "created_at": "yesterday"}),
+        json.dumps({"title": "Good 4", "description": "Description", "status": "in progress"}),
+    ]), encoding="utf-8")
+
+    storage = MemoryTaskDatabase()
+    summary = import_tasks(storage, str(path), batch_size=2)
+
+    assert [offset for offset, _ in summary["rejected"]] == [1, 2, 3, 4]
+    assert summary["imported"] == 2
+    assert [task[1] for task in storage.fetch_tasks_db()] == ["Good 1", "Good 4"]
+
+
+# Test that a failed import reports where to resume, and resuming from there imports the rest exactly once
+def test_import_resume_from_offset(tmp_path, capsys):
+    path = tmp_path / "tasks.csv"
+    path.write_text("title,description\n" + "".join(f"Task {index},Description\n" for index in range(5)), encoding="utf-8")
+
+    # The first batch is committed, the second one fails
+    storage = MemoryTaskDatabase()
+    flaky = MagicMock(wraps=storage)
+    flaky.add_tasks_bulk.side_effect = fail_after(storage.add_tasks_bulk, calls=1)
+
+    with pytest.raises(Exception, match="connection lost"):
+        import_tasks(flaky, str(path), batch_size=2)
+    assert "--resume-from 2" in capsys.readouterr().out
+
+    summary = import_tasks(storage, str(path), batch_size=2, resume_from=2)
+
+    assert summary["imported"] == 3
+    assert [task[1] for task in storage.fetch_tasks_db()] == [f"Task {index}" for index in range(5)]
+
+
+# Tests that the format comes from the option or the file extension
+def test_file_format():
+    assert file_format("tasks.CSV") == "csv"
+    assert file_format("tasks.ndjson") == "jsonl"
+    assert file_format("-", "csv") == "csv"
+
+    with pytest.raises(ValueError):
+        file_format("tasks.txt")
+    with pytest.raises(ValueError):
+        file_format("tasks.csv", "xml")
+
+
+# Test that empty CSV cells fall back to the column defaults
+def test_task_from_record_defaults():
+    assert task_from_record({"id": "7", "title": "T", "description": "D", "status": "", "created_at": ""}) == ("T", "D", None, None)
+
+
+# Test that mistyped statuses are corrected while importing
+def test_task_from_record_status_typo():
+    assert task_from_record({"title": "T", "description": "D", "status": "In Progres"})[2] == "in progress"
+    assert task_from_record({"title": "T", "description": "D", "status": "waiting"})[2] == "waiting"
+
+# pytest tests/test_transfer.py
@@ -1,6 +1,7 @@
 # test_utils
 import pytest
-from src.utils import validate_task, normalize_state
+from datetime import datetime
+from src.utils import validate_task, normalize_state, parse_selection, match_status, edit_distance
 
 
 # Tests that chacks that normalize state returnes modified
@@ -25,6 +26,41 @@ def test_normalize_state(input_status, expected):
     assert normalize_state(input_status) == expected
 
 
+# Tests that typos of every status are corrected to the nearest one
+@pytest.mark.parametrize("input_status, expected", [
+    ("doen", "done"),
+    ("dne", "done"),
+    ("Done ", "done"),
+    ("not startd", "not started"),
+    ("nto started", "not started"),
+    ("NotStarted", "not started"),
+    ("in-progress", "in progress"),
+    ("in_progrses", "in progress"),
+])
+def test_normalize_state_typos(input_status, expected):
+    assert normalize_state(input_status) == expected
+
+
+# Tests that text not close enough to any status is left as typed (stripped and lowercased)
+@pytest.mark.parametrize("input_status", ["started", "waiting", "pending", "none", "gone", "123", "", "in progress and more"])
+def test_normalize_state_no_match(input_status):
+    assert match_status(input_status) is None
+    assert normalize_state(input_status) == input_status.strip().lower()
+
+
+# Tests that a swap of two neighbouring characters counts as one edit
+@pytest.mark.parametrize("first, second, expected", [
+    ("done", "done", 0),
+    ("done", "doen", 1),
+    ("done", "dome", 1),
+    ("done", "", 4),
+    ("inprogress", "inprgoress", 1),
+    ("notstarted", "started", 3),
+])
+def test_edit_distance(first, second, expected):
+    assert edit_distance(first, second) == expected
+
+
 # Tests that chacks that returned value from validate_task ic correcct
 @pytest.mark.parametrize("title, description, expected", [
     ("", "desc", "Task title and description must not be empty or contain only spaces."),
@@ -36,4 +72,30 @@ def test_normalize_state(input_status, expected):
 def test_validate_task(title, description, expected):
     assert validate_task(title.strip(), description.strip()) == expected
 
+
+# Tests that parse_selection turns IDs, ranges and filters into bulk selection arguments
+@pytest.mark.parametrize("text, expected", [
+    ("5", {"ids": [5]}),
+    ("1, 2 3", {"ids": [1, 2, 3]}),
+    ("10-20", {"id_range": (10, 20)}),
+    ("1,4-6", {"id_ranges": [(1, 1), (4, 6)]}),
+    ("1, 5-5000000", {"id_ranges": [(1, 1), (5, 5000000)]}),
+    ("9, 20-30 1-8", {"id_ranges": [(1, 9), (20, 30)]}),
+    ("status=done", {"status": "done"}),
+    ("status=inprogres", {"status": "in progress"}),
+    ("before=2024-01-31", {"created_before": datetime(2024, 1, 31)}),
+    ("1-100 status=in progress before=2024-01-31", {
+        "id_range": (1, 100), "status": "in progress", "created_before": datetime(2024, 1, 31)
+    }),
+])
+def test_parse_selection(text, expected):
+    assert parse_selection(text) == expected
+
+
+# Tests that parse_selection rejects input it can't understand
+@pytest.mark.parametrize("text", ["", "abc", "5-2", "1-x", "status=waiting", "before=31.1.2024"])
+def test_parse_selection_invalid(text):
+    with pytest.raises(ValueError):
+        parse_selection(text)
+
 # pytest tests/test_utils.py -s
\ No newline at end of file
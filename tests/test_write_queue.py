@@ -0,0 +1,220 @@
+# test_write_queue
+import queue
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from mysql.connector.errors import DatabaseError
+from src.write_queue import WriteQueue, WriteQueueClosed
+from src.task_database import TaskDatabase, WRITE_GROUP_ATTEMPTS
+from src.memory_database import MemoryTaskDatabase
+from src.sqlite_database import SQLiteTaskDatabase
+
+
+# Helper giving an in-memory storage whose apply_writes_db records the size of every group
+def recording_storage():
+    storage = MemoryTaskDatabase()
+    groups = []
+    apply_writes_db = storage.apply_writes_db
+
+    def record(operations):
+        groups.append(len(operations))
+        return apply_writes_db(operations)
+
+    storage.apply_writes_db = record
+    return storage, groups
+
+
+# Test that futures resolve to the result of their own operation
+def test_write_queue_resolves_futures():
+    storage = MemoryTaskDatabase()
+
+    with WriteQueue(storage) as writes:
+        first = writes.add("Task A", "Description")
+        second = writes.add("Task B", "Description")
+        writes.flush()
+
+        update = writes.update(first.result(), "done")
+        missing = writes.delete(999)
+        deleted = writes.delete(second.result())
+
+        assert (first.result(), second.result()) == (1, 2)
+        assert update.result() is True
+        assert missing.result() is False
+        assert deleted.result() is True
+
+    assert storage.fetch_task_db(1)[3] == "done"
+    assert storage.fetch_task_db(2) is None
+
+
+# Test that queued writes are grouped into transactions of at most max_batch operations
+def test_write_queue_groups_writes():
+    storage, groups = recording_storage()
+
+    # Long delay => groups are only cut by their size (and by close() for the rest)
+    writes = WriteQueue(storage, max_batch=10, max_delay=5)
+    futures = [writes.add(f"Task {index}", "Description") for index in range(25)]
+    writes.close()
+
+    assert groups == [10, 10, 5]
+    assert [future.result() for future in futures] == list(range(1, 26))
+    assert (writes.transactions, writes.operations) == (3, 25)
+
+
+# Test that a group is flushed after max_delay even when it isn't full
+def test_write_queue_flushes_after_delay():
+    storage, groups = recording_storage()
+
+    with WriteQueue(storage, max_batch=100, max_delay=0.01) as writes:
+        assert writes.add("Task", "Description").result(timeout=5) == 1
+        assert groups == [1]
+
+
+# Test that a failing operation fails only its own future
+def test_write_queue_operation_error():
+    storage = SQLiteTaskDatabase(":memory:")
+    storage.create_table_db()
+
+    with WriteQueue(storage, max_delay=5) as writes:
+        good = writes.add("Task", "Description")
+        bad = writes.add("", "Description")
+        also_good = writes.update(1, "in progress")
+
+    assert good.result() == 1
+    with pytest.raises(storage.Error):
+        bad.result()
+    assert also_good.result() is True
+    assert storage.fetch_task_db(1)[3] == "in progress"
+    storage.close()
+
+
+# Test that a failed transaction fails every future of the group, and the worker keeps going
+def test_write_queue_transaction_error():
+    storage = MagicMock()
+    storage.apply_writes_db.side_effect = [Exception("connection lost"), [3]]
+
+    with WriteQueue(storage, max_delay=5) as writes:
+        futures = [writes.add("Task A", "Description"), writes.delete(1)]
+        writes.flush()
+        later = writes.add("Task B", "Description")
+
+    for future in futures:
+        with pytest.raises(Exception, match="connection lost"):
+            future.result()
+    assert later.result() == 3
+
+
+# Test that a full queue blocks the caller (here until the timeout) instead of growing without limit
+def test_write_queue_backpressure():
+    started = threading.Event()
+    release = threading.Event()
+
+    def apply_writes_db(operations):
+        started.set()
+        release.wait()
+        return [True] * len(operations)
+
+    storage = MagicMock()
+    storage.apply_writes_db.side_effect = apply_writes_db
+
+    writes = WriteQueue(storage, max_batch=1, max_pending=1)
+    writes.update(1, "done")    # taken by the worker, which now waits in apply_writes_db
+    assert started.wait(5)
+    writes.update(2, "done")    # fills the queue
+
+    with pytest.raises(queue.Full):
+        writes.update(3, "done", timeout=0.05)
+
+    release.set()
+    writes.close()
+    assert storage.apply_writes_db.call_count == 2
+
+
+# Test that a write blocked on a full queue while close() runs is still flushed, not left behind the stop marker
+def test_write_queue_close_with_blocked_producer():
+    started = threading.Event()
+    release = threading.Event()
+
+    def apply_writes_db(operations):
+        started.set()
+        release.wait()
+        return [True] * len(operations)
+
+    storage = MagicMock()
+    storage.apply_writes_db.side_effect = apply_writes_db
+
+    writes = WriteQueue(storage, max_batch=1, max_pending=1)
+    writes.update(1, "done")
+    assert started.wait(5)
+    writes.update(2, "done")    # fills the queue
+
+    blocked = []
+    producer = threading.Thread(target=lambda: blocked.append(writes.update(3, "done")))
+    producer.start()
+    time.sleep(0.05)            # the producer now waits in put()
+    closing = threading.Thread(target=writes.close)
+    closing.start()
+
+    release.set()
+    producer.join(5)
+    closing.join(5)
+
+    assert blocked[0].result(timeout=5) is True
+    assert storage.apply_writes_db.call_count == 3
+
+
+# Test that a deadlock (which rolls back the whole transaction) replays the whole MySQL write group,
+# and fails every write of it once the attempts are used up
+@pytest.mark.parametrize("deadlocks, expected_calls", [(1, 2), (WRITE_GROUP_ATTEMPTS, WRITE_GROUP_ATTEMPTS)])
+def test_apply_writes_db_deadlock(deadlocks, expected_calls):
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.lastrowid = 7
+    failures = [DatabaseError(msg="Deadlock found", errno=1213)] * deadlocks
+
+    # The second write of every attempt deadlocks until the failures are used up
+    def execute(statement, params=()):
+        if statement.startswith("UPDATE") and failures:
+            raise failures.pop()
+    cursor.execute.side_effect = execute
+
+    storage = TaskDatabase(connection, statement_cache_size=0)
+    operations = [("add", "Task", "Description"), ("update", 7, "done")]
+
+    if deadlocks < WRITE_GROUP_ATTEMPTS:
+        assert storage.apply_writes_db(operations) == [7, True]
+        connection.commit.assert_called_once()
+    else:
+        with pytest.raises(DatabaseError):
+            storage.apply_writes_db(operations)
+        connection.commit.assert_not_called()
+    assert connection.rollback.call_count == deadlocks
+    assert cursor.execute.call_count == 2 * expected_calls
+
+
+# Test that flush() racing with close() always returns (its marker never lands behind the stop marker)
+def test_write_queue_flush_during_close():
+    for _ in range(50):
+        writes = WriteQueue(MemoryTaskDatabase(), max_delay=0)
+        writes.add("Task", "Description")
+        flushing = threading.Thread(target=writes.flush)
+        flushing.start()
+        writes.close()
+        flushing.join(5)
+        assert not flushing.is_alive()
+
+
+# Test that close() commits what is still queued and refuses new writes
+def test_write_queue_close():
+    storage = MemoryTaskDatabase()
+    writes = WriteQueue(storage, max_delay=5)
+    future = writes.add("Task", "Description")
+
+    writes.close()
+    writes.close()
+
+    assert future.done() and future.result() == 1
+    with pytest.raises(WriteQueueClosed):
+        writes.add("Too late", "Description")
+
+# pytest tests/test_write_queue.py